@@ -0,0 +1,11 @@
+"""Benchmarks for the Logic Simulator.
+
+Generate synthetic circuit definition files of a chosen size and time the
+scanner, parser, network building and simulation on them.
+
+Modules
+-------
+generators - writes parameterised circuit definition files.
+run - runs the benchmark suite and writes the results to JSON.
+scaling - times partitioned simulation with 1, 2, 4 and 8 worker processes.
+"""
@@ -0,0 +1,178 @@
+"""Generate parameterised circuit definition files for benchmarking.
+
+Used in the Logic Simulator project to produce circuits of any size in the
+definition language, so that the cost of scanning, parsing and simulating can
+be measured as the circuit grows.
+
+Classes
+-------
+NetlistGenerator - returns the definition text of synthetic circuits.
+"""
+import random
+
+
+class NetlistGenerator:
+    """Return the definition text of synthetic circuits.
+
+    Devices are declared in topological order. Combinational logic is built
+    from NAND gates only, because the network executes each gate kind in turn
+    during a settle iteration: a single kind in topological order settles in
+    one iteration however deep the logic is, so large circuits stay within
+    the iteration limit of network.Network.execute_network().
+
+    Parameters
+    ----------
+    monitor_limit: largest number of signals monitored in a circuit.
+
+    Public methods
+    --------------
+    ripple_adder(self, width): Returns a ripple-carry adder of the given
+                               width.
+
+    shift_register(self, length): Returns a D-type shift register of the
+                                  given length.
+
+    random_dag(self, gates, depth, fan_in, inputs=8, seed=0): Returns random
+                               acyclic NAND logic with the given size.
+
+    clock_divider(self, stages): Returns a chain of D-type divide-by-two
+                                 stages.
+
+    nand_latches(self, count): Returns an array of NAND SR latches.
+
+    write(self, text, path): Writes definition text to path.
+    """
+
+    def __init__(self, monitor_limit=8):
+        """Store the monitor limit."""
+        self.monitor_limit = monitor_limit
+
+    def format(self, devices, connections, monitors):
+        """Return the definition text for the given lists of strings."""
+        monitors = monitors[-self.monitor_limit:]
+        return "".join([
+            "DEVICES ", ",\n        ".join(devices), ";\n\n",
+            "CONNECT ", ",\n        ".join(connections), ";\n\n",
+            "MONITOR ", ", ".join(monitors), ";\n\n",
+            "END\n"])
+
+    def nand(self, name, inputs, devices, connections):
+        """Add a NAND gate called name, driven by the list of inputs."""
+        devices.append(f"{name}:NAND {len(inputs)}")
+        connections.extend(f"{signal} > {name}.I{i}"
+                           for i, signal in enumerate(inputs, 1))
+
+    def ripple_adder(self, width):
+        """Return a ripple-carry adder of the given width.
+
+        Each full adder is made of nine NAND gates. The operand switches are
+        set so that every carry propagates.
+        """
+        devices = ["CI:SWITCH 1"]
+        connections = []
+        monitors = []
+        carry = "CI"
+        for bit in range(width):
+            devices.append(f"SA{bit}:SWITCH 1")
+            devices.append(f"SB{bit}:SWITCH {bit % 2}")
+            a, b = f"SA{bit}", f"SB{bit}"
+            # sum = a xor b xor carry, carry out = majority(a, b, carry)
+            g = [f"G{bit}N{n}" for n in range(9)]
+            self.nand(g[0], [a, b], devices, connections)
+            self.nand(g[1], [a, g[0]], devices, connections)
+            self.nand(g[2], [b, g[0]], devices, connections)
+            self.nand(g[3], [g[1], g[2]], devices, connections)
+            self.nand(g[4], [g[3], carry], devices, connections)
+            self.nand(g[5], [g[3], g[4]], devices, connections)
+            self.nand(g[6], [carry, g[4]], devices, connections)
+            self.nand(g[7], [g[5], g[6]], devices, connections)
+            self.nand(g[8], [g[4], g[0]], devices, connections)
+            monitors.append(g[7])
+            carry = g[8]
+        monitors.append(carry)
+        return self.format(devices, connections, monitors)
+
+    def shift_register(self, length):
+        """Return a D-type shift register of the given length."""
+        devices = ["CK:CLOCK 1", "SD:SWITCH 1", "SZ:SWITCH 0"]
+        connections = []
+        monitors = []
+        data = "SD"
+        for stage in range(length):
+            name = f"D{stage}"
+            devices.append(f"{name}:DTYPE")
+            connections.extend([f"{data} > {name}.DATA",
+                                f"CK > {name}.CLK",
+                                f"SZ > {name}.SET",
+                                f"SZ > {name}.CLEAR"])
+            monitors.append(f"{name}.Q")
+            data = f"{name}.Q"
+        return self.format(devices, connections, monitors)
+
+    def random_dag(self, gates, depth, fan_in, inputs=8, seed=0):
+        """Return random acyclic NAND logic.
+
+        The gates are spread evenly over depth levels. Each gate has fan_in
+        inputs, one from the previous level and the rest from any earlier
+        level or the input switches.
+        """
+        generator = random.Random(seed)
+        depth = min(depth, gates)
+        devices = [f"SW{i}:SWITCH {generator.randint(0, 1)}"
+                   for i in range(inputs)]
+        connections = []
+        levels = [[f"SW{i}" for i in range(inputs)]]
+        earlier = list(levels[0])  # signals on all completed levels
+        for gate in range(gates):
+            level = 1 + gate * depth // gates
+            if level == len(levels):
+                if level > 1:
+                    earlier.extend(levels[-1])
+                levels.append([])
+            sources = [generator.choice(levels[level - 1])] + [
+                generator.choice(earlier) for _ in range(fan_in - 1)]
+            name = f"G{gate}"
+            self.nand(name, sources, devices, connections)
+            levels[level].append(name)
+        return self.format(devices, connections, levels[-1])
+
+    def clock_divider(self, stages):
+        """Return a chain of D-type divide-by-two stages."""
+        devices = ["CK:CLOCK 1", "SZ:SWITCH 0"]
+        connections = []
+        monitors = ["CK"]
+        clock = "CK"
+        for stage in range(stages):
+            name = f"D{stage}"
+            devices.append(f"{name}:DTYPE")
+            connections.extend([f"{name}.QBAR > {name}.DATA",
+                                f"{clock} > {name}.CLK",
+                                f"SZ > {name}.SET",
+                                f"SZ > {name}.CLEAR"])
+            monitors.append(f"{name}.Q")
+            clock = f"{name}.Q"
+        return self.format(devices, connections, monitors)
+
+    def nand_latches(self, count):
+        """Return an array of cross-coupled NAND SR latches.
+
+        Alternate latches are set and reset by their switches.
+        """
+        devices = []
+        connections = []
+        monitors = []
+        for latch in range(count):
+            s, r = f"SS{latch}", f"SR{latch}"
+            q, qbar = f"LQ{latch}", f"LN{latch}"
+            devices.extend([f"{s}:SWITCH {latch % 2}",
+                            f"{r}:SWITCH {1 - latch % 2}",
+                            f"{q}:NAND 2", f"{qbar}:NAND 2"])
+            connections.extend([f"{s} > {q}.I1", f"{qbar} > {q}.I2",
+                                f"{r} > {qbar}.I1", f"{q} > {qbar}.I2"])
+            monitors.append(q)
+        return self.format(devices, connections, monitors)
+
+    def write(self, text, path):
+        """Write definition text to path."""
+        with open(path, "w") as definition_file:
+            definition_file.write(text)
@@ -0,0 +1,257 @@
+"""Run the benchmark suite and write the results to JSON.
+
+Used in the Logic Simulator project to track the speed of the simulator
+across commits. Run from the logsim directory:
+
+Usage
+-----
+python -m benchmarks.run [-o <results path>] [-m <cycles>] [-s <scale>]
+
+The default results path is benchmark_results.json, the default number of
+simulation cycles is 100 and the default scale is 1. The scale multiplies
+the size of every circuit in the suite.
+
+Classes
+-------
+BenchmarkRunner - times the simulator on generated circuits.
+"""
+import getopt
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from netlist import NetlistFile
+
+from benchmarks.generators import NetlistGenerator
+
+
+class BenchmarkRunner:
+    """Time the simulator on generated circuits.
+
+    Each circuit is timed in seven phases: scanning the definition file
+    alone, parsing it (which includes scanning and building the network),
+    building the same network from a binary netlist without the definition
+    language, and simulating a number of cycles with monitors recording. The
+    simulation is timed with every gate executed by execute_gate in the
+    settle loop, then with the generated gate kernel, then with the
+    two-valued gates executed once after settling, and then with clusters of
+    up to six inputs of two-valued gates looked up in truth tables.
+
+    Parameters
+    ----------
+    cycles: number of simulation cycles to time.
+    scale: multiplier applied to the size of every circuit in the suite.
+
+    Public methods
+    --------------
+    get_suite(self): Returns the list of (circuit name, size, definition
+                     text) to time.
+
+    time_circuit(self, name, size, text): Returns the timings of one circuit.
+
+    run(self): Times every circuit in the suite and returns the results.
+    """
+
+    def __init__(self, cycles=100, scale=1):
+        """Store the benchmark settings."""
+        self.cycles = cycles
+        self.scale = scale
+        self.generator = NetlistGenerator()
+
+    def get_suite(self):
+        """Return the list of (circuit name, size, definition text)."""
+        generator = self.generator
+        suite = []
+        for width in [8, 32, 128]:
+            size = width * self.scale
+            suite.append(("ripple_adder", size,
+                          generator.ripple_adder(size)))
+        for length in [16, 128, 512]:
+            size = length * self.scale
+            suite.append(("shift_register", size,
+                          generator.shift_register(size)))
+        for gates in [100, 1000, 5000]:
+            size = gates * self.scale
+            suite.append(("random_dag", size,
+                          generator.random_dag(size, depth=20, fan_in=3)))
+        for stages in [4, 16]:
+            size = stages * self.scale
+            suite.append(("clock_divider", size,
+                          generator.clock_divider(size)))
+        for count in [16, 256]:
+            size = count * self.scale
+            suite.append(("nand_latches", size,
+                          generator.nand_latches(size)))
+        return suite
+
+    def new_simulator(self):
+        """Return new instances of the four inner simulator classes."""
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        return names, devices, network, monitors
+
+    def time_circuit(self, name, size, text):
+        """Return a dictionary of the timings of one circuit."""
+        clock = time.perf_counter
+        with tempfile.TemporaryDirectory() as directory:
+            definition_path = os.path.join(directory, name + ".txt")
+            netlist_path = os.path.join(directory, name + ".lsn")
+            self.generator.write(text, definition_path)
+
+            # Scanning alone
+            names = Names()
+            start = clock()
+            scanner = Scanner(definition_path, names)
+            symbol_count = 0
+            while scanner.get_symbol().type != scanner.EOF:
+                symbol_count += 1
+            scan_seconds = clock() - start
+
+            # Parsing, including scanning and building the network
+            names, devices, network, monitors = self.new_simulator()
+            start = clock()
+            scanner = Scanner(definition_path, names)
+            parser = Parser(names, devices, network, monitors, scanner)
+            parsed = parser.parse_network()
+            parse_seconds = clock() - start
+            if not parsed:
+                raise ValueError("Generated circuit has errors: " + name)
+
+            # Building the same network without the definition language
+            NetlistFile(names, devices, network,
+                        monitors).save(netlist_path)
+            simulator = self.new_simulator()
+            start = clock()
+            NetlistFile(*simulator).load(netlist_path)
+            build_seconds = clock() - start
+
+        # Simulation with execute_gate, the baseline of the other phases
+        network.set_two_valued(False)
+        start = clock()
+        devices.cold_startup()
+        settled = True
+        iterations = 0
+        for _ in range(self.cycles):
+            settled = network.execute_network() and settled
+            iterations += network.last_iterations
+            monitors.record_signals()
+        simulate_seconds = clock() - start
+
+        # Simulation with the generated gate kernel, including compiling it
+        network.set_kernel(True)
+        start = clock()
+        devices.cold_startup()
+        for _ in range(self.cycles):
+            network.execute_network()
+            monitors.record_signals()
+        kernel_simulate_seconds = clock() - start
+
+        # Simulation with two-valued gates
+        network.set_kernel(False)
+        network.set_two_valued(True)
+        start = clock()
+        devices.cold_startup()
+        for _ in range(self.cycles):
+            network.execute_network()
+            monitors.record_signals()
+        two_valued_simulate_seconds = clock() - start
+
+        # Simulation with truth tables, including building them
+        network.set_truth_tables(6)
+        start = clock()
+        devices.cold_startup()
+        for _ in range(self.cycles):
+            network.execute_network()
+            monitors.record_signals()
+        table_simulate_seconds = clock() - start
+
+        connection_count = sum(
+            1 for device in devices.devices_list
+            for connected_output in device.inputs.values()
+            if connected_output is not None)
+        return {
+            "circuit": name,
+            "size": size,
+            "devices": len(devices.devices_list),
+            "connections": connection_count,
+            "symbols": symbol_count,
+            "cycles": self.cycles,
+            "settled": settled,
+            "mean_settle_iterations": iterations / self.cycles
+            if self.cycles else 0,
+            "scan_seconds": scan_seconds,
+            "parse_seconds": parse_seconds,
+            "build_seconds": build_seconds,
+            "simulate_seconds": simulate_seconds,
+            "kernel_simulate_seconds": kernel_simulate_seconds,
+            "two_valued_simulate_seconds": two_valued_simulate_seconds,
+            "table_simulate_seconds": table_simulate_seconds
+        }
+
+    def run(self):
+        """Time every circuit in the suite and return the results."""
+        return [self.time_circuit(name, size, text)
+                for name, size, text in self.get_suite()]
+
+
+def get_commit():
+    """Return the current git commit hash, or None outside a repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(arg_list):
+    """Parse the command line options, run the suite and write the results."""
+    usage_message = ("Usage:\n"
+                     "python -m benchmarks.run [-o <results path>] "
+                     "[-m <cycles>] [-s <scale>]")
+    try:
+        options, arguments = getopt.getopt(arg_list, "ho:m:s:")
+        settings = dict(options)
+        results_path = settings.get("-o", "benchmark_results.json")
+        cycles = int(settings.get("-m", 100))
+        scale = int(settings.get("-s", 1))
+    except (getopt.GetoptError, ValueError):
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit()
+    if "-h" in settings or arguments or cycles < 0 or scale < 1:
+        print(usage_message)
+        sys.exit()
+
+    runner = BenchmarkRunner(cycles, scale)
+    results = []
+    for name, size, text in runner.get_suite():
+        result = runner.time_circuit(name, size, text)
+        print(f"{name:<16}{size:>8}  parse {result['parse_seconds']:8.4f}s"
+              f"  simulate {result['simulate_seconds']:8.4f}s")
+        results.append(result)
+
+    with open(results_path, "w") as results_file:
+        json.dump({"commit": get_commit(),
+                   "python": platform.python_version(),
+                   "cycles": cycles,
+                   "scale": scale,
+                   "results": results}, results_file, indent=2)
+    print("Wrote results to", results_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
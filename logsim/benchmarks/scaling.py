@@ -0,0 +1,171 @@
+"""Time partitioned simulation with different numbers of worker processes.
+
+Used in the Logic Simulator project to measure how simulation of a single
+large netlist scales with the number of CPU cores. Run from the logsim
+directory:
+
+Usage
+-----
+python -m benchmarks.scaling [-o <results path>] [-m <cycles>] [-s <scale>]
+                             [-w <worker counts>]
+
+The default results path is scaling_results.json, the default number of
+simulation cycles is 100, the default scale is 1 and the default worker
+counts are 1,2,4,8. Each circuit is also timed without worker processes.
+
+Classes
+-------
+ScalingBenchmark - times simulation with each number of workers.
+"""
+import getopt
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from scanner import Scanner
+from parse import Parser
+
+from benchmarks.generators import NetlistGenerator
+from benchmarks.run import BenchmarkRunner, get_commit
+
+
+class ScalingBenchmark:
+    """Time simulation with each number of worker processes.
+
+    The circuits are wide random gate networks, which split into balanced
+    partitions, and a ripple-carry adder, whose carry chain makes the
+    workers wait for each other at almost every level. Switches are toggled
+    in a fixed pattern every five cycles, so the gates are executed with
+    changing inputs.
+
+    Parameters
+    ----------
+    cycles: number of simulation cycles to time.
+    scale: multiplier applied to the size of every circuit.
+    worker_counts: list of the numbers of worker processes to time.
+
+    Public methods
+    --------------
+    get_suite(self): Returns the list of (circuit name, size, definition
+                     text) to time.
+
+    simulate(self, path, workers): Returns the seconds taken to simulate the
+                                   circuit at path with the given number of
+                                   workers.
+
+    time_circuit(self, name, size, text): Returns the timings of one circuit.
+    """
+
+    def __init__(self, cycles=100, scale=1, worker_counts=(1, 2, 4, 8)):
+        """Store the benchmark settings."""
+        self.cycles = cycles
+        self.scale = scale
+        self.worker_counts = worker_counts
+        self.generator = NetlistGenerator()
+
+    def get_suite(self):
+        """Return the list of (circuit name, size, definition text)."""
+        generator = self.generator
+        suite = []
+        for gates in [10000, 50000]:
+            size = gates * self.scale
+            suite.append(("random_dag", size,
+                          generator.random_dag(size, depth=20, fan_in=3)))
+        size = 256 * self.scale
+        suite.append(("ripple_adder", size, generator.ripple_adder(size)))
+        return suite
+
+    def simulate(self, path, workers):
+        """Return the seconds taken to simulate the circuit at path.
+
+        Starting the workers is not included.
+        """
+        names, devices, network, monitors = \
+            BenchmarkRunner().new_simulator()
+        scanner = Scanner(path, names)
+        parser = Parser(names, devices, network, monitors, scanner,
+                        print_errors=False)
+        if not parser.parse_network():
+            raise ValueError("Generated circuit has errors: " + path)
+        network.set_workers(workers)
+        devices.cold_startup()
+        network.execute_network()  # finds the gates and starts the workers
+
+        switch_ids = devices.find_devices(devices.SWITCH)
+        start = time.perf_counter()
+        for cycle in range(self.cycles):
+            if cycle % 5 == 0:
+                for index, switch_id in enumerate(switch_ids):
+                    devices.set_switch(switch_id,
+                                       int((cycle + index) % 3 == 0))
+            network.execute_network()
+            monitors.record_signals()
+        seconds = time.perf_counter() - start
+        network.set_workers(None)  # stops the workers
+        return seconds
+
+    def time_circuit(self, name, size, text):
+        """Return a dictionary of the timings of one circuit."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name + ".txt")
+            self.generator.write(text, path)
+            baseline = self.simulate(path, None)
+            worker_seconds = {str(workers): self.simulate(path, workers)
+                              for workers in self.worker_counts}
+        return {
+            "circuit": name,
+            "size": size,
+            "cycles": self.cycles,
+            "simulate_seconds": baseline,
+            "worker_simulate_seconds": worker_seconds
+        }
+
+
+def main(arg_list):
+    """Parse the command line options, run the suite and write the results."""
+    usage_message = ("Usage:\n"
+                     "python -m benchmarks.scaling [-o <results path>] "
+                     "[-m <cycles>] [-s <scale>] [-w <worker counts>]")
+    try:
+        options, arguments = getopt.getopt(arg_list, "ho:m:s:w:")
+        settings = dict(options)
+        results_path = settings.get("-o", "scaling_results.json")
+        cycles = int(settings.get("-m", 100))
+        scale = int(settings.get("-s", 1))
+        worker_counts = [int(count) for count in
+                         settings.get("-w", "1,2,4,8").split(",")]
+    except (getopt.GetoptError, ValueError):
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit()
+    if "-h" in settings or arguments or cycles < 0 or scale < 1 or \
+            min(worker_counts) < 1:
+        print(usage_message)
+        sys.exit()
+
+    benchmark = ScalingBenchmark(cycles, scale, worker_counts)
+    results = []
+    for name, size, text in benchmark.get_suite():
+        result = benchmark.time_circuit(name, size, text)
+        timings = "  ".join(
+            f"{workers}: {seconds:8.4f}s" for workers, seconds in
+            result["worker_simulate_seconds"].items())
+        print(f"{name:<16}{size:>8}  no workers "
+              f"{result['simulate_seconds']:8.4f}s  {timings}")
+        results.append(result)
+
+    with open(results_path, "w") as results_file:
+        json.dump({"commit": get_commit(),
+                   "python": platform.python_version(),
+                   "cpus": os.cpu_count(),
+                   "cycles": cycles,
+                   "scale": scale,
+                   "results": results}, results_file, indent=2)
+    print("Wrote results to", results_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
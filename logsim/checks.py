@@ -0,0 +1,188 @@
+"""Check signals against assertions while the simulation runs.
+
+Used in the Logic Simulator project to verify the behaviour of a circuit
+without storing signal traces. Each check is evaluated once every simulation
+cycle, and only the cycles in which it fails are counted, so checks take the
+same memory however long the run is.
+
+An assertion check compares a signal with a logic expression of other
+signals, such as X2 = S1 XOR S2 XOR S3. A stable check fails if a signal
+changes in a cycle in which a clock signal does not rise.
+
+Classes
+-------
+AssertionCheck - checks that a signal equals a logic expression.
+StableCheck - checks that a signal only changes when a clock rises.
+"""
+
+
+class AssertionCheck:
+    """Check that a signal equals a logic expression of other signals.
+
+    Expressions are nested tuples:
+    ("signal", device_id, output_id) is the level of an output,
+    ("constant", signal) is LOW or HIGH,
+    ("not", expression) inverts an expression, and
+    (gate_kind, left, right) combines two expressions as a two-input gate of
+    that kind (AND, OR, NAND, NOR or XOR) would.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    signal: (device_id, output_id) of the signal checked.
+    expression: the expression the signal must equal.
+
+    Public methods
+    --------------
+    get_signals(self): Returns the signals the check reads.
+
+    is_violated(self): Returns True if the check fails in this cycle.
+
+    reset(self): Forgets the signals of earlier cycles.
+
+    copy(self, devices, network): Returns the same check on another network.
+
+    get_text(self): Returns the check as written in a definition file.
+    """
+
+    def __init__(self, devices, network, signal, expression):
+        """Store the check and build the function evaluating it."""
+        self.devices = devices
+        self.network = network
+        self.signal = signal
+        self.expression = expression
+        self.function = self.build(expression)
+
+    def build(self, expression):
+        """Return a function returning the signal level of expression."""
+        devices = self.devices
+        kind = expression[0]
+        if kind == "signal":
+            _, device_id, output_id = expression
+            get_output_signal = self.network.get_output_signal
+            return lambda: get_output_signal(device_id, output_id)
+        if kind == "constant":
+            signal = expression[1]
+            return lambda: signal
+        if kind == "not":
+            operand = self.build(expression[1])
+            invert_signal = self.network.invert_signal
+            return lambda: invert_signal(operand())
+        left = self.build(expression[1])
+        right = self.build(expression[2])
+        x, y = self.network.gate_rules[kind]
+        if x is None:  # XOR
+            low, high = devices.LOW, devices.HIGH
+            return lambda: low if left() == right() else high
+        not_y = self.network.invert_signal(y)
+        return lambda: y if left() == x and right() == x else not_y
+
+    def get_signals(self):
+        """Return the list of (device_id, output_id) the check reads."""
+        signals = [self.signal]
+        stack = [self.expression]
+        while stack:
+            expression = stack.pop()
+            if expression[0] == "signal":
+                signals.append(expression[1:])
+            elif expression[0] != "constant":
+                stack.extend(expression[1:])
+        return signals
+
+    def is_violated(self):
+        """Return True if the signal differs from the expression."""
+        return self.network.get_output_signal(*self.signal) != \
+            self.function()
+
+    def reset(self):
+        """Forget the signals of earlier cycles (there are none to keep)."""
+
+    def copy(self, devices, network):
+        """Return the same check reading the signals of another network."""
+        return AssertionCheck(devices, network, self.signal, self.expression)
+
+    def get_text(self):
+        """Return the check as written in a definition file."""
+        return (self.devices.get_signal_name(*self.signal) + " = " +
+                self.get_expression_text(self.expression))
+
+    def get_expression_text(self, expression, bracket=False):
+        """Return the text of expression, in brackets if bracket is set."""
+        kind = expression[0]
+        if kind == "signal":
+            return self.devices.get_signal_name(*expression[1:])
+        if kind == "constant":
+            return "1" if expression[1] == self.devices.HIGH else "0"
+        if kind == "not":
+            return "NOT " + self.get_expression_text(expression[1], True)
+        # expressions are evaluated left to right, so only a right operand
+        # that is itself a gate needs brackets
+        text = (self.get_expression_text(expression[1]) + " " +
+                self.devices.names.get_name_string(kind) + " " +
+                self.get_expression_text(expression[2], True))
+        return "(" + text + ")" if bracket else text
+
+
+class StableCheck:
+    """Check that a signal only changes in cycles in which a clock rises.
+
+    A clock rises in a cycle if it was LOW in the cycle before and is HIGH
+    now. The first cycle after a reset is never a violation.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    signal: (device_id, output_id) of the signal checked.
+    clock_signal: (device_id, output_id) of the clock.
+
+    Public methods
+    --------------
+    get_signals(self): Returns the signals the check reads.
+
+    is_violated(self): Returns True if the check fails in this cycle.
+
+    reset(self): Forgets the signals of earlier cycles.
+
+    copy(self, devices, network): Returns the same check on another network.
+
+    get_text(self): Returns the check as written in a definition file.
+    """
+
+    def __init__(self, devices, network, signal, clock_signal):
+        """Store the check; no signals have been seen yet."""
+        self.devices = devices
+        self.network = network
+        self.signal = signal
+        self.clock_signal = clock_signal
+        self.previous = None  # (signal, clock signal) in the cycle before
+
+    def get_signals(self):
+        """Return the list of (device_id, output_id) the check reads."""
+        return [self.signal, self.clock_signal]
+
+    def is_violated(self):
+        """Return True if the signal changed without the clock rising."""
+        signal = self.network.get_output_signal(*self.signal)
+        clock = self.network.get_output_signal(*self.clock_signal)
+        previous = self.previous
+        self.previous = (signal, clock)
+        if previous is None or signal == previous[0]:
+            return False
+        return not (previous[1] == self.devices.LOW and
+                    clock == self.devices.HIGH)
+
+    def reset(self):
+        """Forget the signals of earlier cycles."""
+        self.previous = None
+
+    def copy(self, devices, network):
+        """Return the same check reading the signals of another network."""
+        return StableCheck(devices, network, self.signal, self.clock_signal)
+
+    def get_text(self):
+        """Return the check as written in a definition file."""
+        return (self.devices.get_signal_name(*self.signal) +
+                " STABLE UNLESS " +
+                self.devices.get_signal_name(*self.clock_signal))
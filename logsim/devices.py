@@ -8,6 +8,7 @@ Classes
 Device - stores device properties.
 Devices - makes and stores all the devices in the logic network.
 """
+import bisect
 import random
 
 
@@ -40,6 +41,10 @@ class Device:
         self.switch_state = None
         self.dtype_memory = None
 
+        # number of bits of BUS, ADDER, MUX and REGISTER devices
+        self.word_width = None
+        self.register_memory = None  # stored word of a REGISTER
+
 
 class Devices:
     """Make and store devices.
@@ -62,6 +67,12 @@ class Devices:
     add_device(self, device_id, device_kind): Adds the specified device to the
                                               network.
 
+    remove_device(self, device_id): Removes the specified device from the
+                                    network.
+
+    get_device_property(self, device_id): Returns the device property that
+                                          the device was made with.
+
     add_input(self, device_id, input_id): Adds the specified input to the
                                           specified device.
 
@@ -74,6 +85,13 @@ class Devices:
     get_signal_ids(self, signal_name): Returns the device and output IDs of
                                        the specified signal.
 
+    find_output(self, signal_name): Returns the device and output IDs of an
+                                    output signal, or None if it does not
+                                    exist.
+
+    find_output_names(self, prefix=""): Returns the sorted names of the
+                                        output signals starting with prefix.
+
     set_switch(self, device_id, signal): Sets switch_state of specified device
                                          to signal.
 
@@ -88,7 +106,18 @@ class Devices:
 
     make_d_type(self, device_id): Makes a D-type device.
 
-    cold_startup(self): Simulates cold start-up of D-types and clocks.
+    get_word_port_ids(self, prefix, word_width): Returns the port IDs of a
+                                    word-wide port group, least significant
+                                    bit first.
+
+    make_word_device(self, device_id, device_kind, word_width): Makes a BUS,
+                          ADDER, MUX or REGISTER device of the given width.
+
+    cold_startup(self): Simulates cold start-up of D-types, registers and
+                        clocks.
+
+    cold_startup_device(self, device): Simulates cold start-up of a single
+                                       D-type, register or clock.
 
     make_device(self, device_id, device_kind, device_property=None): Creates
                        the specified device and returns errors if unsuccessful.
@@ -100,10 +129,16 @@ class Devices:
 
         self.devices_list = []
 
+        # devices_dictionary stores {device_id: Device} for constant-time
+        # lookup; it holds the same objects as devices_list
+        self.devices_dictionary = {}
+
         gate_strings = ["AND", "OR", "NAND", "NOR", "XOR"]
         device_strings = ["CLOCK", "SWITCH", "DTYPE"]
         dtype_inputs = ["CLK", "SET", "CLEAR", "DATA"]
         dtype_outputs = ["Q", "QBAR"]
+        word_strings = ["BUS", "ADDER", "MUX", "REGISTER"]
+        word_port_strings = ["CIN", "COUT", "SEL"]
 
         [self.NO_ERROR, self.INVALID_QUALIFIER, self.NO_QUALIFIER,
          self.BAD_DEVICE, self.QUALIFIER_PRESENT,
@@ -119,15 +154,30 @@ class Devices:
                                 self.DATA_ID] = self.names.lookup(dtype_inputs)
         self.dtype_output_ids = [
             self.Q_ID, self.QBAR_ID] = self.names.lookup(dtype_outputs)
+        self.word_types = [self.BUS, self.ADDER, self.MUX,
+                           self.REGISTER] = self.names.lookup(word_strings)
+        [self.CIN_ID, self.COUT_ID,
+         self.SEL_ID] = self.names.lookup(word_port_strings)
 
         self.max_gate_inputs = 16
+        self.max_word_width = 64
+
+        # word_port_ids stores {(prefix, word_width): [port_ids]}
+        self.word_port_ids = {}
+
+        # signal_names caches {(device_id, port_id): signal name string}; the
+        # string only depends on the two names, so it never goes stale
+        self.signal_names = {}
+
+        # output_ids indexes every output: {signal name: (device_id,
+        # output_id)}, in the order the outputs were added. Its sorted names
+        # are built on demand for prefix search.
+        self.output_ids = {}
+        self.sorted_output_names = None
 
     def get_device(self, device_id):
         """Return the Device object corresponding to device_id."""
-        for device in self.devices_list:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self.devices_dictionary.get(device_id, None)
 
     def find_devices(self, device_kind=None):
         """Return a list of device IDs of the specified device_kind.
@@ -148,6 +198,44 @@ class Devices:
         new_device = Device(device_id)
         new_device.device_kind = device_kind
         self.devices_list.append(new_device)
+        self.devices_dictionary[device_id] = new_device
+
+    def remove_device(self, device_id):
+        """Remove the specified device from the network.
+
+        Return True if successful. Connections from the device's outputs to
+        other devices are not removed.
+        """
+        device = self.devices_dictionary.get(device_id)
+        if device is None:
+            return False
+        for output_id in device.outputs:
+            del self.output_ids[self.get_signal_name(device_id, output_id)]
+        self.sorted_output_names = None
+        del self.devices_dictionary[device_id]
+        self.devices_list.remove(device)
+        return True
+
+    def get_device_property(self, device_id):
+        """Return the device property that the device was made with.
+
+        This is the switch state, the clock half period or the number of gate
+        inputs, as passed to make_device. Return None if the device has no
+        property or does not exist.
+        """
+        device = self.get_device(device_id)
+        if device is None:
+            return None
+        elif device.device_kind == self.SWITCH:
+            return device.switch_state
+        elif device.device_kind == self.CLOCK:
+            return device.clock_half_period
+        elif device.device_kind in [self.AND, self.OR, self.NAND, self.NOR]:
+            return len(device.inputs)
+        elif device.device_kind in self.word_types:
+            return device.word_width
+        else:
+            return None
 
     def add_input(self, device_id, input_id):
         """Add the specified input to the specified device.
@@ -168,7 +256,13 @@ class Devices:
         """
         device = self.get_device(device_id)
         if device is not None:
-            device.outputs[output_id] = signal
+            if output_id not in device.outputs:
+                device.outputs[output_id] = signal
+                signal_name = self.get_signal_name(device_id, output_id)
+                self.output_ids[signal_name] = (device_id, output_id)
+                self.sorted_output_names = None
+            else:
+                device.outputs[output_id] = signal
             return True
         else:
             return False
@@ -180,19 +274,22 @@ class Devices:
         either ID is invalid.
         """
         device = self.get_device(device_id)
-        if device is not None:
+        if device is None:
+            return None
+        if port_id is not None and port_id not in device.outputs and \
+                port_id not in device.inputs:
+            return None
+        key = (device_id, port_id)
+        signal_name = self.signal_names.get(key)
+        if signal_name is None:
             device_name = self.names.get_name_string(device_id)
             if port_id is None:
                 signal_name = device_name
-                return signal_name
-            elif port_id in device.outputs or port_id in device.inputs:
+            else:
                 port_name = self.names.get_name_string(port_id)
                 signal_name = ".".join([device_name, port_name])
-                return signal_name
-            else:
-                return None
-        else:
-            return None
+            self.signal_names[key] = signal_name
+        return signal_name
 
     def get_signal_ids(self, signal_name):
         """Return the device and output IDs of the specified signal."""
@@ -206,6 +303,28 @@ class Devices:
 
         return [device_id, output_id]
 
+    def find_output(self, signal_name):
+        """Return (device_id, output_id) of the named output signal.
+
+        Unlike get_signal_ids, no names are added. Return None if there is
+        no such output.
+        """
+        return self.output_ids.get(signal_name)
+
+    def find_output_names(self, prefix=""):
+        """Return the sorted names of the output signals starting with prefix.
+
+        The names are sorted once after outputs are added or removed, and
+        each search is then a binary search for the range of names.
+        """
+        if self.sorted_output_names is None:
+            self.sorted_output_names = sorted(self.output_ids)
+        names = self.sorted_output_names
+        first = bisect.bisect_left(names, prefix)
+        # every name with the prefix sorts before prefix + the last character
+        last = bisect.bisect_left(names, prefix + "\U0010ffff", first)
+        return names[first:last]
+
     def set_switch(self, device_id, signal):
         """Set the switch state of the specified device to signal.
 
@@ -235,7 +354,9 @@ class Devices:
         self.add_device(device_id, self.CLOCK)
         device = self.get_device(device_id)
         device.clock_half_period = clock_half_period
-        self.cold_startup()  # clock initialised to a random point in its cycle
+        self.add_output(device_id, output_id=None)
+        # clock initialised to a random point in its cycle
+        self.cold_startup_device(device)
 
     def make_gate(self, device_id, device_kind, no_of_inputs):
         """Make logic gates with the specified number of inputs."""
@@ -254,25 +375,86 @@ class Devices:
             self.add_input(device_id, input_id)
         for output_id in self.dtype_output_ids:
             self.add_output(device_id, output_id)
-        self.cold_startup()  # D-type initialised to a random state
+        # D-type initialised to a random state
+        self.cold_startup_device(self.get_device(device_id))
+
+    def get_word_port_ids(self, prefix, word_width):
+        """Return the port IDs of a word-wide group of ports.
+
+        The ports are named prefix1 to prefix<word_width>, and the IDs are
+        returned least significant bit first.
+        """
+        key = (prefix, word_width)
+        if key not in self.word_port_ids:
+            self.word_port_ids[key] = self.names.lookup(
+                ["".join([prefix, str(bit)])
+                 for bit in range(1, word_width + 1)])
+        return self.word_port_ids[key]
+
+    def make_word_device(self, device_id, device_kind, word_width):
+        """Make a BUS, ADDER, MUX or REGISTER device of the given width.
+
+        BUS: inputs I1-In, outputs O1-On. The outputs follow the inputs.
+        ADDER: inputs A1-An, B1-Bn, CIN, outputs S1-Sn, COUT. S = A + B + CIN.
+        MUX: inputs A1-An, B1-Bn, SEL, outputs O1-On. O = B if SEL else A.
+        REGISTER: inputs D1-Dn, CLK, outputs Q1-Qn. Q stores D on a rising
+                  clock edge.
+        """
+        self.add_device(device_id, device_kind)
+        device = self.get_device(device_id)
+        device.word_width = word_width
+
+        if device_kind == self.BUS:
+            input_ids = self.get_word_port_ids("I", word_width)
+            output_ids = self.get_word_port_ids("O", word_width)
+        elif device_kind == self.ADDER:
+            input_ids = (self.get_word_port_ids("A", word_width) +
+                         self.get_word_port_ids("B", word_width) +
+                         [self.CIN_ID])
+            output_ids = (self.get_word_port_ids("S", word_width) +
+                          [self.COUT_ID])
+        elif device_kind == self.MUX:
+            input_ids = (self.get_word_port_ids("A", word_width) +
+                         self.get_word_port_ids("B", word_width) +
+                         [self.SEL_ID])
+            output_ids = self.get_word_port_ids("O", word_width)
+        else:  # REGISTER
+            input_ids = self.get_word_port_ids("D", word_width) + [
+                self.CLK_ID]
+            output_ids = self.get_word_port_ids("Q", word_width)
+
+        for input_id in input_ids:
+            self.add_input(device_id, input_id)
+        for output_id in output_ids:
+            self.add_output(device_id, output_id)
+        # register initialised to a random word
+        self.cold_startup_device(device)
 
     def cold_startup(self):
-        """Simulate cold start-up of D-types and clocks.
+        """Simulate cold start-up of D-types, registers and clocks.
 
-        Set the memory of the D-types to a random state and make the clocks
-        begin from a random point in their cycles.
+        Set the memory of the D-types and registers to a random state and make
+        the clocks begin from a random point in their cycles.
         """
         for device in self.devices_list:
-            if device.device_kind == self.D_TYPE:
-                device.dtype_memory = random.choice([self.LOW, self.HIGH])
+            self.cold_startup_device(device)
+
+    def cold_startup_device(self, device):
+        """Simulate cold start-up of a single D-type, register or clock.
+
+        Other device kinds are left unchanged.
+        """
+        if device.device_kind == self.D_TYPE:
+            device.dtype_memory = random.choice([self.LOW, self.HIGH])
 
-            elif device.device_kind == self.CLOCK:
-                clock_signal = random.choice([self.LOW, self.HIGH])
-                self.add_output(device.device_id, output_id=None,
-                                signal=clock_signal)
-                # Initialise it to a random point in its cycle.
-                device.clock_counter = \
-                    random.randrange(device.clock_half_period)
+        elif device.device_kind == self.CLOCK:
+            clock_signal = random.choice([self.LOW, self.HIGH])
+            device.outputs[None] = clock_signal
+            # Initialise it to a random point in its cycle.
+            device.clock_counter = random.randrange(device.clock_half_period)
+
+        elif device.device_kind == self.REGISTER:
+            device.register_memory = random.getrandbits(device.word_width)
 
     def make_device(self, device_id, device_kind, device_property=None):
         """Create the specified device.
@@ -327,6 +509,16 @@ class Devices:
                 self.make_d_type(device_id)
                 error_type = self.NO_ERROR
 
+        elif device_kind in self.word_types:
+            # Device property is the word width
+            if device_property is None:
+                error_type = self.NO_QUALIFIER
+            elif device_property not in range(1, self.max_word_width + 1):
+                error_type = self.INVALID_QUALIFIER
+            else:
+                self.make_word_device(device_id, device_kind, device_property)
+                error_type = self.NO_ERROR
+
         else:
             error_type = self.BAD_DEVICE
 
@@ -0,0 +1,77 @@
+"""Describe the errors found in a circuit definition file.
+
+Used in the Logic Simulator project to hand parser errors to the user
+interfaces, or to scripts checking many definition files, as objects rather
+than printed text. Formatting, including the source excerpt, only happens
+when a diagnostic is displayed.
+
+Classes
+-------
+Diagnostic - stores one error found in a definition file.
+"""
+
+
+class Diagnostic:
+    """Store one error found in a definition file.
+
+    The excerpt shows the source line with a caret under the error. It is
+    read from the scanner the first time it is asked for, so diagnostics
+    that are only counted or compared never build one.
+
+    Parameters
+    ----------
+    code: error code, one of the parser's error types.
+    message: description of the error.
+    line_number: line of the error, or None if it has no location in the
+                 file (such as an unconnected network).
+    position: column of the error in its line, starting at 1.
+    scanner: instance of the scanner.Scanner() class that read the file.
+
+    Public methods
+    --------------
+    excerpt: The source line with a caret under the error, or None if the
+             error has no location (property).
+
+    format(self): Returns the diagnostic as the parser prints it.
+
+    format_summary(error_count, stopped=False): Returns the line printed
+                                               after all the diagnostics
+                                               (static method).
+    """
+
+    def __init__(self, code, message, line_number=None, position=None,
+                 scanner=None):
+        """Store the error and where it was found."""
+        self.code = code
+        self.message = message
+        self.line_number = line_number
+        self.position = position
+        self.scanner = scanner
+        self._excerpt = None
+
+    def __repr__(self):
+        """Return the error code, message and location."""
+        return (f"Diagnostic({self.code}, {self.message!r}, "
+                f"{self.line_number}, {self.position})")
+
+    @property
+    def excerpt(self):
+        """Return the source line with a caret under the error."""
+        if self._excerpt is None and self.line_number is not None:
+            # print_error only reads the line number and position
+            self._excerpt = self.scanner.print_error(self)
+        return self._excerpt
+
+    def format(self):
+        """Return the diagnostic as the parser prints it."""
+        if self.line_number is None:
+            return self.message + "\n"
+        return (f"{self.message}\nLINE {self.line_number}:\n"
+                f"{self.excerpt}\n")
+
+    @staticmethod
+    def format_summary(error_count, stopped=False):
+        """Return the line printed after all the diagnostics."""
+        if stopped:
+            return f"Summary: stopped after {error_count} error/s\n"
+        return f"Summary: {error_count} error/s found\n"
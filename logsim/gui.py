@@ -18,6 +18,9 @@ from network import Network
 from monitors import Monitors
 from scanner import Scanner
 from parse import Parser
+from reload import NetworkReloader
+from simworker import SimulationWorker
+from waveform import WaveformTrace, WaveformView, MonitorSamples
 
 class MyGLCanvas(wxcanvas.GLCanvas):
     """Handle all drawing operations.
@@ -75,6 +78,22 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         # Initialize empty signal data
         self.signal_data = {}
 
+        # Waveform geometry for each signal in signal_data, and the vertex
+        # buffer holding each of its levels:
+        # {(signal name, level): [buffer ID, capacity, uploaded]}, where
+        # capacity and uploaded are numbers of vertices
+        self.traces = {}
+        self.vertex_buffers = {}
+
+        # Part of the drawing visible after panning and zooming, updated on
+        # every render
+        self.view = WaveformView(self.time_unit_width, self.signal_height)
+        self.visible_cycles = (0, 0)
+        self.visible_rows = range(0)
+        self.cycles_per_pixel = 1.0
+        # Smallest spacing of time axis labels in pixels
+        self.label_spacing = 25
+
         # Status text
         self.status_text = ""
         
@@ -133,6 +152,7 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         GL.glPushMatrix()
         GL.glTranslated(self.pan_x, self.pan_y, 0.0)
         GL.glScaled(self.zoom, self.zoom, self.zoom)
+        self.update_view()
         
         # Draw grid with current grid color
         GL.glColor3f(*self.grid_color)
@@ -160,8 +180,31 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         GL.glFlush()
         self.SwapBuffers()
 
+    def update_view(self):
+        """Work out the visible cycles and signal rows.
+
+        The mapping from drawing to screen coordinates is read from the
+        modelview matrix, so it includes every pan and zoom transformation.
+        """
+        size = self.GetClientSize()
+        matrix = GL.glGetDoublev(GL.GL_MODELVIEW_MATRIX)
+        scale_x, offset_x = matrix[0][0], matrix[3][0]
+        scale_y, offset_y = matrix[1][1], matrix[3][1]
+        self.visible_cycles = self.view.get_visible_cycles(
+            offset_x, scale_x, size.width)
+        self.visible_rows = self.view.get_visible_rows(
+            offset_y, scale_y, size.height, len(self.signal_data))
+        self.cycles_per_pixel = self.view.get_cycles_per_pixel(scale_x)
+
+    def get_label_step(self):
+        """Return the number of cycles between time axis labels."""
+        step = 1
+        while step < self.label_spacing * self.cycles_per_pixel:
+            step *= 2
+        return step
+
     def draw_grid(self):
-        """Draw the background grid."""
+        """Draw the visible part of the background grid."""
         size = self.GetClientSize()
         GL.glLineWidth(self.grid_line_width)
         GL.glBegin(GL.GL_LINES)
@@ -171,96 +214,146 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         num_signals = len(self.signal_data)
         total_height = max((num_signals + 1) * self.signal_height, size.height - self.bottom_margin)
         total_width = max(max_time_units * self.time_unit_width, size.width)
-        
-        # Vertical grid lines
-        for x in range(0, int(total_width), self.time_unit_width):
+        first_cycle, last_cycle = self.visible_cycles
+        last_x = min(last_cycle * self.time_unit_width, total_width)
+        
+        # Vertical grid lines, thinned out when zoomed out
+        step = self.get_label_step()
+        for cycle in range(first_cycle - first_cycle % step, last_cycle,
+                           step):
+            x = cycle * self.time_unit_width
+            if x >= total_width:
+                break
             GL.glVertex2f(x, 0)
             GL.glVertex2f(x, total_height)
             
         # Horizontal grid lines
         for y in range(0, int(total_height), self.signal_height):
-            GL.glVertex2f(0, y)
-            GL.glVertex2f(total_width, y)
+            GL.glVertex2f(first_cycle * self.time_unit_width, y)
+            GL.glVertex2f(last_x, y)
             
         GL.glEnd()
 
     def draw_time_axis(self):
-        """Draw the time axis with numbers."""
-        size = self.GetClientSize()
+        """Draw the time axis with numbers for the visible cycles."""
         max_time_units = max(50, max((len(signal_list) for signal_list in self.signal_data.values()), default=0))
+        first_cycle, last_cycle = self.visible_cycles
+        step = self.get_label_step()
         
-        for i in range(max_time_units):
+        for i in range(first_cycle - first_cycle % step,
+                       min(last_cycle, max_time_units), step):
             x = i * self.time_unit_width
             self.render_text(str(i), x + 5, 5)
 
+    def update_traces(self):
+        """Add newly recorded cycles in signal_data to the waveform traces.
+
+        Only the cycles recorded since the last update generate geometry. A
+        trace that became shorter (after a reset) is rebuilt.
+        """
+        for signal_name in list(self.traces):
+            if signal_name not in self.signal_data:
+                del self.traces[signal_name]
+                self.delete_vertex_buffers(signal_name)
+        for signal_name, values in self.signal_data.items():
+            trace = self.traces.get(signal_name)
+            if trace is None:
+                trace = self.traces[signal_name] = WaveformTrace()
+            elif len(values) < trace.length:
+                trace.reset()
+                self.delete_vertex_buffers(signal_name)
+            if len(values) > trace.length:
+                trace.extend(values[trace.length:])
+
+    def delete_vertex_buffers(self, signal_name):
+        """Delete the vertex buffers of every level of a signal."""
+        for key in list(self.vertex_buffers):
+            if key[0] == signal_name:
+                buffer_id = self.vertex_buffers.pop(key)[0]
+                GL.glDeleteBuffers(1, [buffer_id])
+
+    def upload_trace(self, signal_name, trace, level):
+        """Copy the new vertices of a trace level into its vertex buffer.
+
+        The buffer grows by doubling, so the whole level is only copied when
+        the buffer is reallocated. Return the buffer ID.
+        """
+        key = (signal_name, level)
+        vertex_count = trace.get_vertex_count(level)
+        if key not in self.vertex_buffers:
+            self.vertex_buffers[key] = [GL.glGenBuffers(1), 0, 0]
+        vertex_buffer = self.vertex_buffers[key]
+        buffer_id, capacity, uploaded = vertex_buffer
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer_id)
+        if vertex_count > capacity:
+            capacity = max(1024, 2 * vertex_count)
+            # 2 floats of 4 bytes per vertex
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, capacity * 8, None,
+                            GL.GL_DYNAMIC_DRAW)
+            uploaded = 0
+        if vertex_count > uploaded:
+            vertices = trace.level_vertices[level]
+            GL.glBufferSubData(GL.GL_ARRAY_BUFFER, uploaded * 8,
+                               (vertex_count - uploaded) * 8,
+                               vertices[2 * uploaded:].tobytes())
+        vertex_buffer[1:] = [capacity, vertex_count]
+        return buffer_id
+
     def draw_signals(self):
-        """Draw all signal waveforms."""
-        if not self.signal_data:  # If no signals to draw
+        """Draw the visible part of all signal waveforms.
+
+        Only the signal rows and cycles on screen are drawn. When zoomed out
+        to more than one cycle per pixel, the decimated level of the trace
+        whose buckets fit in a pixel is drawn instead of every cycle, so the
+        number of vertices drawn is bounded by the width of the canvas. Each
+        range of vertices is drawn from its vertex buffer with a single call,
+        scaled from trace units to the size of a time unit and signal row.
+        """
+        self.update_traces()
+        if not self.traces:  # If no signals to draw
             return
-            
+
         y_offset = self.signal_height
         GL.glLineWidth(self.signal_line_width)  # Set thicker line width for signals
-        
-        for i, (signal_name, values) in enumerate(self.signal_data.items()):
-            if not values:  # Skip empty signal lists
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        first_cycle, last_cycle = self.visible_cycles
+        signal_names = list(self.signal_data)
+
+        for i in self.visible_rows:
+            signal_name = signal_names[i]
+            trace = self.traces[signal_name]
+            level = trace.get_level(self.cycles_per_pixel)
+            draw_ranges = trace.get_draw_ranges(first_cycle, last_cycle,
+                                                level)
+            if not draw_ranges:  # Skip signals with nothing on screen
                 continue
-                
+
             color = self.signal_colors[i % len(self.signal_colors)]
             GL.glColor3f(*color)
-            
+
             y_base = y_offset + (i * self.signal_height)
-            last_value = values[0]
-            last_valid_value = 0  # Default to low for the first valid signal
-            first_valid_found = False  # Track if we've found the first valid signal
-            
-            GL.glBegin(GL.GL_LINE_STRIP)
-            
-            for t, value in enumerate(values):
-                x = t * self.time_unit_width
-                
-                # Skip drawing if this is a blank signal
-                if value is None:
-                    if t > 0 and values[t-1] is not None:
-                        # If previous signal wasn't blank, end the line here
-                        GL.glEnd()
-                        GL.glBegin(GL.GL_LINE_STRIP)
-                    continue
-                
-                # If we're coming from a blank signal, start a new line
-                if t > 0 and values[t-1] is None:
-                    GL.glEnd()
-                    GL.glBegin(GL.GL_LINE_STRIP)
-                    # Start from the current position
-                    last_valid_value = value
-                
-                y = y_base + (self.signal_height * 0.8 if value else self.signal_height * 0.2)
-                
-                # Draw vertical line if value changed and neither current nor previous is blank
-                # But only if this isn't the first valid signal we've encountered
-                if value != last_valid_value and last_value is not None and first_valid_found:
-                    GL.glVertex2f(x, y_base + (self.signal_height * 0.2))
-                    GL.glVertex2f(x, y_base + (self.signal_height * 0.8))
-                
-                GL.glVertex2f(x, y)
-                GL.glVertex2f(x + self.time_unit_width, y)
-                
-                if not first_valid_found and value is not None:
-                    first_valid_found = True
-                
-                last_value = value
-                if value is not None:
-                    last_valid_value = value
-            
-            GL.glEnd()
-            
+            GL.glPushMatrix()
+            GL.glTranslated(0.0, y_base, 0.0)
+            GL.glScaled(self.time_unit_width, self.signal_height, 1.0)
+            for level, first_vertex, vertex_count in draw_ranges:
+                self.upload_trace(signal_name, trace, level)
+                GL.glVertexPointer(2, GL.GL_FLOAT, 0, None)
+                GL.glDrawArrays(GL.GL_LINES, first_vertex, vertex_count)
+            GL.glPopMatrix()
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+
     def draw_signal_names(self):
-        """Draw the signal names on the left side."""
+        """Draw the names of the visible signals on the left side."""
         if not self.signal_data:  # If no signals to draw
             return
             
         y_offset = self.signal_height
+        signal_names = list(self.signal_data)
         
-        for i, signal_name in enumerate(self.signal_data.keys()):
+        for i in self.visible_rows:
+            signal_name = signal_names[i]
             y = y_offset + (i * self.signal_height) + (self.signal_height // 2)
             self.render_text(signal_name, 10, y)
 
@@ -566,7 +659,7 @@ class CustomListCtrl(wx.ListCtrl):
                     self.Refresh()
                     
                     # Execute network to propagate changes
-                    if parent.network.execute_network():
+                    if parent.settle_network():
                         parent.update_display()
                     else:
                         wx.MessageBox("Error: Network oscillating", "Error",
@@ -603,7 +696,7 @@ class CustomListCtrl(wx.ListCtrl):
                 )
                 parent.SetStatusText(f"[Activated] Toggled {switch_name} to {'HIGH' if new_state == parent.devices.HIGH else 'LOW'}")
                 self.Refresh()
-                if parent.network.execute_network():
+                if parent.settle_network():
                     parent.update_display()
                 else:
                     wx.MessageBox("Error: Network oscillating", "Error", wx.OK | wx.ICON_ERROR)
@@ -691,6 +784,12 @@ class Gui(wx.Frame):
 
     on_remove_monitor(self, event): Event handler for when the user clicks the
                                 remove monitor button.
+
+    on_reload(self, event): Event handler for when the user selects the reload
+                            menu item.
+
+    on_watch_timer(self, event): Event handler that reloads the definition
+                                 file when it changes on disk.
     """
 
     def __init__(self, title, path, names, devices, network, monitors, language):
@@ -703,15 +802,36 @@ class Gui(wx.Frame):
         self.network = network
         self.language = language
 
+        # Samples of the monitored signals drawn on the canvas
+        self.samples = MonitorSamples(devices, monitors)
+        # Monitors shown in the monitor list, in list order, and the state
+        # shown for each: [(device ID, output ID)], [state]
+        self.monitor_rows = []
+        self.monitor_states = []
+        self.monitor_keys = None  # monitors the list was built for
+
+        # Re-parses the definition file when it is edited
+        self.reloader = NetworkReloader(path, names, devices, network,
+                                        monitors)
+
         # Add simulation speed settings
         self.speed_settings = {
             'x0.5': 400,  # 800ms
             'x1': 200,  # 400ms
             'x2': 100,  # 200ms
             'x4': 50,  # 100ms
-            'x8': 25    # 50ms
+            'x8': 25,    # 50ms
+            'max': None  # cycles run in a worker thread
         }
         self.current_speed = 'x1'  # Start at normal speed
+        # At max speed the GUI redraws at a fixed frame rate while the
+        # worker runs cycles as fast as it can
+        self.worker = SimulationWorker(network, monitors)
+        self.frame_interval = 33  # ms, about 30 frames per second
+
+        # Most signals listed in the Add Monitor dialog; the search box
+        # narrows down longer lists
+        self.max_signal_choices = 1000
 
         # Initialize theme colors
         self.light_theme = {
@@ -807,6 +927,12 @@ class Gui(wx.Frame):
         fileMenu.Append(wx.ID_ABOUT, "&About")
         fileMenu.Append(wx.ID_HELP, "&Help\tF1")
         fileMenu.AppendSeparator()
+        self.RELOAD_ID = wx.NewId()
+        self.WATCH_ID = wx.NewId()
+        fileMenu.Append(self.RELOAD_ID, "&Reload Definition File\tCtrl+R")
+        self.watch_item = fileMenu.AppendCheckItem(self.WATCH_ID,
+                                                   "&Watch Definition File")
+        fileMenu.AppendSeparator()
         fileMenu.Append(wx.ID_EXIT, "E&xit\tAlt+F4")
         menuBar.Append(fileMenu, "&File")
         
@@ -966,6 +1092,8 @@ class Gui(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_menu)
         self.Bind(wx.EVT_MENU, self.on_light_mode, id=self.LIGHT_MODE_ID)
         self.Bind(wx.EVT_MENU, self.on_dark_mode, id=self.DARK_MODE_ID)
+        self.Bind(wx.EVT_MENU, self.on_reload, id=self.RELOAD_ID)
+        self.Bind(wx.EVT_MENU, self.on_watch_toggle, id=self.WATCH_ID)
         self.run_button.Bind(wx.EVT_BUTTON, self.on_run_button)
         self.stop_button.Bind(wx.EVT_BUTTON, self.on_stop_button)
         self.reset_button.Bind(wx.EVT_BUTTON, self.on_reset_button)
@@ -1005,6 +1133,14 @@ class Gui(wx.Frame):
         # Bind the timer event
         self.Bind(wx.EVT_TIMER, self.on_simulation_tick, self.simulation_timer)
 
+        # Timer redrawing the display while the worker runs at max speed
+        self.frame_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_frame_timer, self.frame_timer)
+
+        # Timer polling the definition file for changes when watching it
+        self.watch_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_watch_timer, self.watch_timer)
+
         # Apply initial theme
         self.apply_theme()
 
@@ -1030,13 +1166,14 @@ How to Use the Logic Simulator GUI
 - **F1:** Show this Help window
 - **Alt+F4:** Exit the application
 - **Spacebar:** Run/Pause the simulation
+- **Ctrl+R:** Reload the definition file, keeping the recorded traces
 
 **Simulation Controls**
 - **Number of Cycles:** Set how many cycles to run the simulation for.
 - **▶ Run Simulation:** Start the simulation for the chosen number of cycles.
 - **❚❚ Pause:** Pause the simulation at any time.
 - **■ Reset:** Reset the simulation and clear all monitor data.
-- **Speed:** Click to cycle through simulation speeds (x0.5, x1, x2, x4, x8).
+- **Speed:** Click to cycle through simulation speeds (x0.5, x1, x2, x4, x8, max). At max speed the simulation runs in the background and the display is redrawn about 30 times a second.
 
 **Switch Controls**
 - Toggle individual switches by clicking the switch in the list.
@@ -1066,6 +1203,63 @@ For more help, see the project documentation or contact the authors.
                 wx.ICON_INFORMATION | wx.OK
             )
 
+    def on_reload(self, event):
+        """Handle the event when the user selects the reload menu item."""
+        self.reload_network()
+
+    def on_watch_toggle(self, event):
+        """Start or stop watching the definition file for changes."""
+        if self.watch_item.IsChecked():
+            self.watch_timer.Start(1000)  # poll once a second
+            self.SetStatusText("Watching definition file for changes")
+        else:
+            self.watch_timer.Stop()
+            self.SetStatusText("Stopped watching definition file")
+
+    def on_watch_timer(self, event):
+        """Reload the definition file if it has changed on disk."""
+        if self.reloader.has_changed():
+            self.reload_network()
+
+    def reload_network(self):
+        """Re-parse the definition file and apply the changes in place."""
+        # Traces of new monitors are padded to the current trace length
+        cycles_completed = 0
+        if self.monitors.monitors_dictionary:
+            first_monitor = next(iter(
+                self.monitors.monitors_dictionary.values()))
+            cycles_completed = len(first_monitor)
+
+        with self.worker.lock:
+            reloaded = self.reloader.reload(cycles_completed)
+        if not reloaded:
+            diagnostics = self.reloader.diagnostics
+            for diagnostic in diagnostics:
+                print(diagnostic.format())
+            first = diagnostics[0]
+            location = ""
+            if first.line_number is not None:
+                location = f" (line {first.line_number})"
+            self.SetStatusText(
+                f"Reload failed: {len(diagnostics)} error/s, first: "
+                f"{first.message}{location}")
+            return
+        changes = self.reloader.changes
+        warnings = self.reloader.warnings
+        for diagnostic in warnings:
+            print(diagnostic.format())
+        self.update_switch_list()
+        self.update_monitor_list(show_states=self.is_running)
+        self.update_signal_display()
+        self.SetStatusText(
+            f"Reloaded: {changes['devices_added']} devices added, "
+            f"{changes['devices_removed']} removed, "
+            f"{changes['connections_added']} connections added, "
+            f"{changes['connections_removed']} removed, "
+            f"{changes['monitors_added']} monitors added, "
+            f"{changes['monitors_removed']} removed" +
+            (f", {len(warnings)} unused output/s" if warnings else ""))
+
     def on_spin(self, event):
         """Handle the event when the user changes the spin control value."""
         spin_value = self.cycles_spin.GetValue()
@@ -1106,14 +1300,24 @@ For more help, see the project documentation or contact the authors.
             self.reset_button.Disable()
             self.cycles_spin.Disable()
             
-            # Start the simulation timer with current speed setting
-            self.simulation_timer.Start(self.speed_settings[self.current_speed])
+            if self.speed_settings[self.current_speed] is None:
+                # Run in the worker, redrawing at the frame rate
+                self.worker.start(num_cycles)
+                self.frame_timer.Start(self.frame_interval)
+            else:
+                # Start the simulation timer with current speed setting
+                self.simulation_timer.Start(self.speed_settings[self.current_speed])
             self.SetStatusText(f"Running simulation for {num_cycles} cycles...")
             
     def stop_simulation(self):
         """Stop the currently running simulation."""
         if self.is_running:
             self.simulation_timer.Stop()
+            self.frame_timer.Stop()
+            if self.worker.is_running():
+                self.worker.stop()
+                # Show the cycles run since the last frame
+                self.on_frame_timer(None)
             self.is_running = False
             self.run_button.Enable()
             self.stop_button.Disable()
@@ -1152,6 +1356,34 @@ For more help, see the project documentation or contact the authors.
                 self.stop_simulation()
                 self.SetStatusText("Simulation error occurred")
                 
+    def on_frame_timer(self, event):
+        """Redraw the display from the cycles run by the worker."""
+        progress = self.worker.get_progress()
+        if progress is None:
+            return
+        completed, status = progress
+        self.current_cycle = completed
+        self.update_display()
+        if status == self.worker.FINISHED:
+            self.stop_simulation()
+            self.SetStatusText("Simulation completed")
+        elif status == self.worker.NETWORK_ERROR:
+            self.stop_simulation()
+            self.SetStatusText("Simulation error: network oscillating")
+        else:
+            self.SetStatusText(
+                f"Running simulation: {completed} of "
+                f"{self.target_cycles} cycles")
+
+    def settle_network(self):
+        """Execute the network after a switch change.
+
+        The worker lock is held, so a simulation running at max speed is not
+        executing the network at the same time.
+        """
+        with self.worker.lock:
+            return self.network.execute_network()
+
     def execute_cycle(self):
         """Execute a single cycle of the simulation."""
         try:
@@ -1168,14 +1400,27 @@ For more help, see the project documentation or contact the authors.
             
     def update_display(self):
         """Update the display with current simulation state."""
-        # Update the monitor list with states since we're running
-        self.update_monitor_list(show_states=True)
-        
-        # Update the canvas with new signal data
-        self.update_signal_display()
+        with self.worker.lock:
+            # Update the monitor list with states since we're running
+            self.update_monitor_list(show_states=True)
+            
+            # Update the canvas with new signal data
+            self.update_signal_display()
         
-    def update_monitor_list(self, show_states=False):
-        """Update the monitor list with current monitor states."""
+    def update_monitor_list(self, show_states=False, rebuild=False):
+        """Update the monitor list with current monitor states.
+
+        The list items and zap buttons are only rebuilt when the set of
+        monitors has changed (or rebuild is True, e.g. after a theme change).
+        Otherwise only the state column of rows whose state changed is set.
+        """
+        monitor_keys = list(self.monitors.monitors_dictionary)
+        if rebuild or monitor_keys != self.monitor_keys:
+            self.rebuild_monitor_list(monitor_keys)
+        self.update_monitor_states(show_states)
+
+    def rebuild_monitor_list(self, monitor_keys):
+        """Recreate the monitor list items and zap buttons."""
         # Clean up existing zap buttons
         if hasattr(self.monitor_list, 'zap_buttons'):
             for button in self.monitor_list.zap_buttons.values():
@@ -1183,16 +1428,20 @@ For more help, see the project documentation or contact the authors.
             self.monitor_list.zap_buttons = {}
             
         self.monitor_list.DeleteAllItems()
+        self.monitor_keys = monitor_keys
         
         # Get monitored signals and maintain original order from monitors dictionary
         monitored_signals = []
-        for i, (device_id, output_id) in enumerate(self.monitors.monitors_dictionary):
+        for i, (device_id, output_id) in enumerate(monitor_keys):
             signal_name = self.devices.get_signal_name(device_id, output_id)
             # Store original index to maintain color consistency
             monitored_signals.append((signal_name, device_id, output_id, i))
         
         # Sort signals alphabetically but keep track of original index
         monitored_signals.sort(key=lambda x: x[0])  # Sort by signal name
+        self.monitor_rows = [(device_id, output_id) for
+                             _, device_id, output_id, _ in monitored_signals]
+        self.monitor_states = [""] * len(monitored_signals)
         
         # Add to list
         for list_index, (signal_name, device_id, output_id, original_index) in enumerate(monitored_signals):
@@ -1216,30 +1465,6 @@ For more help, see the project documentation or contact the authors.
             item.SetTextColour(wx_color)
             self.monitor_list.SetItem(item)
             
-            # Clear any text colors first
-            for col in [1,2,3]:  # For all columns including zap button
-                for i in range(self.monitor_list.GetItemCount()):
-                    item = self.monitor_list.GetItem(i, col)
-                    item.SetTextColour(wx.NullColour)  # Reset to default
-                    self.monitor_list.SetItem(item)
-
-            # Only show states if we're running
-            if show_states:
-                # Get current signal value
-                current_signal = self.network.get_output_signal(device_id, output_id)
-                if current_signal is not None:
-                    if current_signal == self.devices.HIGH:
-                        state = "HIGH"
-                    elif current_signal == self.devices.LOW:
-                        state = "LOW"
-                    elif current_signal == self.devices.RISING:
-                        state = "RISING"
-                    elif current_signal == self.devices.FALLING:
-                        state = "FALLING"
-                    else:
-                        state = str(current_signal)
-                    self.monitor_list.SetItem(index, 2, state)
-            
             # Add zap button with adjusted position to account for scroll bar
             zap_button = wx.Button(self.monitor_list, id=index, label="✕", size=(25, 20), style=wx.NO_BORDER)
             zap_button.SetBackgroundColour(self.current_theme['button']['reset'])  # Red color
@@ -1266,70 +1491,83 @@ For more help, see the project documentation or contact the authors.
         self.monitor_list.SetColumnWidth(2, 55)   # Fixed width for state, narrower
         self.monitor_list.SetColumnWidth(3, 45)   # Fixed width for zap button, even wider for scroll bar
 
+    def update_monitor_states(self, show_states):
+        """Set the state column of the rows whose state has changed."""
+        for index, (device_id, output_id) in enumerate(self.monitor_rows):
+            state = ""
+            # Only show states if we're running
+            if show_states:
+                # Get current signal value
+                current_signal = self.network.get_output_signal(device_id, output_id)
+                if current_signal is not None:
+                    if current_signal == self.devices.HIGH:
+                        state = "HIGH"
+                    elif current_signal == self.devices.LOW:
+                        state = "LOW"
+                    elif current_signal == self.devices.RISING:
+                        state = "RISING"
+                    elif current_signal == self.devices.FALLING:
+                        state = "FALLING"
+                    else:
+                        state = str(current_signal)
+            if state != self.monitor_states[index]:
+                self.monitor_list.SetItem(index, 2, state)
+                self.monitor_states[index] = state
+
     def on_zap_button(self, event, signal_name):
         """Handle clicking the zap button for a specific monitor."""
         # Find the device and output IDs for this signal
-        for (device_id, output_id) in list(self.monitors.monitors_dictionary.keys()):
-            if signal_name == self.devices.get_signal_name(device_id, output_id):
-                # Remove the monitor
-                if self.monitors.remove_monitor(device_id, output_id):
-                    self.SetStatusText(
-                        f"Zapped monitor for {signal_name}"
-                    )
-                else:
-                    wx.MessageBox(
-                        f"Failed to zap monitor {signal_name}",
-                        "Error",
-                        wx.OK | wx.ICON_ERROR
-                    )
-                break
+        signal_ids = self.monitors.find_monitor(signal_name)
+        if signal_ids is not None:
+            # Remove the monitor
+            with self.worker.lock:
+                removed = self.monitors.remove_monitor(*signal_ids)
+            if removed:
+                self.SetStatusText(
+                    f"Zapped monitor for {signal_name}"
+                )
+            else:
+                wx.MessageBox(
+                    f"Failed to zap monitor {signal_name}",
+                    "Error",
+                    wx.OK | wx.ICON_ERROR
+                )
         # Update display after monitor is removed
         self.update_monitor_list(show_states=self.is_running)
         self.update_signal_display()
 
     def update_signal_display(self):
-        """Update the signal display on the canvas."""
-        signal_data = {}
-        
-        # Get all monitored signals
-        for (device_id, output_id), signal_list in self.monitors.monitors_dictionary.items():
-            signal_name = self.devices.get_signal_name(device_id, output_id)
-            # Convert signal values to binary (0 or 1) or None for BLANK
-            binary_signals = []
-            for signal in signal_list:
-                if signal == self.devices.HIGH or signal == self.devices.RISING:
-                    binary_signals.append(1)
-                elif signal == self.devices.LOW or signal == self.devices.FALLING:
-                    binary_signals.append(0)
-                elif signal == self.devices.BLANK:
-                    binary_signals.append(None)  # Use None to represent blank/no signal
-                else:
-                    # For any other signal state, treat as blank
-                    binary_signals.append(None)
-            signal_data[signal_name] = binary_signals
-            
-        # Update the canvas
-        self.canvas.signal_data = signal_data
+        """Add newly recorded signals to the canvas and redraw it."""
+        self.samples.update()
+        self.canvas.signal_data = self.samples.signal_data
         self.canvas.render()
         
     def on_add_monitor(self, event):
         """Handle adding a new monitor."""
         # Create a dialog to select device and output
-        dialog = wx.Dialog(self, title="Add Monitor", size=(300, 150))
+        dialog = wx.Dialog(self, title="Add Monitor", size=(300, 190))
         dialog_sizer = wx.BoxSizer(wx.VERTICAL)
         
-        # Get all available signals
-        _, non_monitored = self.monitors.get_signal_names()
+        # Get the available signals, up to the most the choice can show
+        non_monitored = self.monitors.search_signal_names()
         
         if not non_monitored:
             wx.MessageBox("No more signals available to monitor", "Information",
                          wx.OK | wx.ICON_INFORMATION)
             dialog.Destroy()
             return
+        # Add search box narrowing the signals to those starting with its text
+        search_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        search_label = wx.StaticText(dialog, label="Search:")
+        search_text = wx.TextCtrl(dialog)
+        search_sizer.Add(search_label, 0, wx.ALL | wx.CENTER, 5)
+        search_sizer.Add(search_text, 1, wx.ALL | wx.EXPAND, 5)
+
         # Add signal selection
         signal_sizer = wx.BoxSizer(wx.HORIZONTAL)
         signal_label = wx.StaticText(dialog, label="Signal:")
-        signal_choice = wx.Choice(dialog, choices=non_monitored)
+        signal_choice = wx.Choice(
+            dialog, choices=non_monitored[:self.max_signal_choices])
         signal_sizer.Add(signal_label, 0, wx.ALL | wx.CENTER, 5)
         signal_sizer.Add(signal_choice, 1, wx.ALL | wx.EXPAND, 5)
         
@@ -1344,6 +1582,7 @@ For more help, see the project documentation or contact the authors.
         button_sizer.Add(cancel_button, 1, wx.ALL, 5)
         
         # Build dialog layout
+        dialog_sizer.Add(search_sizer, 0, wx.ALL | wx.EXPAND, 5)
         dialog_sizer.Add(signal_sizer, 0, wx.ALL | wx.EXPAND, 5)
         dialog_sizer.Add(button_sizer, 0, wx.ALL | wx.CENTER, 5)
         
@@ -1352,6 +1591,13 @@ For more help, see the project documentation or contact the authors.
         # Enable Add button only when a signal is selected
         ok_button.Enable(False)
         signal_choice.Bind(wx.EVT_CHOICE, lambda evt: ok_button.Enable(evt.GetSelection() != -1))
+
+        def on_search(evt):
+            """Show the signals starting with the search text."""
+            matches = self.monitors.search_signal_names(search_text.GetValue())
+            signal_choice.Set(matches[:self.max_signal_choices])
+            ok_button.Enable(False)
+        search_text.Bind(wx.EVT_TEXT, on_search)
         
         # Bind Add All button
         add_all_button.Bind(wx.EVT_BUTTON, lambda evt: self.on_add_all_monitors(evt, dialog))
@@ -1364,36 +1610,37 @@ For more help, see the project documentation or contact the authors.
 
     def add_single_monitor(self, signal_name):
         """Add a single monitor for the given signal name."""
-        # Get current signal history length from any existing monitor
-        current_cycles = 0
-        if self.monitors.monitors_dictionary:
-            # Get the length of signal history from the first monitor
-            first_monitor = next(iter(self.monitors.monitors_dictionary.values()))
-            current_cycles = len(first_monitor)
-        # Find the device and output IDs for this signal
-        for device_id in self.devices.find_devices():
-            device = self.devices.get_device(device_id)
-            for output_id in device.outputs:
-                if signal_name == self.devices.get_signal_name(device_id, output_id):
-                    # Add the monitor with current signal history length
-                    if (
-                        self.monitors.make_monitor(device_id, output_id, current_cycles)
-                        == self.monitors.NO_ERROR
-                    ):
-                        self.update_monitor_list(show_states=self.is_running)
-                        self.update_signal_display()
-                        self.SetStatusText(
-                            f"Added monitor for {signal_name}"
-                        )
-                        return True
-                    else:
-                        wx.MessageBox(
-                            f"Failed to add monitor for {signal_name}",
-                            "Error",
-                            wx.OK | wx.ICON_ERROR
-                        )
-                        return False
-        return False
+        # The worker must not record signals while the monitor is added
+        with self.worker.lock:
+            # Get current signal history length from any existing monitor
+            current_cycles = 0
+            if self.monitors.monitors_dictionary:
+                # Get the length of signal history from the first monitor
+                first_monitor = next(iter(self.monitors.monitors_dictionary.values()))
+                current_cycles = len(first_monitor)
+            # Find the device and output IDs for this signal
+            signal_ids = self.devices.find_output(signal_name)
+            if signal_ids is None:
+                return False
+            device_id, output_id = signal_ids
+            # Add the monitor with current signal history length
+            if (
+                self.monitors.make_monitor(device_id, output_id, current_cycles)
+                == self.monitors.NO_ERROR
+            ):
+                self.update_monitor_list(show_states=self.is_running)
+                self.update_signal_display()
+                self.SetStatusText(
+                    f"Added monitor for {signal_name}"
+                )
+                return True
+            else:
+                wx.MessageBox(
+                    f"Failed to add monitor for {signal_name}",
+                    "Error",
+                    wx.OK | wx.ICON_ERROR
+                )
+                return False
 
     def on_add_all_monitors(self, event, dialog):
         """Handle adding all available monitors."""
@@ -1414,9 +1661,21 @@ For more help, see the project documentation or contact the authors.
         )
         if dlg.ShowModal() == wx.ID_YES:
             success_count = 0
-            for signal_name in non_monitored:
-                if self.add_single_monitor(signal_name):
-                    success_count += 1
+            with self.worker.lock:
+                current_cycles = 0
+                if self.monitors.monitors_dictionary:
+                    first_monitor = next(iter(self.monitors.monitors_dictionary.values()))
+                    current_cycles = len(first_monitor)
+                for signal_name in non_monitored:
+                    device_id, output_id = self.devices.find_output(signal_name)
+                    if (
+                        self.monitors.make_monitor(device_id, output_id, current_cycles)
+                        == self.monitors.NO_ERROR
+                    ):
+                        success_count += 1
+            # Rebuild the display once for all the new monitors
+            self.update_monitor_list(show_states=self.is_running)
+            self.update_signal_display()
             self.SetStatusText(f"Added {success_count} monitors")
             dialog.EndModal(wx.ID_CANCEL)
         dlg.Destroy()
@@ -1441,8 +1700,9 @@ For more help, see the project documentation or contact the authors.
             # Get all monitors before removing them
             monitor_count = len(self.monitors.monitors_dictionary)
             # Remove all monitors
-            for (device_id, output_id) in list(self.monitors.monitors_dictionary.keys()):
-                self.monitors.remove_monitor(device_id, output_id)
+            with self.worker.lock:
+                for (device_id, output_id) in list(self.monitors.monitors_dictionary.keys()):
+                    self.monitors.remove_monitor(device_id, output_id)
             # Update display after all monitors are removed
             self.update_monitor_list(show_states=self.is_running)
             self.update_signal_display()
@@ -1501,7 +1761,7 @@ For more help, see the project documentation or contact the authors.
         for switch_id in switch_ids:
             self.devices.set_switch(switch_id, self.devices.HIGH)
         self.update_switch_list()
-        if self.network.execute_network():
+        if self.settle_network():
             self.update_display()
         else:
             wx.MessageBox(
@@ -1517,7 +1777,7 @@ For more help, see the project documentation or contact the authors.
         for switch_id in switch_ids:
             self.devices.set_switch(switch_id, self.devices.LOW)
         self.update_switch_list()
-        if self.network.execute_network():
+        if self.settle_network():
             self.update_display()
         else:
             wx.MessageBox(
@@ -1534,12 +1794,13 @@ For more help, see the project documentation or contact the authors.
         next_index = (current_index + 1) % len(speeds)
         self.current_speed = speeds[next_index]
         self.speed_btn.SetLabel(self.current_speed)
-        # Update timer if simulation is running
+        # Restart a running simulation at the new speed for the cycles left
         if self.is_running:
-            self.simulation_timer.Stop()
-            self.simulation_timer.Start(
-                self.speed_settings[self.current_speed]
-            )
+            # Stopping brings current_cycle up to date at max speed
+            self.stop_simulation()
+            remaining_cycles = self.target_cycles - self.current_cycle
+            if remaining_cycles > 0:
+                self.start_simulation(remaining_cycles)
 
     def apply_theme(self):
         """Apply the current theme to all widgets."""
@@ -1630,7 +1891,7 @@ For more help, see the project documentation or contact the authors.
         else:
             self.canvas.signal_colors = self.light_signal_colors
         self.canvas.render()
-        self.update_monitor_list(show_states=self.is_running)
+        self.update_monitor_list(show_states=self.is_running, rebuild=True)
         # Refresh all widgets
         self.control_panel.Refresh()
         self.canvas.render()
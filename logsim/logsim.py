@@ -9,7 +9,31 @@ Usage
 Show help: logsim.py -h
 Command line user interface: logsim.py -c <file path>
 Graphical user interface: logsim.py <file path>
+Save as binary netlist: logsim.py -o <netlist path> [-c] <file path>
+Profile a run: logsim.py -p [-c] <file path>
+Scan with N worker processes: logsim.py -j <N> [-c] <file path>
+Stop parsing after N errors: logsim.py --max-errors <N> [-c] <file path>
+Stop parsing at the first error: logsim.py --fast-fail [-c] <file path>
+Simulate only what the monitors depend on: logsim.py --prune [-c] <file path>
+Fold constant and dead logic: logsim.py --optimise [-c] <file path>
+Execute gates with generated code: logsim.py --kernel [-c] <file path>
+Look up gate clusters of up to K inputs in truth tables:
+    logsim.py --truth-tables <K> [-c] <file path>
+Execute gates in N worker processes: logsim.py --workers <N> [-c] <file path>
+Set switches from a stimulus file during runs:
+    logsim.py --stimulus <stimulus path> -c <file path>
+
+The file path may name either a circuit definition file or a binary netlist
+file written with the -o option.
+
+Profiling is also switched on by setting the LOGSIM_PROFILE environment
+variable. If its value ends in .json, a JSON report is written to that path
+at exit; otherwise a summary is printed.
+
+Definition files of a megabyte or more are scanned in parallel, with one
+worker process per CPU unless -j sets the number.
 """
+import atexit
 import getopt
 import sys
 
@@ -20,12 +44,67 @@ from devices import Devices
 from network import Network
 from monitors import Monitors
 from scanner import Scanner
+from parallelscan import ParallelScanner
 from parse import Parser
+from diagnostics import Diagnostic
 from userint import UserInterface
 from gui import Gui
+from netlist import NetlistFile
+from profiler import Profiler
+from optimise import NetworkOptimiser
+from stimulus import StimulusFile
 import os
 
 
+def build_network(path, names, devices, network, monitors, profiler=None,
+                  processes=None, max_errors=None):
+    """Build the network from the definition or binary netlist file at path.
+
+    If a profiler is given, the scanner and parser are timed. Large files, or
+    any file if the number of processes is given, are scanned in parallel
+    when the scanner is made, so making it is timed as scanning too.
+    Parsing stops after max_errors errors if it is given. Warnings about
+    unused outputs are printed after a successful parse.
+    Return True if successful.
+    """
+    if NetlistFile.is_netlist_file(path):
+        netlist = NetlistFile(names, devices, network, monitors)
+        try:
+            netlist.load(path)
+        except ValueError as error:
+            print("Error:", error)
+            return False
+        return True
+    if processes is not None or \
+            os.path.getsize(path) >= ParallelScanner.min_parallel_size:
+        if profiler is not None:
+            scanner = profiler.time_call("scan", ParallelScanner, path, names,
+                                         processes)
+        else:
+            scanner = ParallelScanner(path, names, processes)
+    else:
+        scanner = Scanner(path, names)
+    parser = Parser(names, devices, network, monitors, scanner, max_errors,
+                    print_errors=False)
+    if profiler is not None:
+        profiler.instrument_parser(scanner, parser)
+    if parser.parse_network():
+        for diagnostic in parser.warnings:
+            print(diagnostic.format())
+        return True
+    for diagnostic in parser.errors:
+        print(diagnostic.format())
+    print(Diagnostic.format_summary(parser.error_count, parser.stopped))
+    return False
+
+
+def save_network(path, names, devices, network, monitors):
+    """Write the built network to path as a binary netlist."""
+    netlist = NetlistFile(names, devices, network, monitors)
+    netlist.save(path)
+    print("Saved binary netlist to", path)
+
+
 def main(arg_list):
     """Parse the command line options and arguments specified in arg_list.
 
@@ -35,9 +114,34 @@ def main(arg_list):
     usage_message = ("Usage:\n"
                      "Show help: logsim.py -h\n"
                      "Command line user interface: logsim.py -c <file path>\n"
-                     "Graphical user interface: logsim.py <file path>")
+                     "Graphical user interface: logsim.py <file path>\n"
+                     "Save as binary netlist: "
+                     "logsim.py -o <netlist path> [-c] <file path>\n"
+                     "Profile a run: logsim.py -p [-c] <file path>\n"
+                     "Scan with N worker processes: "
+                     "logsim.py -j <N> [-c] <file path>\n"
+                     "Stop parsing after N errors: "
+                     "logsim.py --max-errors <N> [-c] <file path>\n"
+                     "Stop parsing at the first error: "
+                     "logsim.py --fast-fail [-c] <file path>\n"
+                     "Simulate only what the monitors depend on: "
+                     "logsim.py --prune [-c] <file path>\n"
+                     "Fold constant and dead logic: "
+                     "logsim.py --optimise [-c] <file path>\n"
+                     "Execute gates with generated code: "
+                     "logsim.py --kernel [-c] <file path>\n"
+                     "Look up gate clusters of up to K inputs in truth "
+                     "tables: logsim.py --truth-tables <K> [-c] <file path>\n"
+                     "Execute gates in N worker processes: "
+                     "logsim.py --workers <N> [-c] <file path>\n"
+                     "Set switches from a stimulus file during runs: "
+                     "logsim.py --stimulus <stimulus path> -c <file path>")
     try:
-        options, arguments = getopt.getopt(arg_list, "hc:")
+        options, arguments = getopt.getopt(arg_list, "hc:o:pj:",
+                                           ["max-errors=", "fast-fail",
+                                            "prune", "optimise", "kernel",
+                                            "truth-tables=", "workers=",
+                                            "stimulus="])
         print('options:', options, 'arguments:', arguments)
     except getopt.GetoptError:
         print("Error: invalid command line arguments\n")
@@ -54,19 +158,98 @@ def main(arg_list):
     # network = None
     # monitors = None
 
+    # Profile the run if asked to by the -p option or LOGSIM_PROFILE
+    profiler = None
+    profile_setting = os.getenv("LOGSIM_PROFILE", "")
+    if "-p" in dict(options) or profile_setting not in ["", "0"]:
+        report_path = None
+        if profile_setting.endswith(".json"):
+            report_path = profile_setting
+        profiler = Profiler(report_path)
+        profiler.instrument_simulation(devices, network, monitors)
+        atexit.register(profiler.dump)
+
+    netlist_path = None
+    stimulus_path = None
+    processes = None
+    max_errors = None
+    for option, path in options:
+        if option == "-o":  # save the network as a binary netlist
+            netlist_path = path
+        elif option == "-j":  # number of processes scanning the file
+            if not path.isdigit() or int(path) < 1:
+                print("Error: -j takes a positive number of processes\n")
+                print(usage_message)
+                sys.exit()
+            processes = int(path)
+        elif option == "--max-errors":  # stop parsing after this many errors
+            if not path.isdigit() or int(path) < 1:
+                print("Error: --max-errors takes a positive number\n")
+                print(usage_message)
+                sys.exit()
+            max_errors = int(path)
+        elif option == "--fast-fail":  # stop parsing at the first error
+            max_errors = 1
+        elif option == "--prune":  # skip logic no monitor depends on
+            monitors.set_pruning(True)
+        elif option == "--optimise":  # skip constant and dead logic
+            network.set_optimiser(NetworkOptimiser(devices, network,
+                                                   monitors))
+        elif option == "--kernel":  # execute gates with generated code
+            network.set_kernel(True)
+        elif option == "--truth-tables":  # look up small gate clusters
+            if not path.isdigit() or int(path) < 1:
+                print("Error: --truth-tables takes a positive number of "
+                      "inputs\n")
+                print(usage_message)
+                sys.exit()
+            network.set_truth_tables(int(path))
+        elif option == "--workers":  # execute gates in worker processes
+            if not path.isdigit() or int(path) < 1:
+                print("Error: --workers takes a positive number of "
+                      "processes\n")
+                print(usage_message)
+                sys.exit()
+            network.set_workers(int(path))
+        elif option == "--stimulus":  # switch changes for the CLI runs
+            stimulus_path = path
+
     for option, path in options:
         if option == "-h":  # print the usage message
             print(usage_message)
             sys.exit()
         elif option == "-c":  # use the command line user interface
-            scanner = Scanner(path, names)
-            parser = Parser(names, devices, network, monitors, scanner)
-            if parser.parse_network():
+            if build_network(path, names, devices, network, monitors,
+                             profiler, processes, max_errors):
+                if netlist_path is not None:
+                    save_network(netlist_path, names, devices, network,
+                                 monitors)
+                stimulus = None
+                if stimulus_path is not None:
+                    try:
+                        stimulus = StimulusFile(stimulus_path, names,
+                                                devices)
+                    except OSError as error:
+                        print("Error: cannot read the stimulus file:",
+                              error)
+                        sys.exit()
                 # Initialise an instance of the userint.UserInterface() class
-                userint = UserInterface(names, devices, network, monitors)
+                userint = UserInterface(names, devices, network, monitors,
+                                        stimulus)
                 userint.command_interface()
 
-    if not options:  # no option given, use the graphical user interface
+    if netlist_path is not None and "-c" not in dict(options):
+        # save the network without running a user interface
+        if len(arguments) != 1:  # wrong number of arguments
+            print("Error: one file path required\n")
+            print(usage_message)
+            sys.exit()
+        [path] = arguments
+        if build_network(path, names, devices, network, monitors, profiler,
+                         processes, max_errors):
+            save_network(netlist_path, names, devices, network, monitors)
+
+    elif "-c" not in dict(options):  # use the graphical user interface
 
         if len(arguments) != 1:  # wrong number of arguments
             print("Error: one file path required\n")
@@ -74,9 +257,8 @@ def main(arg_list):
             sys.exit()
 
         [path] = arguments
-        scanner = Scanner(path, names)
-        parser = Parser(names, devices, network, monitors, scanner)
-        if parser.parse_network():
+        if build_network(path, names, devices, network, monitors, profiler,
+                         processes, max_errors):
             # get the language from the environment variable LANG
             language = os.getenv('LANG', 'en_GB.UTF-8')
             print("Current LANG:", language)
@@ -84,6 +266,8 @@ def main(arg_list):
             app = wx.App()
             gui = Gui("Logic Simulator", path, names, devices, network,
                       monitors, language)
+            if profiler is not None:
+                profiler.instrument_canvas(gui.canvas)
             gui.Show(True)
             app.MainLoop()
 
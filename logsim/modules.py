@@ -0,0 +1,124 @@
+"""Store module definitions and expand their instances into the network.
+
+Used in the Logic Simulator project to support hierarchical circuit
+definitions. The body of a MODULE is parsed once into a template, and every
+instance of the module is made from the template without reading the source
+again.
+
+Classes
+-------
+ModuleTemplate - stores a flattened module body and makes its instances.
+"""
+
+
+class ModuleTemplate:
+    """Store a flattened module body and make instances of it.
+
+    The module body is parsed into its own devices and network, in which each
+    module input port is a SWITCH device and each module output port is a
+    one-input AND gate. The template keeps the remaining devices and
+    connections as plain records, with device names relative to the
+    instance. Nested instances are already flattened in the body, so the
+    records never refer to other templates.
+
+    The devices of an instance are named <instance>_<device>. The scanner
+    does not accept "_" in names, so these names cannot clash with the names
+    in the definition file.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    input_ids: list of the name IDs of the module input ports.
+    output_ids: list of the name IDs of the module output ports.
+
+    Public methods
+    --------------
+    build(self, devices): Reads the module body from devices and returns True
+                          if every port is used correctly.
+
+    instantiate(self, instance_id, devices, network): Makes the devices and
+                                                      connections of an
+                                                      instance and returns
+                                                      its port maps.
+    """
+
+    separator = "_"
+
+    def __init__(self, names, input_ids, output_ids):
+        """Initialise the port lists and the empty records."""
+        self.names = names
+        self.input_ids = input_ids
+        self.output_ids = output_ids
+
+        # (relative name, device kind, device property)
+        self.device_records = []
+        # (sink index, input ID, driver index, output ID), where the indices
+        # refer to device_records
+        self.connection_records = []
+        # input port ID -> [(sink index, input ID)]
+        self.input_records = {}
+        # output port ID -> (driver index, output ID)
+        self.output_records = {}
+
+    def build(self, devices):
+        """Read the module body from devices.
+
+        Return False if an output port is driven directly by an input port,
+        True otherwise.
+        """
+        ports = set(self.input_ids) | set(self.output_ids)
+        index = {}
+        for device in devices.devices_list:
+            if device.device_id in ports:
+                continue
+            index[device.device_id] = len(self.device_records)
+            self.device_records.append((
+                self.names.get_name_string(device.device_id),
+                device.device_kind,
+                devices.get_device_property(device.device_id)))
+
+        self.input_records = {port_id: [] for port_id in self.input_ids}
+        for device in devices.devices_list:
+            for input_id, connected_output in device.inputs.items():
+                if connected_output is None:
+                    continue
+                (output_device_id, output_id) = connected_output
+                if device.device_id in self.output_ids:
+                    if output_device_id in self.input_ids:
+                        return False
+                    self.output_records[device.device_id] = (
+                        index[output_device_id], output_id)
+                elif output_device_id in self.input_ids:
+                    self.input_records[output_device_id].append(
+                        (index[device.device_id], input_id))
+                else:
+                    self.connection_records.append((
+                        index[device.device_id], input_id,
+                        index[output_device_id], output_id))
+        return True
+
+    def instantiate(self, instance_id, devices, network):
+        """Make the devices and connections of a new instance.
+
+        Return (inputs, outputs), where inputs maps each input port ID to the
+        list of (device_id, input_id) it drives, and outputs maps each output
+        port ID to its (device_id, output_id).
+        """
+        prefix = self.names.get_name_string(instance_id) + self.separator
+        device_ids = self.names.lookup([prefix + name for (name, _, _) in
+                                        self.device_records])
+        for device_id, (_, device_kind, device_property) in zip(
+                device_ids, self.device_records):
+            devices.make_device(device_id, device_kind, device_property)
+        for (sink, input_id, driver,
+             output_id) in self.connection_records:
+            network.make_connection(device_ids[sink], input_id,
+                                    device_ids[driver], output_id)
+
+        inputs = {port_id: [(device_ids[sink], input_id)
+                            for sink, input_id in sinks]
+                  for port_id, sinks in self.input_records.items()}
+        outputs = {port_id: (device_ids[driver], output_id)
+                   for port_id, (driver, output_id) in
+                   self.output_records.items()}
+        return inputs, outputs
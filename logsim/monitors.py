@@ -1,7 +1,7 @@
 """Record and display output signals.
 
 Used in the Logic Simulator project to record and display specified output
-signals.
+signals, and to evaluate checks on signals every cycle.
 
 Classes
 -------
@@ -17,6 +17,11 @@ class Monitors:
     This class contains functions for recording and displaying the signal state
     of outputs specified by their device and port IDs.
 
+    Checks (checks.AssertionCheck() and checks.StableCheck()) are evaluated
+    whenever the signals are recorded. Only the number of cycles in which
+    each check fails and the first max_violations failures are kept, so
+    checked signals need no traces.
+
     Parameters
     ----------
     names: instance of the names.Names() class.
@@ -34,13 +39,32 @@ class Monitors:
     get_monitor_signal(self, device_id, output_id): Returns the signal level of
                                                     the specified monitor.
 
-    record_signals(self): Records the current signal level of all monitors.
+    record_signals(self): Records the current signal level of all monitors
+                          and evaluates the checks.
+
+    make_check(self, check): Adds a check evaluated every cycle.
+
+    remove_checks(self): Removes every check.
+
+    check_signals(self): Evaluates every check and records the failures.
+
+    display_violations(self): Displays the failed checks in the text console.
 
     get_signal_names(self): Returns two lists of signal names: monitored and
                             not monitored.
 
+    find_monitor(self, signal_name): Returns the device and output IDs of a
+                                     monitored signal, or None.
+
+    search_signal_names(self, prefix="", monitored=False): Returns the sorted
+                            names of the monitored or not monitored signals
+                            starting with prefix.
+
     reset_monitors(self): Clears the memory of all monitors.
 
+    set_pruning(self, enabled): Simulates only the devices the monitored
+                                signals depend on, if enabled.
+
     get_margin(self): Returns the length of the longest monitor's name.
 
     display_signals(self): Displays signal trace(s) in the text console.
@@ -59,6 +83,19 @@ class Monitors:
         [self.NO_ERROR, self.NOT_OUTPUT,
          self.MONITOR_PRESENT] = self.names.unique_error_codes(3)
 
+        # observed_signals counts the monitors and checks reading each
+        # (device_id, output_id); devices these signals depend on must be
+        # simulated
+        self.observed_signals = collections.Counter()
+        # checks lists the checks, violation_counts the number of cycles in
+        # which each failed, and violations the first max_violations
+        # failures as (cycle, check index)
+        self.checks = []
+        self.violation_counts = []
+        self.violations = []
+        self.max_violations = 100
+        self.cycles_checked = 0
+
     def make_monitor(self, device_id, output_id, cycles_completed=0):
         """Add the specified signal to the monitors dictionary.
 
@@ -78,6 +115,8 @@ class Monitors:
             # list.
             self.monitors_dictionary[(device_id, output_id)] = [
                 self.devices.BLANK] * cycles_completed
+            self.observed_signals[(device_id, output_id)] += 1
+            self.network.invalidate_active_devices()
             return self.NO_ERROR
 
     def remove_monitor(self, device_id, output_id):
@@ -89,6 +128,10 @@ class Monitors:
             return False
         else:
             del self.monitors_dictionary[(device_id, output_id)]
+            self.observed_signals[(device_id, output_id)] -= 1
+            if not self.observed_signals[(device_id, output_id)]:
+                del self.observed_signals[(device_id, output_id)]
+            self.network.invalidate_active_devices()
             return True
 
     def get_monitor_signal(self, device_id, output_id):
@@ -110,25 +153,82 @@ class Monitors:
             signal_level = self.get_monitor_signal(device_id, output_id)
             self.monitors_dictionary[(device_id,
                                       output_id)].append(signal_level)
+        if self.checks:
+            self.check_signals()
 
-    def get_signal_names(self):
-        """Return two signal name lists: monitored and not monitored."""
-        non_monitored_signal_list = []
-        monitored_signal_list = []
-        for device_id, output_id in self.monitors_dictionary:
-            monitor_name = self.devices.get_signal_name(device_id, output_id)
-            monitored_signal_list.append(monitor_name)
+    def make_check(self, check):
+        """Add a check evaluated every cycle.
 
-        for device_id in self.devices.find_devices():
+        Return NO_ERROR if successful, or the corresponding error if a
+        signal the check reads does not exist.
+        """
+        for device_id, output_id in check.get_signals():
             device = self.devices.get_device(device_id)
-            for output_id in device.outputs:
-                if (device_id, output_id) not in self.monitors_dictionary:
-                    signal_name = self.devices.get_signal_name(device_id,
-                                                               output_id)
-                    non_monitored_signal_list.append(signal_name)
+            if device is None:
+                return self.network.DEVICE_ABSENT
+            elif output_id not in device.outputs:
+                return self.NOT_OUTPUT
+        self.checks.append(check)
+        self.violation_counts.append(0)
+        self.observed_signals.update(check.get_signals())
+        self.network.invalidate_active_devices()
+        return self.NO_ERROR
+
+    def remove_checks(self):
+        """Remove every check and its recorded failures."""
+        for check in self.checks:
+            for signal in check.get_signals():
+                self.observed_signals[signal] -= 1
+                if not self.observed_signals[signal]:
+                    del self.observed_signals[signal]
+        self.checks = []
+        self.violation_counts = []
+        self.violations = []
+        self.network.invalidate_active_devices()
+
+    def check_signals(self):
+        """Evaluate every check and record the failures of this cycle."""
+        for index, check in enumerate(self.checks):
+            if check.is_violated():
+                self.violation_counts[index] += 1
+                if len(self.violations) < self.max_violations:
+                    self.violations.append((self.cycles_checked, index))
+        self.cycles_checked += 1
+
+    def get_signal_names(self):
+        """Return two signal name lists: monitored and not monitored."""
+        monitored_signal_list = [
+            self.devices.get_signal_name(device_id, output_id)
+            for device_id, output_id in self.monitors_dictionary]
+        non_monitored_signal_list = [
+            signal_name for signal_name, signal_ids in
+            self.devices.output_ids.items()
+            if signal_ids not in self.monitors_dictionary]
 
         return [monitored_signal_list, non_monitored_signal_list]
 
+    def find_monitor(self, signal_name):
+        """Return (device_id, output_id) of the named monitored signal.
+
+        Return None if the signal does not exist or is not monitored.
+        """
+        signal_ids = self.devices.find_output(signal_name)
+        if signal_ids in self.monitors_dictionary:
+            return signal_ids
+        return None
+
+    def search_signal_names(self, prefix="", monitored=False):
+        """Return the sorted signal names starting with prefix.
+
+        Only monitored signals are returned if monitored is True, and only
+        signals that are not monitored otherwise.
+        """
+        output_ids = self.devices.output_ids
+        return [signal_name for signal_name in
+                self.devices.find_output_names(prefix)
+                if (output_ids[signal_name] in self.monitors_dictionary)
+                == monitored]
+
     def reset_monitors(self):
         """Clear the memory of all the monitors.
 
@@ -136,6 +236,22 @@ class Monitors:
         """
         for device_id, output_id in self.monitors_dictionary:
             self.monitors_dictionary[(device_id, output_id)] = []
+        for check in self.checks:
+            check.reset()
+        self.violation_counts = [0] * len(self.checks)
+        self.violations = []
+        self.cycles_checked = 0
+
+    def set_pruning(self, enabled):
+        """Simulate only the devices the monitored signals depend on.
+
+        The cone of influence follows the monitors and checks as they are
+        made and removed. Other signals outside it stop updating.
+        """
+        if enabled:
+            self.network.set_cone_outputs(self.observed_signals)
+        else:
+            self.network.set_cone_outputs(None)
 
     def get_margin(self):
         """Return the length of the longest monitor's name.
@@ -174,3 +290,21 @@ class Monitors:
                 if signal == self.devices.BLANK:
                     print(" ", end="")
             print("\n", end="")
+
+    def display_violations(self):
+        """Display the failed checks in the text console."""
+        first_cycles = {}
+        for cycle, index in self.violations:
+            first_cycles.setdefault(index, cycle)
+        failed = 0
+        for index, check in enumerate(self.checks):
+            count = self.violation_counts[index]
+            if count == 0:
+                continue
+            failed += 1
+            first = first_cycles.get(index)
+            where = "" if first is None else f", first in cycle {first}"
+            print(f"Check failed in {count} cycle/s{where}: "
+                  f"{check.get_text()}")
+        print(f"{len(self.checks) - failed} of {len(self.checks)} checks "
+              f"passed in {self.cycles_checked} cycles")
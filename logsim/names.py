@@ -30,19 +30,27 @@ class Names:
     query(self, name_string): Returns the corresponding name ID for the
                         name string. Returns None if the string is not present.
 
+    intern(self, name_string): Returns the name ID for a single name string.
+                        Adds the name if not already present.
+
     lookup(self, name_string_list): Returns a list of name IDs for each
                         name string. Adds a name if not already present.
 
     get_name_string(self, name_id): Returns the corresponding name string for
                         the name ID. Returns None if the ID is not present.
+
+    get_name_strings(self, name_id_list): Returns a list of name strings for
+                        each name ID.
     """
 
     def __init__(self):
         """Initialise names list."""
         self.error_code_count = 0  # how many error codes have been declared
 
-        # hash map where IDs are keys and name strings are values
-        self.id_names = {}
+        # Name IDs are allocated densely from 0, so the name string of an ID
+        # is stored at that index of a list. This costs one pointer per name,
+        # against a hash table entry and an integer key in a dictionary.
+        self.names_list = []
 
         # hash map where name strings are keys and IDs are values
         self.names_id = {}
@@ -63,32 +71,35 @@ class Names:
 
         If the name string is not present in the names list, return None.
         """
-        # checks if name_string is in names dictionary
-        # names_string doesn't exist so returns None
-        # found the device so returns the ID
         return self.names_id.get(name_string, None)
 
+    def intern(self, name_string):
+        """Return the name ID for name_string, adding the name if needed."""
+        name_id = self.names_id.get(name_string)
+        if name_id is None:
+            name_id = self.names_id[name_string] = self.num_items
+            self.names_list.append(name_string)
+            self.num_items += 1
+        return name_id
+
     def lookup(self, name_string_list):
         """Return a list of name IDs for each name string in name_string_list.
 
-        If the name string is not present in the names list, add it.
+        If the name string is not present in the names list, add it. A whole
+        batch of names is interned in one pass; new names get consecutive IDs
+        in the order they first appear.
         """
-        # create list for name ids
-        names_id_list = []
-
-        # loop for names in names list
-        for name_string in name_string_list:
-            name_id = self.query(name_string)
-
-            # check if name has an id
-            if name_id is None:
-                name_id = self.num_items
-                self.id_names[self.num_items] = name_string
-                self.names_id[name_string] = self.num_items
-                self.num_items += 1
-
-            # add name id to list
-            names_id_list.append(name_id)
+        names_id = self.names_id
+        # setdefault gives a new name the next ID, as the dictionary holds
+        # exactly the names stored so far
+        names_id_list = [names_id.setdefault(name_string, len(names_id))
+                         for name_string in name_string_list]
+
+        if len(names_id) > self.num_items:  # the batch had new names
+            for name_string, name_id in zip(name_string_list, names_id_list):
+                if name_id == len(self.names_list):
+                    self.names_list.append(name_string)
+            self.num_items = len(self.names_list)
 
         return names_id_list
 
@@ -97,7 +108,13 @@ class Names:
 
         If the name_id is not an index in the names list, return None.
         """
-        # checks if name_id is in id dictionary
-        # names_id doesn't exist so returns None
-        # found the device so returns the ID
-        return self.id_names.get(name_id, None)
+        if isinstance(name_id, int) and 0 <= name_id < self.num_items:
+            return self.names_list[name_id]
+        return None
+
+    def get_name_strings(self, name_id_list):
+        """Return a list of name strings for each ID in name_id_list.
+
+        IDs that are not in the names list give None.
+        """
+        return [self.get_name_string(name_id) for name_id in name_id_list]
@@ -0,0 +1,223 @@
+"""Save and load built networks in a compact binary netlist format.
+
+Used in the Logic Simulator project to store the contents of the names,
+devices, network and monitors classes directly, bypassing the text definition
+language. Generator tools can emit this format for very large designs.
+
+File layout
+-----------
+All integers are little-endian. The file starts with a header, followed by
+four sections in a fixed order. Each section starts with a four byte tag and a
+signed 64-bit item count, followed by its payload:
+
+header: b"LSNL", format version (unsigned 32-bit).
+
+NAME: count = number of names. The payload is the byte length of the text
+      (signed 64-bit), then the UTF-8 name strings in name ID order,
+      separated by NUL bytes.
+
+DEVS: count = number of devices. The payload is count records of three
+      signed 64-bit integers: (device_id, device_kind, device_property).
+
+CONN: count = number of connections. The payload is count records of four
+      signed 64-bit integers: (device_id, input_id, output_device_id,
+      output_port_id).
+
+MONS: count = number of monitors. The payload is count records of two
+      signed 64-bit integers: (device_id, output_id).
+
+A port ID of None and a missing device property are both stored as -1. The
+device property is the switch state, the clock half period, or the number of
+gate inputs, matching the device_property of devices.Devices.make_device().
+
+Classes
+-------
+NetlistFile - saves and loads networks in the binary netlist format.
+"""
+import array
+import struct
+import sys
+
+
+class NetlistFile:
+    """Save and load networks in the binary netlist format.
+
+    The device and connection tables are stored as flat arrays of 64-bit
+    integers, so loading them is a single read into an array per section.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    is_netlist_file(path): Returns True if the file at path starts with the
+                           netlist header.
+
+    save(self, path): Writes the network to path.
+
+    load(self, path): Reads the network from path into the (empty) names,
+                      devices, network and monitors instances.
+    """
+
+    MAGIC = b"LSNL"
+    VERSION = 1
+
+    NONE = -1  # encoding of a None port ID or a missing property
+
+    def __init__(self, names, devices, network, monitors):
+        """Store references to the inner simulator classes."""
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+    @classmethod
+    def is_netlist_file(cls, path):
+        """Return True if the file at path starts with the netlist header."""
+        with open(path, "rb") as netlist:
+            return netlist.read(len(cls.MAGIC)) == cls.MAGIC
+
+    def encode(self, value):
+        """Return the integer used to store a possibly None value."""
+        return self.NONE if value is None else value
+
+    def decode(self, value):
+        """Return the value stored as the integer value."""
+        return None if value == self.NONE else value
+
+    def save(self, path):
+        """Write the names, devices, connections and monitors to path."""
+        name_strings = [self.names.get_name_string(name_id)
+                        for name_id in range(self.names.num_items)]
+        name_bytes = "\0".join(name_strings).encode("utf-8")
+
+        device_table = array.array("q")
+        connection_table = array.array("q")
+        for device in self.devices.devices_list:
+            device_table.extend([
+                device.device_id, device.device_kind,
+                self.encode(self.devices.get_device_property(
+                    device.device_id))])
+            for input_id, connected_output in device.inputs.items():
+                if connected_output is None:  # unconnected input
+                    continue
+                (output_device_id, output_port_id) = connected_output
+                connection_table.extend([
+                    device.device_id, self.encode(input_id),
+                    output_device_id, self.encode(output_port_id)])
+
+        monitor_table = array.array("q")
+        for device_id, output_id in self.monitors.monitors_dictionary:
+            monitor_table.extend([device_id, self.encode(output_id)])
+
+        with open(path, "wb") as netlist:
+            netlist.write(self.MAGIC)
+            netlist.write(struct.pack("<I", self.VERSION))
+
+            netlist.write(b"NAME")
+            netlist.write(struct.pack("<qq", len(name_strings),
+                                      len(name_bytes)))
+            netlist.write(name_bytes)
+
+            for tag, table, width in [(b"DEVS", device_table, 3),
+                                      (b"CONN", connection_table, 4),
+                                      (b"MONS", monitor_table, 2)]:
+                netlist.write(tag)
+                netlist.write(struct.pack("<q", len(table) // width))
+                if sys.byteorder == "big":
+                    table.byteswap()
+                table.tofile(netlist)
+
+    def read_header(self, netlist, tag, size):
+        """Read and check a section tag followed by size bytes of integers.
+
+        Return the unpacked integers.
+        """
+        if netlist.read(len(tag)) != tag:
+            raise ValueError("Corrupt netlist file: expected section " +
+                             tag.decode("ascii"))
+        data = netlist.read(size)
+        if len(data) != size:
+            raise ValueError("Corrupt netlist file: truncated section " +
+                             tag.decode("ascii"))
+        return struct.unpack("<" + "q" * (size // 8), data)
+
+    def read_table(self, netlist, tag, width):
+        """Read a section holding records of width 64-bit integers.
+
+        Return the flat array of integers.
+        """
+        [count] = self.read_header(netlist, tag, 8)
+        table = array.array("q")
+        try:
+            table.fromfile(netlist, count * width)
+        except EOFError:
+            raise ValueError("Corrupt netlist file: truncated section " +
+                             tag.decode("ascii"))
+        if sys.byteorder == "big":
+            table.byteswap()
+        return table
+
+    def load(self, path):
+        """Read the network stored at path.
+
+        The devices, network and monitors instances must be empty, and the
+        names already present must match the start of the stored names list,
+        which is the case for freshly initialised simulator classes.
+        """
+        with open(path, "rb") as netlist:
+            if netlist.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError("Not a netlist file: " + str(path))
+            [version] = struct.unpack("<I", netlist.read(4))
+            if version != self.VERSION:
+                raise ValueError("Unsupported netlist version: " +
+                                 str(version))
+
+            [name_count, name_size] = self.read_header(netlist, b"NAME", 16)
+            name_bytes = netlist.read(name_size)
+            name_strings = name_bytes.decode("utf-8").split("\0") \
+                if name_count else []
+            device_table = self.read_table(netlist, b"DEVS", 3)
+            connection_table = self.read_table(netlist, b"CONN", 4)
+            monitor_table = self.read_table(netlist, b"MONS", 2)
+
+        if len(name_strings) != name_count:
+            raise ValueError("Corrupt netlist file: bad names section")
+        for name_id in range(self.names.num_items):
+            if name_id >= name_count or \
+                    self.names.get_name_string(name_id) != \
+                    name_strings[name_id]:
+                raise ValueError("Netlist names do not match the names "
+                                 "already defined")
+        self.names.lookup(name_strings[self.names.num_items:])
+
+        for i in range(0, len(device_table), 3):
+            error_type = self.devices.make_device(
+                device_table[i], device_table[i + 1],
+                self.decode(device_table[i + 2]))
+            if error_type != self.devices.NO_ERROR:
+                raise ValueError("Corrupt netlist file: invalid device " +
+                                 str(self.names.get_name_string(
+                                     device_table[i])))
+
+        for i in range(0, len(connection_table), 4):
+            error_type = self.network.make_connection(
+                connection_table[i], self.decode(connection_table[i + 1]),
+                connection_table[i + 2],
+                self.decode(connection_table[i + 3]))
+            if error_type != self.network.NO_ERROR:
+                raise ValueError("Corrupt netlist file: invalid connection "
+                                 "to " + str(self.names.get_name_string(
+                                     connection_table[i])))
+
+        for i in range(0, len(monitor_table), 2):
+            error_type = self.monitors.make_monitor(
+                monitor_table[i], self.decode(monitor_table[i + 1]))
+            if error_type != self.monitors.NO_ERROR:
+                raise ValueError("Corrupt netlist file: invalid monitor on " +
+                                 str(self.names.get_name_string(
+                                     monitor_table[i])))
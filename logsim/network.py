@@ -6,6 +6,9 @@ Classes
 --------
 Network - builds and executes the network.
 """
+from kernel import SimulationKernel
+from partition import PartitionedExecutor
+from truthtable import GateCluster
 
 
 class Network:
@@ -34,8 +37,63 @@ class Network:
                     second_port_id): Connects the first device to the second
                                      device.
 
+    remove_connection(self, device_id, input_id): Disconnects the given input.
+
+    get_fanout(self, device_id, output_id): Returns the inputs driven by the
+                                            given output.
+
+    get_fanout_devices(self, device_id): Returns the IDs of the devices
+                                         driven by any output of the device.
+
+    set_cone_outputs(self, outputs): Executes only the devices the given
+                                     outputs depend on, or every device if
+                                     outputs is None.
+
+    set_optimiser(self, optimiser): Executes only the devices the optimiser
+                                    does not fold or remove, or every device
+                                    if optimiser is None.
+
+    set_kernel(self, enabled): Executes the logic gates with generated code
+                               if enabled.
+
+    get_kernel(self, gate_lists): Returns the kernel executing the gates, or
+                                  None if a gate is not supported.
+
+    set_two_valued(self, enabled): Executes the gates that no sequential
+                                   device depends on with two-valued logic
+                                   after settling, if enabled.
+
+    find_two_valued_gates(self, gate_ids): Returns the gates that can be
+                                           executed after settling.
+
+    set_truth_tables(self, max_inputs): Executes clusters of two-valued gates
+                                        with at most max_inputs external
+                                        inputs by table lookup, or none if
+                                        max_inputs is None.
+
+    find_gate_clusters(self, gates, max_inputs): Returns the steps executing
+                                                 the two-valued gates, with
+                                                 clusters of gates combined.
+
+    set_workers(self, workers): Executes the two-valued gates in the given
+                                number of worker processes, or in this
+                                process if workers is None.
+
+    execute_two_valued_gates(self): Executes those gates once each.
+
+    invalidate_active_devices(self): Finds the devices to execute again
+                                     before the next simulation cycle.
+
+    find_active_devices(self, device_kind): Returns the IDs of the devices of
+                                            the given kind that are executed.
+
     check_network(self): Checks if all inputs in the network are connected.
 
+    find_unconnected_inputs(self): Returns every unconnected input.
+
+    find_unused_outputs(self, monitored=()): Returns every output that drives
+                                             no input and is not monitored.
+
     update_signal(self, signal, target): Updates the signal in the direction of
                                          the target.
 
@@ -53,6 +111,20 @@ class Network:
     execute_clock(self, device_id): Simulates a clock and updates its output
                                     signal value.
 
+    get_input_word(self, device_id, input_ids, one_signals): Returns the
+                              integer formed by the signals at the inputs.
+
+    set_output_word(self, device, output_ids, word): Updates the outputs
+                                   towards the bits of the integer word.
+
+    execute_bus(self, device_id): Simulates a bus buffer.
+
+    execute_adder(self, device_id): Simulates a word adder.
+
+    execute_mux(self, device_id): Simulates a word multiplexer.
+
+    execute_register(self, device_id): Simulates a word register.
+
     update_clocks(self): If it is time to do so, sets clock signals to RISING
                          or FALLING.
 
@@ -69,6 +141,53 @@ class Network:
          self.INPUT_CONNECTED, self.PORT_ABSENT,
          self.DEVICE_ABSENT] = self.names.unique_error_codes(6)
         self.steady_state = True  # for checking if signals have settled
+        # fanouts indexes every connection by its output: {(device_id,
+        # output_id): [(device_id, input_id)]}, in the order the connections
+        # were made. It is kept up to date by make_connection and
+        # remove_connection.
+        self.fanouts = {}
+        # Cone-of-influence pruning: if cone_outputs is set, only devices in
+        # the transitive fan-in of those outputs are executed.
+        self.cone_outputs = None
+        # If an optimise.NetworkOptimiser() is set, the devices it folds or
+        # removes are not executed. Folded devices are listed with their
+        # constant signals in constant_outputs as (Device, signal).
+        self.optimiser = None
+        self.constant_outputs = []
+        # active_devices caches the devices that are executed as
+        # {device_kind: [device_id]}, and is None when they must be found
+        # again. active_size is the number of devices it was found for.
+        self.active_devices = None
+        self.active_size = 0
+        # If two_valued is set, gates that nothing but other such gates
+        # depends on are executed once after the network has settled, as
+        # (Device, x, y, inverse of y, inputs) in two_valued_gates
+        self.two_valued = True
+        self.two_valued_gates = []
+        # If table_inputs is set, fanout-free clusters of two-valued gates
+        # with at most that many external inputs are executed by table
+        # lookup. two_valued_steps lists (truthtable.GateCluster(), None)
+        # or (None, gate) in execution order.
+        self.table_inputs = None
+        self.two_valued_steps = []
+        # If workers is set, the two-valued gates are executed in that many
+        # worker processes by a partition.PartitionedExecutor()
+        self.workers = None
+        self.partitioned = None
+        # {device_kind: (x, y)} of the gates, as in execute_gate
+        self.gate_rules = {
+            devices.AND: (devices.HIGH, devices.HIGH),
+            devices.OR: (devices.LOW, devices.LOW),
+            devices.NAND: (devices.HIGH, devices.LOW),
+            devices.NOR: (devices.LOW, devices.HIGH),
+            devices.XOR: (None, None)}
+        # If use_kernel is set, the gates are executed by a generated
+        # kernel.SimulationKernel(), which is None when it must be built
+        # again
+        self.use_kernel = False
+        self.kernel = None
+        # number of settle iterations in the last simulation cycle
+        self.last_iterations = 0
 
     def get_connected_output(self, device_id, input_id):
         """Return the output connected to the given input.
@@ -130,6 +249,10 @@ class Network:
                 # Make connection
                 first_device.inputs[first_port_id] = (second_device_id,
                                                       second_port_id)
+                self.fanouts.setdefault(
+                    (second_device_id, second_port_id), []).append(
+                        (first_device_id, first_port_id))
+                self.invalidate_active_devices()
                 error_type = self.NO_ERROR
             else:  # second_port_id is not a valid input or output port
                 error_type = self.PORT_ABSENT
@@ -145,6 +268,10 @@ class Network:
                 else:
                     second_device.inputs[second_port_id] = (first_device_id,
                                                             first_port_id)
+                    self.fanouts.setdefault(
+                        (first_device_id, first_port_id), []).append(
+                            (second_device_id, second_port_id))
+                    self.invalidate_active_devices()
                     error_type = self.NO_ERROR
             else:
                 error_type = self.PORT_ABSENT
@@ -154,15 +281,334 @@ class Network:
 
         return error_type
 
+    def remove_connection(self, device_id, input_id):
+        """Disconnect the given input from the output driving it.
+
+        Return True if successful, or False if the input does not exist or is
+        not connected.
+        """
+        device = self.devices.get_device(device_id)
+        if device is None or device.inputs.get(input_id) is None:
+            return False
+        output = device.inputs[input_id]
+        fanout = self.fanouts[output]
+        fanout.remove((device_id, input_id))
+        if not fanout:
+            del self.fanouts[output]
+        device.inputs[input_id] = None
+        self.invalidate_active_devices()
+        return True
+
+    def get_fanout(self, device_id, output_id):
+        """Return a list of the (device_id, input_id) the output drives.
+
+        The list is empty if the output drives nothing or does not exist. It
+        belongs to the index and must not be changed.
+        """
+        return self.fanouts.get((device_id, output_id), [])
+
+    def get_fanout_devices(self, device_id):
+        """Return the set of IDs of the devices the device's outputs drive.
+
+        Return None if the device does not exist.
+        """
+        device = self.devices.get_device(device_id)
+        if device is None:
+            return None
+        return {sink_device_id for output_id in device.outputs
+                for sink_device_id, _ in self.get_fanout(device_id,
+                                                         output_id)}
+
     def check_network(self):
         """Return True if all inputs in the network are connected."""
-        for device_id in self.devices.find_devices():
-            device = self.devices.get_device(device_id)
-            for input_id in device.inputs:
-                if self.get_connected_output(device_id, input_id) is None:
-                    return False
+        for device in self.devices.devices_list:
+            if None in device.inputs.values():
+                return False
         return True
 
+    def set_cone_outputs(self, outputs):
+        """Execute only the devices that the given outputs depend on.
+
+        outputs is a collection of (device_id, output_id), such as the
+        monitors dictionary, and is read again whenever the cone is
+        recomputed. If outputs is None, every device is executed. Devices
+        outside the cone keep their output signals.
+        """
+        self.cone_outputs = outputs
+        self.invalidate_active_devices()
+
+    def set_optimiser(self, optimiser):
+        """Execute only the devices the optimiser does not fold or remove.
+
+        optimiser is an instance of the optimise.NetworkOptimiser() class, or
+        None to execute every device.
+        """
+        self.optimiser = optimiser
+        self.invalidate_active_devices()
+
+    def set_two_valued(self, enabled):
+        """Execute gates no sequential device depends on after settling."""
+        self.two_valued = enabled
+        self.invalidate_active_devices()
+
+    def set_truth_tables(self, max_inputs):
+        """Execute small clusters of two-valued gates by table lookup.
+
+        Clusters have at most max_inputs external inputs. If max_inputs is
+        None, every two-valued gate is executed on its own.
+        """
+        self.table_inputs = max_inputs
+        self.invalidate_active_devices()
+
+    def set_workers(self, workers):
+        """Execute the two-valued gates in worker processes.
+
+        The gates are split between the given number of processes, which
+        replace truth table lookup. If workers is None, the gates are
+        executed in this process.
+        """
+        self.workers = workers
+        self.invalidate_active_devices()
+
+    def set_kernel(self, enabled):
+        """Execute the logic gates with generated code if enabled."""
+        self.use_kernel = enabled
+        self.invalidate_active_devices()
+
+    def get_kernel(self, gate_lists):
+        """Return the kernel executing the gates in gate_lists.
+
+        The kernel is built again with the active devices. Return None if the
+        kernel does not support one of the gates.
+        """
+        if self.kernel is None:
+            gate_ids = [device_id for gate_list in gate_lists
+                        for device_id in gate_list]
+            self.kernel = False  # built, but not supported
+            if SimulationKernel.can_compile(self.devices, gate_ids):
+                self.kernel = SimulationKernel(self.devices, gate_ids)
+        return self.kernel or None
+
+    def invalidate_active_devices(self):
+        """Find the devices to execute again before the next cycle."""
+        self.active_devices = None
+        self.kernel = None
+        if self.partitioned is not None:
+            self.partitioned.close()
+            self.partitioned = None
+
+    def find_active_devices(self, device_kind):
+        """Return the IDs of the devices of device_kind that are executed.
+
+        If cone_outputs is set, these are the devices with a path to one of
+        cone_outputs, including the devices feeding back into D-types and
+        registers on that path. Devices folded or removed by the optimiser
+        are left out. Devices are listed in the order they were made, so they
+        are executed in the same order as without pruning.
+        """
+        if self.active_devices is None:
+            self.active_size = len(self.devices.devices_list)
+            cone = None
+            if self.cone_outputs is not None:
+                cone = set()
+                stack = [device_id for device_id, _ in self.cone_outputs]
+                while stack:
+                    device_id = stack.pop()
+                    device = self.devices.get_device(device_id)
+                    if device is None or device_id in cone:
+                        continue
+                    cone.add(device_id)
+                    stack.extend(connected_output[0] for connected_output in
+                                 device.inputs.values()
+                                 if connected_output is not None)
+            skipped = set()
+            self.constant_outputs = []
+            if self.optimiser is not None:
+                skipped, constants = self.optimiser.optimise()
+                self.constant_outputs = [
+                    (self.devices.get_device(device_id), signal)
+                    for device_id, signal in constants.items()
+                    if cone is None or device_id in cone]
+            self.two_valued_gates = []
+            if self.two_valued:
+                active_gate_ids = {
+                    device.device_id for device in self.devices.devices_list
+                    if device.device_kind in self.devices.gate_types and
+                    (cone is None or device.device_id in cone) and
+                    device.device_id not in skipped}
+                self.two_valued_gates = self.find_two_valued_gates(
+                    active_gate_ids)
+                skipped = skipped | {device.device_id for device, _, _, _, _
+                                     in self.two_valued_gates}
+            self.two_valued_steps = []
+            if self.workers is not None and self.two_valued_gates:
+                self.partitioned = PartitionedExecutor(
+                    self.devices, self, self.two_valued_gates, self.workers)
+            else:
+                self.two_valued_steps = self.find_gate_clusters(
+                    self.two_valued_gates, self.table_inputs)
+            self.active_devices = {}
+            for device in self.devices.devices_list:
+                if (cone is None or device.device_id in cone) and \
+                        device.device_id not in skipped:
+                    self.active_devices.setdefault(
+                        device.device_kind, []).append(device.device_id)
+        return self.active_devices.get(device_kind, [])
+
+    def find_two_valued_gates(self, gate_ids):
+        """Return the gates of gate_ids that can be executed after settling.
+
+        These are the gates that are not in a loop and only drive other such
+        gates, or nothing, so no D-type, register or word device depends on
+        them. Once the rest of the network has settled, all signals are HIGH
+        or LOW, and executing these gates once each, drivers first, with
+        plain two-valued logic gives the outputs they would settle to.
+
+        Return a list of (Device, x, y, inverse of y, [(outputs, output_id)])
+        in execution order, where x and y are as in execute_gate and the
+        list holds the output dictionary and output ID of each input.
+        """
+        # pending stores {gate_id: number of inputs driven by the gate that
+        # belong to gates not yet found}; gates are found sinks first
+        pending = {}
+        ready = []
+        for device_id in gate_ids:
+            device = self.devices.get_device(device_id)
+            if None in device.inputs.values() or (
+                    device.device_kind == self.devices.XOR and
+                    len(device.inputs) != 2):
+                continue  # left to execute_gate, which reports the error
+            pending[device_id] = len(self.get_fanout(device_id, None))
+            if pending[device_id] == 0:
+                ready.append(device_id)
+        found = []
+        while ready:
+            device = self.devices.get_device(ready.pop())
+            found.append(device)
+            for driver_id, output_id in device.inputs.values():
+                if output_id is None and driver_id in pending:
+                    pending[driver_id] -= 1
+                    if pending[driver_id] == 0:
+                        ready.append(driver_id)
+
+        gates = []
+        for device in reversed(found):
+            x, y = self.gate_rules[device.device_kind]
+            inputs = [(self.devices.get_device(driver_id).outputs, output_id)
+                      for driver_id, output_id in device.inputs.values()]
+            gates.append((device, x, y, self.invert_signal(y), inputs))
+        return gates
+
+    def find_gate_clusters(self, gates, max_inputs):
+        """Return the steps executing the two-valued gates.
+
+        gates is a list as returned by find_two_valued_gates. Clusters are
+        grown back from each gate not yet in a cluster, last gates first,
+        taking in one driving gate at a time if every other gate reading the
+        driver is executed after the cluster. Growing stops at twice
+        max_inputs external inputs, since taking in a gate can add inputs
+        that later gates remove, and the largest cluster found with at most
+        max_inputs external inputs is kept. Each cluster of two or more gates
+        is executed in place of its last gate.
+
+        Return a list of (truthtable.GateCluster(), None) for clusters and
+        (None, gate) for the other gates, where gate is an entry of gates.
+        If max_inputs is None, no clusters are made.
+        """
+        if max_inputs is None:
+            return [(None, gate) for gate in gates]
+        position = {gate[0].device_id: index
+                    for index, gate in enumerate(gates)}
+        cluster_roots = {}  # {gate_id: device ID of the cluster's last gate}
+        for device, _, _, _, _ in reversed(gates):
+            root_id = device.device_id
+            if root_id in cluster_roots:
+                continue
+            members = {root_id}
+            # external inputs, as dictionary keys to keep their order
+            external = dict.fromkeys(device.inputs.values())
+            cluster = members.copy()
+            grown = True
+            while grown and len(external) <= 2 * max_inputs:
+                grown = False
+                for driver_id, output_id in external:
+                    if output_id is not None or driver_id not in position or \
+                            driver_id in cluster_roots or \
+                            driver_id in members:
+                        continue
+                    # gates outside the cluster reading the driver must
+                    # be executed after the cluster
+                    if any(sink_id not in members and
+                           position[cluster_roots.get(sink_id, sink_id)] <
+                           position[root_id] for sink_id, _ in
+                           self.get_fanout(driver_id, None)):
+                        continue
+                    driver = self.devices.get_device(driver_id)
+                    members.add(driver_id)
+                    del external[(driver_id, output_id)]
+                    external.update(dict.fromkeys(driver.inputs.values()))
+                    if len(external) <= max_inputs:
+                        cluster = members.copy()
+                    grown = True
+                    break
+            if len(cluster) > 1:
+                for member_id in cluster:
+                    cluster_roots[member_id] = root_id
+
+        cluster_gates = {}  # {root ID: [Device]}, drivers first
+        steps = []
+        for gate in gates:
+            device_id = gate[0].device_id
+            root_id = cluster_roots.get(device_id)
+            if root_id is None:
+                steps.append((None, gate))
+                continue
+            cluster_gates.setdefault(root_id, []).append(gate[0])
+            if root_id == device_id:
+                steps.append((GateCluster(self.devices, self,
+                                          cluster_gates[root_id]), None))
+        return steps
+
+    def execute_two_valued_gates(self):
+        """Execute the two-valued gates once each, drivers first."""
+        for cluster, gate in self.two_valued_steps:
+            if cluster is not None:
+                cluster.execute()
+                continue
+            device, x, y, not_y, inputs = gate
+            signals = [outputs[output_id] for outputs, output_id in inputs]
+            if x is None:  # XOR
+                if signals[0] == signals[1]:
+                    device.outputs[None] = self.devices.LOW
+                else:
+                    device.outputs[None] = self.devices.HIGH
+            elif signals.count(x) == len(signals):
+                device.outputs[None] = y
+            else:
+                device.outputs[None] = not_y
+
+    def find_unconnected_inputs(self):
+        """Return a list of (device_id, input_id) of unconnected inputs.
+
+        Every input is visited once, in the order the devices were made.
+        """
+        return [(device.device_id, input_id)
+                for device in self.devices.devices_list
+                for input_id, connected_output in device.inputs.items()
+                if connected_output is None]
+
+    def find_unused_outputs(self, monitored=()):
+        """Return a list of (device_id, output_id) of unused outputs.
+
+        An output is unused if it drives no input and is not in monitored, a
+        collection of (device_id, output_id).
+        """
+        return [(device.device_id, output_id)
+                for device in self.devices.devices_list
+                for output_id in device.outputs
+                if (device.device_id, output_id) not in self.fanouts and
+                (device.device_id, output_id) not in monitored]
+
     def update_signal(self, signal, target):
         """Update the signal in the direction of the target.
 
@@ -331,6 +777,125 @@ class Network:
         else:
             return False
 
+    def get_input_word(self, device_id, input_ids, one_signals):
+        """Return the integer formed by the signals at the given inputs.
+
+        input_ids are ordered least significant bit first, and a bit is 1 if
+        its signal is in one_signals. Return None if an input is unconnected.
+        """
+        word = 0
+        for bit, input_id in enumerate(input_ids):
+            input_signal = self.get_input_signal(device_id, input_id)
+            if input_signal is None:  # this input is unconnected
+                return None
+            if input_signal in one_signals:
+                word |= 1 << bit
+        return word
+
+    def set_output_word(self, device, output_ids, word):
+        """Update the outputs towards the bits of the integer word.
+
+        output_ids are ordered least significant bit first. Return True if
+        successful.
+        """
+        for bit, output_id in enumerate(output_ids):
+            if (word >> bit) & 1:
+                target = self.devices.HIGH
+            else:
+                target = self.devices.LOW
+            updated_signal = self.update_signal(device.outputs[output_id],
+                                                target)
+            if updated_signal is None:  # if the update is unsuccessful
+                return False
+            device.outputs[output_id] = updated_signal
+        return True
+
+    def execute_bus(self, device_id):
+        """Simulate a bus buffer, whose outputs follow its inputs.
+
+        Return True if successful.
+        """
+        device = self.devices.get_device(device_id)
+        width = device.word_width
+        # Inputs count as 1 when HIGH or RISING towards HIGH
+        one_signals = [self.devices.HIGH, self.devices.RISING]
+        word = self.get_input_word(
+            device_id, self.devices.get_word_port_ids("I", width),
+            one_signals)
+        if word is None:
+            return False
+        return self.set_output_word(
+            device, self.devices.get_word_port_ids("O", width), word)
+
+    def execute_adder(self, device_id):
+        """Simulate a word adder and update its sum and carry outputs.
+
+        The whole word is added in one integer addition. Return True if
+        successful.
+        """
+        device = self.devices.get_device(device_id)
+        width = device.word_width
+        one_signals = [self.devices.HIGH, self.devices.RISING]
+        a_word = self.get_input_word(
+            device_id, self.devices.get_word_port_ids("A", width),
+            one_signals)
+        b_word = self.get_input_word(
+            device_id, self.devices.get_word_port_ids("B", width),
+            one_signals)
+        carry_in = self.get_input_word(device_id, [self.devices.CIN_ID],
+                                       one_signals)
+        if a_word is None or b_word is None or carry_in is None:
+            return False
+        total = a_word + b_word + carry_in
+        # COUT is the bit above the sum outputs
+        output_ids = self.devices.get_word_port_ids("S", width) + [
+            self.devices.COUT_ID]
+        return self.set_output_word(device, output_ids, total)
+
+    def execute_mux(self, device_id):
+        """Simulate a word multiplexer.
+
+        The outputs follow the B inputs when SEL is HIGH, and the A inputs
+        otherwise. Return True if successful.
+        """
+        device = self.devices.get_device(device_id)
+        width = device.word_width
+        one_signals = [self.devices.HIGH, self.devices.RISING]
+        select = self.get_input_word(device_id, [self.devices.SEL_ID],
+                                     one_signals)
+        if select is None:
+            return False
+        prefix = "B" if select else "A"
+        word = self.get_input_word(
+            device_id, self.devices.get_word_port_ids(prefix, width),
+            one_signals)
+        if word is None:
+            return False
+        return self.set_output_word(
+            device, self.devices.get_word_port_ids("O", width), word)
+
+    def execute_register(self, device_id):
+        """Simulate a word register and update its output signal values.
+
+        Like a D-type, the register stores its D inputs on a rising clock
+        edge, taking the value each input had before the edge. Return True if
+        successful.
+        """
+        device = self.devices.get_device(device_id)
+        width = device.word_width
+        clock_signal = self.get_input_signal(device_id, self.devices.CLK_ID)
+        # Data inputs count as 1 when HIGH or FALLING away from HIGH
+        data_word = self.get_input_word(
+            device_id, self.devices.get_word_port_ids("D", width),
+            [self.devices.HIGH, self.devices.FALLING])
+        if clock_signal is None or data_word is None:
+            return False
+        if clock_signal == self.devices.RISING:
+            device.register_memory = data_word
+        return self.set_output_word(
+            device, self.devices.get_word_port_ids("Q", width),
+            device.register_memory)
+
     def update_clocks(self):
         """If it is time to do so, set clock signals to RISING or FALLING."""
         clock_devices = self.devices.find_devices(self.devices.CLOCK)
@@ -349,16 +914,43 @@ class Network:
     def execute_network(self):
         """Execute all the devices in the network for one simulation cycle.
 
-        Return True if successful and the network does not oscillate.
+        Return True if successful and the network does not oscillate. If
+        cone_outputs or an optimiser is set, only the active devices are
+        executed, and folded devices move towards their constant signals. If
+        use_kernel is set, the gates are executed by the generated kernel. If
+        two_valued is set, the two-valued gates are executed after settling,
+        in worker processes if workers is set.
         """
-        clock_devices = self.devices.find_devices(self.devices.CLOCK)
-        switch_devices = self.devices.find_devices(self.devices.SWITCH)
-        d_type_devices = self.devices.find_devices(self.devices.D_TYPE)
-        and_devices = self.devices.find_devices(self.devices.AND)
-        or_devices = self.devices.find_devices(self.devices.OR)
-        nand_devices = self.devices.find_devices(self.devices.NAND)
-        nor_devices = self.devices.find_devices(self.devices.NOR)
-        xor_devices = self.devices.find_devices(self.devices.XOR)
+        if self.optimiser is not None and self.optimiser.has_changed():
+            self.invalidate_active_devices()  # a folded switch was toggled
+        if self.cone_outputs is None and self.optimiser is None and \
+                not self.use_kernel and not self.two_valued:
+            find_devices = self.devices.find_devices
+        else:
+            if self.active_size != len(self.devices.devices_list):
+                self.invalidate_active_devices()  # devices added or removed
+            find_devices = self.find_active_devices
+        clock_devices = find_devices(self.devices.CLOCK)
+        switch_devices = find_devices(self.devices.SWITCH)
+        d_type_devices = find_devices(self.devices.D_TYPE)
+        and_devices = find_devices(self.devices.AND)
+        or_devices = find_devices(self.devices.OR)
+        nand_devices = find_devices(self.devices.NAND)
+        nor_devices = find_devices(self.devices.NOR)
+        xor_devices = find_devices(self.devices.XOR)
+        bus_devices = find_devices(self.devices.BUS)
+        adder_devices = find_devices(self.devices.ADDER)
+        mux_devices = find_devices(self.devices.MUX)
+        register_devices = find_devices(self.devices.REGISTER)
+        constant_outputs = self.constant_outputs if \
+            self.optimiser is not None else []
+        kernel = None
+        if self.use_kernel:
+            kernel = self.get_kernel([and_devices, or_devices, nand_devices,
+                                      nor_devices, xor_devices])
+        if kernel is not None:  # the kernel executes the gates instead
+            and_devices = or_devices = nand_devices = nor_devices = \
+                xor_devices = []
 
         # This sets clock signals to RISING or FALLING, where necessary
         self.update_clocks()
@@ -380,9 +972,20 @@ class Network:
             for device_id in d_type_devices:  # execute DTYPE devices
                 if not self.execute_d_type(device_id):
                     return False
+            for device_id in register_devices:  # execute REGISTER devices
+                if not self.execute_register(device_id):
+                    return False
             for device_id in clock_devices:  # complete clock executions
                 if not self.execute_clock(device_id):
                     return False
+            for device, signal in constant_outputs:  # folded gates
+                updated_signal = self.update_signal(device.outputs[None],
+                                                    signal)
+                if updated_signal is None:
+                    return False
+                device.outputs[None] = updated_signal
+            if kernel is not None and kernel.run():  # execute the gates
+                self.steady_state = False
             for device_id in and_devices:  # execute AND gate devices
                 if not self.execute_gate(device_id, self.devices.HIGH,
                                          self.devices.HIGH):
@@ -402,6 +1005,27 @@ class Network:
             for device_id in xor_devices:  # execute XOR devices
                 if not self.execute_gate(device_id, None, None):
                     return False
+            for device_id in bus_devices:  # execute BUS devices
+                if not self.execute_bus(device_id):
+                    return False
+            for device_id in adder_devices:  # execute ADDER devices
+                if not self.execute_adder(device_id):
+                    return False
+            for device_id in mux_devices:  # execute MUX devices
+                if not self.execute_mux(device_id):
+                    return False
             if self.steady_state:
                 break
+        self.last_iterations = iterations
+        if self.steady_state and self.two_valued:
+            if self.partitioned is not None:
+                if not self.partitioned.execute():
+                    # a worker stopped, so this process executes the gates
+                    # until the workers are started again
+                    self.partitioned = None
+                    self.two_valued_steps = self.find_gate_clusters(
+                        self.two_valued_gates, self.table_inputs)
+                    self.execute_two_valued_gates()
+            else:
+                self.execute_two_valued_gates()
         return self.steady_state
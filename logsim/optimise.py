@@ -0,0 +1,177 @@
+"""Fold constant logic and remove dead logic before simulation.
+
+Used in the Logic Simulator project to avoid executing gates whose output
+cannot change during a run. Switches keep their state until the user toggles
+them, so every gate whose output follows from switch states alone is folded
+to a constant, and gates that neither a monitor nor a D-type or register
+depends on are not executed at all.
+
+Classes
+-------
+NetworkOptimiser - finds the constant and dead devices of a network.
+"""
+
+
+class NetworkOptimiser:
+    """Find the constant and dead devices of a network.
+
+    The network calls optimise() whenever it finds the devices to execute,
+    and has_changed() before every simulation cycle, so the optimisation is
+    run again after a folded switch is toggled, a connection is made or
+    removed, or a monitor is made or removed.
+
+    A gate is constant if one of its inputs is a constant at the gate's
+    controlling level (LOW for AND and NAND, HIGH for OR and NOR), or if all
+    its inputs are constant. Constants start at the switches and are
+    propagated through the fan-out index, so every connection is followed at
+    most once.
+
+    A device is live if it has a path, not through a constant gate, to a
+    monitored output, a D-type or a register. Devices that are neither live
+    nor folded are dead.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    optimise(self): Returns the set of IDs of devices not to execute, and
+                    the constant signal of each live folded device.
+
+    has_changed(self): Returns True if a switch was toggled since the last
+                       optimisation.
+
+    find_constants(self): Returns the constant output signal of every
+                          folded switch and gate.
+
+    find_live_devices(self, constants): Returns the set of IDs of the
+                                        devices that monitors, D-types or
+                                        registers depend on.
+    """
+
+    def __init__(self, devices, network, monitors):
+        """Initialise the gate rules and the folded switch states."""
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+        # {device_kind: (x, y)}: if all inputs are x, the output is y, else
+        # it is the inverse of y, as in Network.execute_gate
+        self.gate_rules = {
+            devices.AND: (devices.HIGH, devices.HIGH),
+            devices.OR: (devices.LOW, devices.LOW),
+            devices.NAND: (devices.HIGH, devices.LOW),
+            devices.NOR: (devices.LOW, devices.HIGH),
+            devices.XOR: (None, None)}
+
+        # switch_states stores {switch_id: switch_state} as last folded
+        self.switch_states = {}
+
+    def optimise(self):
+        """Return the devices not to execute and the folded constants.
+
+        Return (skipped, constants), where skipped is the set of IDs of the
+        folded and dead devices, and constants maps the ID of each live
+        folded gate to its constant output signal. Switches are folded but
+        still executed, since they are cheap and the user may toggle them.
+        """
+        constants = self.find_constants()
+        live_devices = self.find_live_devices(constants)
+        skipped = set()
+        live_constants = {}
+        for device in self.devices.devices_list:
+            device_id = device.device_id
+            if device.device_kind == self.devices.SWITCH:
+                continue
+            if device_id in constants and device_id in live_devices:
+                live_constants[device_id] = constants[device_id]
+                skipped.add(device_id)
+            elif device_id not in live_devices:
+                skipped.add(device_id)
+        return skipped, live_constants
+
+    def has_changed(self):
+        """Return True if a folded switch was toggled or removed."""
+        for switch_id, switch_state in self.switch_states.items():
+            device = self.devices.get_device(switch_id)
+            if device is None or device.switch_state != switch_state:
+                return True
+        return False
+
+    def find_constants(self):
+        """Return {device_id: signal} for every constant switch and gate."""
+        constants = {}
+        self.switch_states = {}
+        stack = []
+        for switch_id in self.devices.find_devices(self.devices.SWITCH):
+            switch_state = self.devices.get_device(switch_id).switch_state
+            self.switch_states[switch_id] = switch_state
+            constants[switch_id] = switch_state
+            stack.append(switch_id)
+
+        while stack:
+            device_id = stack.pop()
+            for sink_id, _ in self.network.get_fanout(device_id, None):
+                if sink_id in constants:
+                    continue
+                signal = self.fold_gate(self.devices.get_device(sink_id),
+                                        constants)
+                if signal is not None:
+                    constants[sink_id] = signal
+                    stack.append(sink_id)
+        return constants
+
+    def fold_gate(self, device, constants):
+        """Return the constant output signal of a gate, or None.
+
+        constants maps device IDs to the constant signals of their single
+        output.
+        """
+        if device.device_kind not in self.gate_rules:
+            return None
+        x, y = self.gate_rules[device.device_kind]
+        input_signals = []
+        for connected_output in device.inputs.values():
+            signal = None
+            if connected_output is not None and connected_output[1] is None:
+                signal = constants.get(connected_output[0])
+            if x is not None and signal is not None and signal != x:
+                return self.network.invert_signal(y)  # controlling input
+            input_signals.append(signal)
+        if None in input_signals:
+            return None
+        if x is None:  # XOR of two constants
+            if input_signals[0] == input_signals[1]:
+                return self.devices.LOW
+            return self.devices.HIGH
+        return y
+
+    def find_live_devices(self, constants):
+        """Return the set of IDs of the devices that are used.
+
+        The search starts at the monitored and checked devices, D-types and
+        registers, and follows inputs back to the devices driving them. It
+        does not pass through constant gates, whose inputs no longer matter.
+        """
+        stack = [device_id for device_id, _ in
+                 self.monitors.observed_signals]
+        stack.extend(self.devices.find_devices(self.devices.D_TYPE))
+        stack.extend(self.devices.find_devices(self.devices.REGISTER))
+        live_devices = set()
+        while stack:
+            device_id = stack.pop()
+            if device_id in live_devices:
+                continue
+            device = self.devices.get_device(device_id)
+            if device is None:
+                continue
+            live_devices.add(device_id)
+            if device_id in constants:
+                continue
+            stack.extend(connected_output[0] for connected_output in
+                         device.inputs.values()
+                         if connected_output is not None)
+        return live_devices
@@ -0,0 +1,162 @@
+"""Scan large circuit definition files in parallel.
+
+Used in the Logic Simulator project to speed up reading multi-megabyte
+definition files, where scanning one character at a time dominates the
+parse. The file is split into chunks of whole lines, each chunk is scanned
+by an ordinary Scanner in a worker process, and the parser then reads the
+symbols of all chunks in order.
+
+Classes
+-------
+ParallelScanner - scans chunks of the definition file in worker processes.
+"""
+import bisect
+import concurrent.futures
+import os
+import re
+
+from names import Names
+from scanner import Scanner, Symbol
+
+
+class ParallelScanner(Scanner):
+    """Scan chunks of the definition file in worker processes.
+
+    The parser is unchanged: it calls get_symbol() as it would on a Scanner,
+    and receives the same symbols with the same line numbers and positions.
+    Errors are therefore reported exactly as by sequential parsing.
+
+    Chunks start at the beginning of a line outside block comments. Since
+    no symbol spans a line break and the position is reset at every line, a
+    Scanner started on a chunk with the right first line number produces the
+    symbols the sequential scan would. Workers return names as strings, and
+    names are only added to the names table when the parser reads them, so
+    every name gets the same ID as in a sequential scan.
+
+    Parameters
+    ----------
+    path: path to the circuit definition file.
+    names: instance of the names.Names() class.
+    processes: number of worker processes, or None for one per CPU.
+    chunk_size: smallest number of characters in a chunk.
+
+    Public methods
+    --------------
+    get_symbol(self): Returns the next scanned symbol.
+
+    split_text(self, text): Returns the start of each chunk of text.
+
+    scan_chunk(text, first_line): Scans a chunk of text and returns its
+                                  symbols (static method, run by the
+                                  workers).
+    """
+
+    # Files at least this large are worth scanning in parallel
+    min_parallel_size = 1 << 20
+
+    # Comments: block comments, including an unclosed one running to the
+    # end, and line comments, inside which "/*" does not start a comment
+    comment_pattern = re.compile(r"/\*.*?\*/|/\*.*|#[^\n]*", re.DOTALL)
+
+    def __init__(self, path, names, processes=None, chunk_size=1 << 18):
+        """Scan the file in chunks and store the symbols.
+
+        If the file fits in one chunk, it is scanned sequentially instead.
+        """
+        super().__init__(path, names)
+        self.symbols = None
+        self.index = 0
+
+        with open(path) as definition_file:
+            text = definition_file.read()
+        processes = processes or os.cpu_count() or 1
+        self.chunk_size = max(chunk_size, len(text) // processes + 1)
+
+        starts = self.split_text(text)
+        if len(starts) == 1:
+            return
+        self.FILE.close()
+        ends = starts[1:] + [len(text)]
+        chunks = [text[start:end] for start, end in zip(starts, ends)]
+        first_lines = [1 + text.count("\n", 0, start) for start in starts]
+
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes) as executor:
+            chunk_symbols = list(executor.map(
+                ParallelScanner.scan_chunk, chunks, first_lines))
+
+        # Each chunk ends with the symbols at its end of file; only the
+        # last chunk really ends there
+        self.symbols = []
+        for symbols in chunk_symbols[:-1]:
+            self.symbols.extend(symbols[:-2])
+        self.symbols.extend(chunk_symbols[-1])
+
+    def split_text(self, text):
+        """Return the start of each chunk of text.
+
+        A chunk ends after the first line break at least chunk_size
+        characters after its start that is not inside a block comment.
+        """
+        comment_starts = []
+        comment_ends = []
+        for comment in self.comment_pattern.finditer(text):
+            if comment.group().startswith("/"):
+                comment_starts.append(comment.start())
+                comment_ends.append(comment.end())
+
+        starts = [0]
+        end = starts[-1] + self.chunk_size
+        while True:
+            end = text.find("\n", end) + 1
+            if end == 0 or end == len(text):
+                return starts
+            index = bisect.bisect_left(comment_starts, end) - 1
+            if index >= 0 and comment_ends[index] > end:
+                # try the end of the line the comment ends on
+                end = comment_ends[index]
+                continue
+            starts.append(end)
+            end += self.chunk_size
+
+    @staticmethod
+    def scan_chunk(text, first_line):
+        """Scan a chunk of text and return its symbols.
+
+        Each symbol is a tuple (type, value, line number, position), where
+        the value is the name string of a name or keyword and the number of
+        a number. The symbols end with the end of file symbol and the one
+        returned by any later call, which may differ in position.
+        """
+        names = Names()
+        scanner = Scanner(None, names, text=text, first_line=first_line)
+        symbols = []
+        end_count = 0
+        while end_count < 2:
+            symbol = scanner.get_symbol()
+            value = symbol.id
+            if symbol.type in [scanner.NAME, scanner.KEYWORD]:
+                value = names.get_name_string(symbol.id)
+            elif symbol.type == scanner.EOF:
+                end_count += 1
+            symbols.append((symbol.type, value, symbol.line_number,
+                            symbol.position))
+        return symbols
+
+    def get_symbol(self):
+        """Return the next scanned symbol.
+
+        After the end of the file, the last symbol is returned again.
+        """
+        if self.symbols is None:  # the file is scanned sequentially
+            return super().get_symbol()
+        symbol = Symbol()
+        (symbol.type, value, symbol.line_number,
+         symbol.position) = self.symbols[self.index]
+        if self.index < len(self.symbols) - 1:
+            self.index += 1
+        if symbol.type in [self.NAME, self.KEYWORD]:
+            symbol.id = self.names.intern(value)
+        else:
+            symbol.id = value
+        return symbol
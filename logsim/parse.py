@@ -8,6 +8,15 @@ and semantic analysis of the circuit definition file. It checks for errors,
 reports them, and builds the logic network using the provided devices,
 network, monitors, and names modules.
 """
+from devices import Devices
+from network import Network
+from modules import ModuleTemplate
+from diagnostics import Diagnostic
+from checks import AssertionCheck, StableCheck
+
+
+class ErrorLimitReached(Exception):
+    """Raised inside the parser to stop once max_errors errors are found."""
 
 
 class Parser:
@@ -18,9 +27,18 @@ class Parser:
     semantic errors, and builds the logic network. It interacts with the
     scanner to receive tokens, and with devices, network, monitors, and
     names modules to construct the circuit.
+
+    Each error is recorded in errors as a diagnostics.Diagnostic(). Unless
+    print_errors is False, errors are also printed as they are found, with a
+    summary at the end; callers that format the diagnostics themselves turn
+    printing off. Outputs that are neither connected nor monitored are
+    recorded in warnings, and printed in the same way, after a successful
+    parse. If max_errors is given, parsing stops as soon as that many
+    errors are found; max_errors=1 fails fast on the first error.
     """
 
-    def __init__(self, names, devices, network, monitors, scanner):
+    def __init__(self, names, devices, network, monitors, scanner,
+                 max_errors=None, print_errors=True):
         """
         Initialise the Parser with references to other modules.
 
@@ -39,6 +57,10 @@ class Parser:
 
         # Error tracking
         self.error_count = 0
+        self.errors = []
+        self.max_errors = max_errors
+        self.print_errors = print_errors
+        self.stopped = False  # True if parsing stopped at max_errors
         self.error_type_list = [
             self.NO_SEMICOLON, self.NO_COLON, self.NO_ARROW, self.NO_DOT,
             self.DOT, self.NO_DEVICE_TYPE, self.NO_NUMBER, self.INVALID_NAME,
@@ -50,16 +72,97 @@ class Parser:
             self.INVALID_PORT, self.INVALID_PORT_DTYPE,
             self.INVALID_PORT_XOR, self.NOT_I_PORT,
             self.PORT_OUT_RANGE, self.NOT_END, self.REPEATED_MONITOR, 
-            self.REPEATED_DEVICE, self.MISSED_SEMICOLON
-        ] = range(30)
+            self.REPEATED_DEVICE, self.MISSED_SEMICOLON, self.INVALID_WIDTH,
+            self.MODULE_PRESENT, self.MODULE_PORT, self.MODULE_UNCONNECTED,
+            self.NO_ENDMODULE, self.NO_MODULE_SECTION, self.NO_END,
+            self.NETWORK_UNCONNECTED, self.EMPTY_FILE, self.UNUSED_OUTPUT,
+            self.NO_CHECK_OPERATOR, self.NO_OPERAND, self.NO_CLOSE_BRACKET,
+            self.NO_UNLESS
+        ] = range(44)
+        self.error_messages = {
+            self.NO_SEMICOLON: "Expected a comma or semicolon",
+            self.NO_COLON: "Expected a colon",
+            self.NO_ARROW: "Expected an arrow",
+            self.NO_DOT: "Expected a dot",
+            self.DOT: "Did not expect a dot",
+            self.NO_DEVICE_TYPE: "Expected a device type",
+            self.NO_NUMBER: "Expected a number",
+            self.INVALID_NAME: "Invalid device name",
+            self.NO_INITIALISATION_KEYWORD:
+                "Expected DEVICES, CONNECT, MONITOR, CHECK or END",
+            self.NOT_BIT: "Expected a bit (0 or 1)",
+            self.QUALIFIER_PRESENT: "Did not expect a parameter",
+            self.INVALID_RANGE: "Expected number between 1 and 16 inclusive",
+            self.INVALID_CONNECTION_SC:
+                "Connection should not be made to SWITCH or CLOCK",
+            self.DEVICE_ABSENT: "Device not found",
+            self.REPEATED_DEVICE: "Device has already been initialised",
+            self.INPUT_CONNECTED: "Input has already been connected",
+            self.INPUT_TO_INPUT: "Input cannot be connected to another input",
+            self.PORT_ABSENT: "Port not found",
+            self.OUTPUT_TO_OUTPUT:
+                "Output cannot be connected to another output",
+            self.NOT_I_PORT:
+                "Port Absent, Port is not a valid gate input port",
+            self.PORT_OUT_RANGE: "Port number out of range",
+            self.INVALID_PORT: "Invalid port number",
+            self.INVALID_PORT_DTYPE:
+                "Port Absent, Invalid port for D-type device",
+            self.INVALID_PORT_XOR:
+                "Port Absent, Invalid port number for XOR device",
+            self.NOT_END: "Expected file to end after END keyword",
+            self.REPEATED_MONITOR: "Signal cannot be monitored more than once",
+            self.CLOCK_PERIOD_ZERO: "clock period cannot be zero",
+            self.MISSED_SEMICOLON: "Expected a semicolon prior to this",
+            self.INVALID_WIDTH: "Expected width between 1 and 64 inclusive",
+            self.MODULE_PRESENT: "Module has already been defined",
+            self.MODULE_PORT: "Invalid use of module port",
+            self.MODULE_UNCONNECTED:
+                "Module has unconnected inputs or outputs",
+            self.NO_ENDMODULE: "Expected ENDMODULE",
+            self.NO_MODULE_SECTION: "Expected DEVICES, CONNECT or ENDMODULE",
+            self.NO_END: "Expected 'END' keyword before end of file.",
+            self.NETWORK_UNCONNECTED: "Input is not connected",
+            self.EMPTY_FILE: "Empty File",
+            self.UNUSED_OUTPUT: "Output is not connected or monitored",
+            self.NO_CHECK_OPERATOR: "Expected = or STABLE",
+            self.NO_OPERAND: "Expected a signal, 0, 1, NOT or a bracket",
+            self.NO_CLOSE_BRACKET: "Expected a closing bracket",
+            self.NO_UNLESS: "Expected UNLESS"
+        }
         # Device types that require dot notation for ports
         self.dot_signals = {
-            "IN": [self.devices.D_TYPE],
+            "IN": [self.devices.D_TYPE] + self.devices.word_types,
             "OUT": [
                 self.devices.D_TYPE, self.devices.XOR, self.devices.AND,
                 self.devices.NAND, self.devices.OR, self.devices.NOR
-            ]
+            ] + self.devices.word_types
+        }
+        # Word device keywords and the device kinds they make
+        self.word_device_kinds = {
+            self.scanner.BUS_ID: self.devices.BUS,
+            self.scanner.ADDER_ID: self.devices.ADDER,
+            self.scanner.MUX_ID: self.devices.MUX,
+            self.scanner.REGISTER_ID: self.devices.REGISTER
         }
+        # Gate keywords combining two operands in check expressions
+        self.check_operators = [
+            self.scanner.AND_ID, self.scanner.NAND_ID, self.scanner.OR_ID,
+            self.scanner.NOR_ID, self.scanner.XOR_ID
+        ]
+        # Module templates by module name, and the port maps of the module
+        # instances in the current scope by instance name
+        self.modules = {}
+        self.instances = {}
+        # Port names of the module whose body is being parsed
+        self.module_inputs = []
+        self.module_outputs = []
+        # Symbol naming each device and instance where it is defined, in the
+        # current scope, for locating connectivity errors
+        self.device_symbols = {}
+        # Outputs that are neither connected nor monitored, as
+        # diagnostics.Diagnostic(); these do not count as errors
+        self.warnings = []
 
     def parse_network(self):
         """
@@ -67,55 +170,216 @@ class Parser:
 
         Returns True if parsing is successful (no errors), False otherwise.
         """
+        try:
+            self.symbol = self.scanner.get_symbol()
+            while self.symbol.type != self.scanner.EOF:
+                if self.symbol.id == self.scanner.DEVICES_ID:
+                    self.parent = 'D'
+                    # Start parsing device list
+                    self.symbol = self.scanner.get_symbol()
+                    self.device_list()
+                elif self.symbol.id == self.scanner.CONNECT_ID:
+                    self.parent = 'C'
+                    self.symbol = self.scanner.get_symbol()
+                    self.connection_list()
+                elif self.symbol.id == self.scanner.MONITOR_ID:
+                    self.parent = 'M'
+                    self.symbol = self.scanner.get_symbol()
+                    self.monitor_list()
+                elif self.symbol.id == self.scanner.CHECK_ID:
+                    self.parent = 'K'
+                    self.symbol = self.scanner.get_symbol()
+                    self.check_list()
+                elif self.symbol.id == self.scanner.MODULE_ID:
+                    self.symbol = self.scanner.get_symbol()
+                    self.module_definition()
+                elif self.symbol.id == self.scanner.END_ID:
+                    self.symbol = self.scanner.get_symbol()
+                    self.end_of_file()
+                    break
+                else:
+                    # Error: expected a section keyword
+                    self.error(self.NO_INITIALISATION_KEYWORD)
+                self.parent = None
+
+            if self.error_count == 0 and not self.network.check_network():
+                self.report_unconnected_inputs()
+
+            # check if no devices are present
+            if (self.error_count == 0) and (len(self.devices.find_devices()) == 0) and  (len(self.monitors.get_signal_names()) == 0):
+                self.report(self.EMPTY_FILE, located=False)
+            if self.error_count == 0:
+                self.record_unused_outputs()
+        except ErrorLimitReached:
+            self.stopped = True
+
+        if self.error_count > 0:
+            if self.print_errors:
+                print(Diagnostic.format_summary(self.error_count,
+                                                self.stopped))
+            return False
+        
+        return True
+
+    def end_of_file(self):
+        """Check if the current symbol is EOF, otherwise report an error."""
+        if self.symbol.type != self.scanner.EOF:
+            self.error(self.NOT_END)
+        return
+
+    def module_definition(self):
+        """Parse a module definition and store it as a template.
+
+        The module body is parsed into separate devices and network, in which
+        the input ports are switches and the output ports are one-input AND
+        gates, so the device and connection parsers can be reused unchanged.
+        """
+        header = self.module_header()
+        if isinstance(header, int):
+            self.error(header)
+            # Skip the body of a module with an invalid header
+            while self.symbol.type != self.scanner.EOF and \
+                    self.symbol.id != self.scanner.ENDMODULE_ID:
+                self.symbol = self.scanner.get_symbol()
+            if self.symbol.type == self.scanner.EOF:
+                self.error(self.NO_ENDMODULE)
+                return
+            self.symbol = self.scanner.get_symbol()
+            if self.symbol.type == self.scanner.SEMICOLON:
+                self.symbol = self.scanner.get_symbol()
+            return
+        module_id, input_ids, output_ids = header
+
+        devices = Devices(self.names)
+        network = Network(self.names, devices)
+        for port_id in input_ids:
+            devices.make_device(port_id, devices.SWITCH, 0)
+        for port_id in output_ids:
+            devices.make_device(port_id, devices.AND, 1)
+
+        outer_scope = (self.devices, self.network, self.instances,
+                       self.module_inputs, self.module_outputs,
+                       self.device_symbols)
+        self.devices, self.network, self.instances = devices, network, {}
+        self.module_inputs, self.module_outputs = input_ids, output_ids
+        self.device_symbols = {}
+        try:
+            self.module_body(module_id, input_ids, output_ids)
+        finally:  # also when parsing stops at max_errors
+            (self.devices, self.network, self.instances, self.module_inputs,
+             self.module_outputs, self.device_symbols) = outer_scope
+
+    def module_header(self):
+        """Parse the name and the port lists of a module.
+
+        Return (module_id, input_ids, output_ids), or an error code.
+        """
+        if self.symbol.type != self.scanner.NAME:
+            return self.INVALID_NAME
+        module_id = self.symbol.id
+        if module_id in self.modules:
+            return self.MODULE_PRESENT
         self.symbol = self.scanner.get_symbol()
-        while self.symbol.type != self.scanner.EOF:
+        if self.symbol.type != self.scanner.COLON:
+            return self.NO_COLON
+        self.symbol = self.scanner.get_symbol()
+        input_ids = self.port_names()
+        if isinstance(input_ids, int):
+            return input_ids
+        if self.symbol.type != self.scanner.ARROW:
+            return self.NO_ARROW
+        self.symbol = self.scanner.get_symbol()
+        output_ids = self.port_names()
+        if isinstance(output_ids, int):
+            return output_ids
+        if self.symbol.type != self.scanner.SEMICOLON:
+            return self.NO_SEMICOLON
+        if len(set(input_ids + output_ids)) != len(input_ids + output_ids):
+            # repeated port name
+            return self.MODULE_PORT
+        self.symbol = self.scanner.get_symbol()
+        return module_id, input_ids, output_ids
+
+    def port_names(self):
+        """Parse a list of module port names and return their IDs."""
+        port_ids = []
+        while True:
+            if self.symbol.type != self.scanner.NAME:
+                return self.INVALID_NAME
+            port_ids.append(self.symbol.id)
+            self.symbol = self.scanner.get_symbol()
+            if self.symbol.type != self.scanner.COMMA:
+                return port_ids
+            self.symbol = self.scanner.get_symbol()
+
+    def module_body(self, module_id, input_ids, output_ids):
+        """Parse the sections of a module body up to ENDMODULE.
+
+        If the body has no errors, store the module template.
+        """
+        error_count = self.error_count
+        while True:
             if self.symbol.id == self.scanner.DEVICES_ID:
                 self.parent = 'D'
-                # Start parsing device list
                 self.symbol = self.scanner.get_symbol()
                 self.device_list()
             elif self.symbol.id == self.scanner.CONNECT_ID:
                 self.parent = 'C'
                 self.symbol = self.scanner.get_symbol()
                 self.connection_list()
-            elif self.symbol.id == self.scanner.MONITOR_ID:
-                self.parent = 'M'
+            elif self.symbol.id == self.scanner.ENDMODULE_ID:
                 self.symbol = self.scanner.get_symbol()
-                self.monitor_list()
-            elif self.symbol.id == self.scanner.END_ID:
-                self.symbol = self.scanner.get_symbol()
-                self.end_of_file()
                 break
+            elif (self.symbol.type == self.scanner.EOF or
+                  self.symbol.id in self.scanner.section_id_list):
+                # MONITOR, END or another MODULE before ENDMODULE
+                self.error(self.NO_ENDMODULE)
+                return
             else:
-                # Error: expected a section keyword
-                self.error(self.NO_INITIALISATION_KEYWORD)
+                self.error(self.NO_MODULE_SECTION)
             self.parent = None
-        
-        if self.error_count == 0 and not self.network.check_network():
-            print()
-            print("Network connectivity issues found")
-            print()
-            self.error_count += 1
-            
-        
-        # check if no devices are present
-        if (self.error_count == 0) and (len(self.devices.find_devices()) == 0) and  (len(self.monitors.get_signal_names()) == 0):
-            self.error_count += 1
-            print("Empty File")
-            print()
-        
 
-        if self.error_count > 0:
-            print(f"Summary: {self.error_count} error/s found\n")
-            return False
-        
-        return True
+        if self.symbol.type != self.scanner.SEMICOLON:
+            self.error(self.NO_SEMICOLON)
+            return
+        if self.error_count > error_count:
+            self.symbol = self.scanner.get_symbol()
+            return
+        template = ModuleTemplate(self.names, input_ids, output_ids)
+        if not self.network.check_network():
+            self.error(self.MODULE_UNCONNECTED)
+        elif not template.build(self.devices):
+            # an output port is driven directly by an input port
+            self.error(self.MODULE_PORT)
+        else:
+            self.modules[module_id] = template
+            self.symbol = self.scanner.get_symbol()
 
-    def end_of_file(self):
-        """Check if the current symbol is EOF, otherwise report an error."""
-        if self.symbol.type != self.scanner.EOF:
-            self.error(self.NOT_END)
-        return
+    def make_instance(self, instance_id, module_id):
+        """Make the devices and connections of a module instance."""
+        if (self.devices.get_device(instance_id) is not None or
+                instance_id in self.instances):
+            return self.REPEATED_DEVICE
+        self.instances[instance_id] = self.modules[module_id].instantiate(
+            instance_id, self.devices, self.network)
+        self.symbol = self.scanner.get_symbol()
+        return self.NO_ERROR
+
+    def instance_port(self, ports, error_type):
+        """Parse the dot and port name following a module instance name.
+
+        Return [port_id], or error_type if ports does not contain the port.
+        """
+        self.symbol = self.scanner.get_symbol()
+        if self.symbol.type != self.scanner.DOT:
+            return self.NO_DOT
+        self.symbol = self.scanner.get_symbol()
+        if (self.symbol.type != self.scanner.NAME or
+                self.symbol.id not in ports):
+            return error_type
+        port_id = self.symbol.id
+        self.symbol = self.scanner.get_symbol()
+        return [port_id]
 
     def make_device_parser(self, device_id, device_type_id):
         """
@@ -125,6 +389,19 @@ class Parser:
         """
         self.symbol = self.scanner.get_symbol()
         error = None
+        # Handle BUS, ADDER, MUX and REGISTER devices, which take a width
+        if device_type_id in self.word_device_kinds:
+            if self.symbol.type != self.scanner.NUMBER:
+                return self.NO_NUMBER
+            error = self.devices.make_device(
+                device_id, self.word_device_kinds[device_type_id],
+                device_property=self.symbol.id)
+            if error == self.devices.DEVICE_PRESENT:
+                return self.REPEATED_DEVICE
+            self.symbol = self.scanner.get_symbol()
+            if error == self.devices.INVALID_QUALIFIER:
+                return self.INVALID_WIDTH
+            return self.NO_ERROR
         # Handle XOR and DTYPE devices
         if device_type_id == self.scanner.XOR_ID:
             error = self.devices.make_device(
@@ -197,9 +474,15 @@ class Parser:
         if self.symbol.type == self.scanner.NAME:
             # Valid device name, get the next symbol
             device_id = self.symbol.id
+            if device_id in self.instances:
+                return self.REPEATED_DEVICE
+            self.device_symbols.setdefault(device_id, self.symbol)
             self.symbol = self.scanner.get_symbol()
             if self.symbol.type == self.scanner.COLON:
                 self.symbol = self.scanner.get_symbol()
+                if (self.symbol.type == self.scanner.NAME and
+                        self.symbol.id in self.modules):
+                    return self.make_instance(device_id, self.symbol.id)
                 if (self.symbol.type == self.scanner.KEYWORD and
                         self.symbol.id in self.scanner.device_id_list):
                     device_type_id = self.symbol.id
@@ -208,9 +491,7 @@ class Parser:
                     return self.NO_DEVICE_TYPE
             else:
                 return self.NO_COLON
-        elif self.symbol.id in [
-                self.scanner.DEVICES_ID, self.scanner.CONNECT_ID,
-                self.scanner.MONITOR_ID, self.scanner.END_ID]:
+        elif self.symbol.id in self.scanner.section_id_list:
             return self.MISSED_SEMICOLON
 
         else:
@@ -254,6 +535,15 @@ class Parser:
         if self.symbol.type == self.scanner.NAME:
             # Valid device name, get the next symbol
             device_id = self.symbol.id
+            if device_id in self.instances:
+                outputs = self.instances[device_id][1]
+                port = self.instance_port(outputs, self.INVALID_PORT)
+                if isinstance(port, int):
+                    return port
+                [port_id] = port
+                return list(outputs[port_id])
+            if device_id in self.module_outputs:
+                return self.MODULE_PORT
             if self.devices.get_device(device_id) is None:
                 return self.DEVICE_ABSENT
             self.symbol = self.scanner.get_symbol()
@@ -273,16 +563,14 @@ class Parser:
                 self.symbol = self.scanner.get_symbol()
                 # Found a number, this is the port number
                 port_id = self.symbol.id
-                if port_id not in [self.scanner.Q_ID, self.scanner.QBAR_ID]:
+                if port_id not in self.devices.get_device(device_id).outputs:
                     return self.INVALID_PORT
                 self.symbol = self.scanner.get_symbol()
                 return [device_id, port_id]
             else:
                 # Error: expected a dot after the device name
                 return self.NO_DOT
-        elif self.symbol.id in [
-                self.scanner.DEVICES_ID, self.scanner.CONNECT_ID,
-                self.scanner.MONITOR_ID, self.scanner.END_ID]:
+        elif self.symbol.id in self.scanner.section_id_list:
             return self.MISSED_SEMICOLON
         else:
             # Error: invalid device name
@@ -293,6 +581,18 @@ class Parser:
         if self.symbol.type == self.scanner.NAME:
             # Valid device name, get the next symbol
             device_id = self.symbol.id
+            if device_id in self.instances:
+                port = self.instance_port(self.instances[device_id][0],
+                                          self.PORT_ABSENT)
+                if isinstance(port, int):
+                    return port
+                [port_id] = port
+                return [device_id, port_id]
+            if device_id in self.module_outputs:
+                self.symbol = self.scanner.get_symbol()
+                return [device_id, self.scanner.I1_ID]
+            if device_id in self.module_inputs:
+                return self.MODULE_PORT
             if self.devices.get_device(device_id) is None:
                 return self.DEVICE_ABSENT
             device_type_id = self.devices.get_device(device_id).device_kind
@@ -315,6 +615,12 @@ class Parser:
                         return self.INVALID_PORT_DTYPE
                     elif device_type_id == self.devices.XOR:
                         return self.INVALID_PORT_XOR
+                    elif device_type_id in self.devices.word_types:
+                        if port_id in (
+                            self.devices.get_device(device_id).outputs
+                        ):
+                            return self.OUTPUT_TO_OUTPUT
+                        return self.PORT_ABSENT
                     else:
                         name = self.names.get_name_string(
                             self.symbol.id)
@@ -354,8 +660,17 @@ class Parser:
         else:
             out_device_id, out_port_id = out_signal
 
-        error_type = self.network.make_connection(
-            in_device_id, in_port_id, out_device_id, out_port_id)
+        # An instance input port may drive several devices in the instance
+        if out_device_id in self.instances:
+            sinks = self.instances[out_device_id][0][out_port_id]
+        else:
+            sinks = [(out_device_id, out_port_id)]
+        error_type = self.network.NO_ERROR
+        for out_device_id, out_port_id in sinks:
+            error_type = self.network.make_connection(
+                in_device_id, in_port_id, out_device_id, out_port_id)
+            if error_type != self.network.NO_ERROR:
+                break
         if error_type == self.network.DEVICE_ABSENT:
             return self.DEVICE_ABSENT
         elif error_type == self.network.INPUT_CONNECTED:
@@ -404,6 +719,16 @@ class Parser:
         if self.symbol.type == self.scanner.NAME:
             # Valid device name, get the next symbol
             device_id = self.symbol.id
+            if device_id in self.instances:
+                outputs = self.instances[device_id][1]
+                port = self.instance_port(outputs, self.INVALID_PORT)
+                if isinstance(port, int):
+                    return port
+                [port_id] = port
+                error = self.monitors.make_monitor(*outputs[port_id])
+                if error == self.monitors.MONITOR_PRESENT:
+                    return self.REPEATED_MONITOR
+                return self.NO_ERROR
             self.symbol = self.scanner.get_symbol()
             if self.symbol.type == self.scanner.DOT:
                 # Found a dot, get the port number
@@ -432,9 +757,7 @@ class Parser:
                 elif error == self.monitors.NO_ERROR:
                     error = self.NO_ERROR
                 return error
-        elif self.symbol.id in [
-                self.scanner.DEVICES_ID, self.scanner.CONNECT_ID,
-                self.scanner.MONITOR_ID, self.scanner.END_ID]:
+        elif self.symbol.id in self.scanner.section_id_list:
             return self.MISSED_SEMICOLON
         else:
             return self.INVALID_NAME
@@ -470,91 +793,224 @@ class Parser:
                 return
         return
 
+    def check(self):
+        """Parse a check and add it to the monitors.
+
+        A check is either signal = expression, or signal STABLE UNLESS
+        clock signal.
+        """
+        signal = self.in_signame()
+        if isinstance(signal, int):
+            return signal
+        if self.symbol.type == self.scanner.EQUALS:
+            self.symbol = self.scanner.get_symbol()
+            expression = self.check_expression()
+            if isinstance(expression, int):
+                return expression
+            check = AssertionCheck(self.devices, self.network, tuple(signal),
+                                   expression)
+        elif self.symbol.id == self.scanner.STABLE_ID:
+            self.symbol = self.scanner.get_symbol()
+            if self.symbol.id != self.scanner.UNLESS_ID:
+                return self.NO_UNLESS
+            self.symbol = self.scanner.get_symbol()
+            clock_signal = self.in_signame()
+            if isinstance(clock_signal, int):
+                return clock_signal
+            check = StableCheck(self.devices, self.network, tuple(signal),
+                                tuple(clock_signal))
+        else:
+            return self.NO_CHECK_OPERATOR
+        error = self.monitors.make_check(check)
+        if error == self.network.DEVICE_ABSENT:
+            return self.DEVICE_ABSENT
+        elif error == self.monitors.NOT_OUTPUT:
+            return self.INVALID_PORT
+        return self.NO_ERROR
+
+    def check_expression(self):
+        """Parse operands joined by gate keywords, evaluated left to right.
+
+        Return the expression as a tuple (see checks.AssertionCheck()), or
+        an error.
+        """
+        expression = self.check_operand()
+        while (not isinstance(expression, int) and
+               self.symbol.id in self.check_operators):
+            gate_kind = self.symbol.id
+            self.symbol = self.scanner.get_symbol()
+            operand = self.check_operand()
+            if isinstance(operand, int):
+                return operand
+            expression = (gate_kind, expression, operand)
+        return expression
+
+    def check_operand(self):
+        """Parse a signal, a bit, NOT operand or a bracketed expression."""
+        if self.symbol.id == self.scanner.NOT_ID:
+            self.symbol = self.scanner.get_symbol()
+            operand = self.check_operand()
+            if isinstance(operand, int):
+                return operand
+            return ("not", operand)
+        if self.symbol.type == self.scanner.NUMBER:
+            if self.symbol.id not in (0, 1):
+                return self.NOT_BIT
+            level = [self.devices.LOW, self.devices.HIGH][self.symbol.id]
+            self.symbol = self.scanner.get_symbol()
+            return ("constant", level)
+        if self.symbol.type == self.scanner.OPEN_BRACKET:
+            self.symbol = self.scanner.get_symbol()
+            expression = self.check_expression()
+            if isinstance(expression, int):
+                return expression
+            if self.symbol.type != self.scanner.CLOSE_BRACKET:
+                return self.NO_CLOSE_BRACKET
+            self.symbol = self.scanner.get_symbol()
+            return expression
+        if self.symbol.type == self.scanner.NAME:
+            signal = self.in_signame()
+            if isinstance(signal, int):
+                return signal
+            return ("signal", *signal)
+        if self.symbol.id in self.scanner.section_id_list:
+            return self.MISSED_SEMICOLON
+        return self.NO_OPERAND
+
+    def check_list(self):
+        """Parse a list of checks from the definition file."""
+        error = self.check()
+        if error != self.NO_ERROR:
+            self.error(error)
+        if self.parent is None:
+            return
+        while True:
+            if self.symbol.type == self.scanner.COMMA:
+                self.symbol = self.scanner.get_symbol()
+                error = self.check()
+                if error != self.NO_ERROR:
+                    self.error(error)
+                if self.parent is None:
+                    return
+            elif self.symbol.type == self.scanner.SEMICOLON:
+                # End of check list
+                self.symbol = self.scanner.get_symbol()
+                break
+            else:
+                # Error: expected semicolon
+                self.error(self.NO_SEMICOLON)
+
+            if self.parent is None:
+                return
+        return
+
+    def report(self, error_type, symbol=None, located=True, detail=None):
+        """Record an error at symbol (the current symbol) and print it.
+
+        Errors that are not located in the file, such as an empty file, have
+        no line. The detail, if given, is added to the message. Raise
+        ErrorLimitReached once max_errors errors have been found.
+        """
+        if symbol is None:
+            symbol = self.symbol
+        message = self.error_messages.get(error_type, "Unknown error")
+        if detail is not None:
+            message += ": " + detail
+        self.error_count += 1
+        if located:
+            diagnostic = Diagnostic(error_type, message, symbol.line_number,
+                                    symbol.position, self.scanner)
+        else:
+            diagnostic = Diagnostic(error_type, message)
+        self.errors.append(diagnostic)
+        if self.print_errors:
+            print(diagnostic.format())
+        if self.max_errors is not None and \
+                self.error_count >= self.max_errors:
+            raise ErrorLimitReached()
+
+    def get_port_string(self, device_id, port_id):
+        """Return the name of a port as written in the definition file."""
+        name = self.names.get_name_string(device_id)
+        if port_id is None:
+            return name
+        return name + "." + self.names.get_name_string(port_id)
+
+    def locate_port(self, port, instance_ports):
+        """Return the symbol and name of a port in the definition file.
+
+        A port of a device inside a module instance is named by the instance
+        port in instance_ports, {(device_id, port_id): (instance_id,
+        port_id)}, if it has one, and is otherwise located at the instance.
+        """
+        device_id, port_id = instance_ports.get(port, port)
+        symbol = self.device_symbols.get(device_id)
+        if symbol is None:
+            # an unnamed port of a flattened instance device
+            name = self.names.get_name_string(device_id)
+            instance_name = name.split(ModuleTemplate.separator)[0]
+            symbol = self.device_symbols.get(
+                self.names.query(instance_name))
+        return symbol, self.get_port_string(device_id, port_id)
+
+    def report_unconnected_inputs(self):
+        """Report every unconnected input where its device is defined.
+
+        The devices and connections are visited once. An instance input
+        port driving several devices in the instance is reported once.
+        """
+        instance_ports = {}
+        for instance_id, (inputs, _) in self.instances.items():
+            for port_id, sinks in inputs.items():
+                for sink in sinks:
+                    instance_ports[sink] = (instance_id, port_id)
+        reported = set()
+        for port in self.network.find_unconnected_inputs():
+            symbol, port_string = self.locate_port(port, instance_ports)
+            if port_string in reported:
+                continue
+            reported.add(port_string)
+            self.report(self.NETWORK_UNCONNECTED, symbol,
+                        located=symbol is not None, detail=port_string)
+
+    def record_unused_outputs(self):
+        """Record a warning for every output that is not used."""
+        instance_ports = {}
+        for instance_id, (_, outputs) in self.instances.items():
+            for port_id, output in outputs.items():
+                instance_ports[output] = (instance_id, port_id)
+        for port in self.network.find_unused_outputs(
+                self.monitors.observed_signals):
+            symbol, port_string = self.locate_port(port, instance_ports)
+            message = (self.error_messages[self.UNUSED_OUTPUT] + ": " +
+                       port_string)
+            if symbol is None:
+                diagnostic = Diagnostic(self.UNUSED_OUTPUT, message)
+            else:
+                diagnostic = Diagnostic(self.UNUSED_OUTPUT, message,
+                                        symbol.line_number, symbol.position,
+                                        self.scanner)
+            self.warnings.append(diagnostic)
+            if self.print_errors:
+                print(diagnostic.format())
+
     def error(self, error_type):
         """Handle errors in the definition file."""
         if error_type == self.MISSED_SEMICOLON:
             self.parent = None
-            self.error_count += 1
-            print("Expected a semicolon prior to this")  # tested
-            print(f"LINE {self.symbol.line_number}:")
-            print(self.scanner.print_error(self.symbol))
-            print()
+            self.report(self.MISSED_SEMICOLON)  # tested
             return
 
-        if self.symbol.id in [
-                self.scanner.DEVICES_ID, self.scanner.CONNECT_ID,
-                self.scanner.MONITOR_ID, self.scanner.END_ID]:
+        if (self.symbol.id in self.scanner.section_id_list and
+                error_type != self.NO_ENDMODULE):
             self.parent = None
-            self.error_count += 1
-            print("Expected a semicolon prior to this")  # tested
-            print(f"LINE {self.symbol.line_number}:")
-            print(self.scanner.print_error(self.symbol))
-            print()
+            self.report(self.MISSED_SEMICOLON)  # tested
             return
-            
-        
-        self.error_count += 1
-        stopping_punctuation_flag = False
-        if error_type == self.NO_SEMICOLON:
-            print("Expected a comma or semicolon")  # tested
-            stopping_punctuation_flag = True
-        elif error_type == self.NO_COLON:
-            print("Expected a colon")
-        elif error_type == self.NO_ARROW:
-            print("Expected an arrow")
-        elif error_type == self.NO_DOT:
-            print("Expected a dot")
-        elif error_type == self.DOT:
-            print("Did not expect a dot")
-        elif error_type == self.NO_DEVICE_TYPE:
-            print("Expected a device type")  # tested
-        elif error_type == self.NO_NUMBER:
-            print("Expected a number")  # tested
-        elif error_type == self.INVALID_NAME:
-            print("Invalid device name")
-        elif error_type == self.NO_INITIALISATION_KEYWORD:
-            print("Expected DEVICES, CONNECT, MONITOR or END")  # tested
-        elif error_type == self.NOT_BIT:
-            print("Expected a bit (0 or 1)")  # tested
-        elif error_type == self.QUALIFIER_PRESENT:
-            print("Did not expect a parameter")  # tested
-        elif error_type == self.INVALID_RANGE:
-            print("Expected number between 1 and 16 inclusive")
-        elif error_type == self.INVALID_CONNECTION_SC:
-            print("Connection should not be made to SWITCH or CLOCK")
-        elif error_type == self.DEVICE_ABSENT:
-            print("Device not found")  # tested
-        elif error_type == self.REPEATED_DEVICE:
-            print("Device has already been initialised")
-        elif error_type == self.INPUT_CONNECTED:
-            print("Input has already been connected")
-        elif error_type == self.INPUT_TO_INPUT:
-            print("Input cannot be connected to another input")
-        elif error_type == self.PORT_ABSENT:
-            print("Port not found")
-        elif error_type == self.OUTPUT_TO_OUTPUT:
-            print("Output cannot be connected to another output")
-        elif error_type == self.NOT_I_PORT:
-            print("Port Absent, Port is not a valid gate input port")
-        elif error_type == self.PORT_OUT_RANGE:
-            print("Port number out of range")
-        elif error_type == self.INVALID_PORT:
-            print("Invalid port number")
-        elif error_type == self.INVALID_PORT_DTYPE:
-            print("Port Absent, Invalid port for D-type device")
-        elif error_type == self.INVALID_PORT_XOR:
-            print("Port Absent, Invalid port number for XOR device")
-        elif error_type == self.NOT_END:
-            print("Expected file to end after END keyword") 
-        elif error_type == self.REPEATED_MONITOR:
-            print("Signal cannot be monitored more than once")
-        elif error_type == self.CLOCK_PERIOD_ZERO:
-            print("clock period cannot be zero")
-        else:
-            print("Unknown error")
-        print(f"LINE {self.symbol.line_number}:")
-        print(self.scanner.print_error(self.symbol))
-        print()
+
+        # tested: NO_SEMICOLON, NO_DEVICE_TYPE, NO_NUMBER,
+        # NO_INITIALISATION_KEYWORD, NOT_BIT, QUALIFIER_PRESENT, DEVICE_ABSENT
+        stopping_punctuation_flag = error_type == self.NO_SEMICOLON
+        self.report(error_type)
         if self.symbol.type == self.scanner.COMMA:
             return
         if self.symbol.type == self.scanner.SEMICOLON:
@@ -562,9 +1018,7 @@ class Parser:
             self.parent = None
             return
         
-        if self.symbol.id in [
-                self.scanner.DEVICES_ID, self.scanner.CONNECT_ID,
-                self.scanner.MONITOR_ID, self.scanner.END_ID]:
+        if self.symbol.id in self.scanner.section_id_list:
             self.parent = None
             return
         
@@ -576,22 +1030,10 @@ class Parser:
                 self.symbol = self.scanner.get_symbol()
                 self.parent = None
                 return
-            if self.symbol.id in [
-                self.scanner.DEVICES_ID, self.scanner.CONNECT_ID,
-                self.scanner.MONITOR_ID, self.scanner.END_ID
-            ]:
+            if self.symbol.id in self.scanner.section_id_list:
                 self.parent = None
                 if not stopping_punctuation_flag:
-                    self.error_count += 1
-                    print("Expected a semicolon prior to this")  # tested
-                    print(f"LINE {self.symbol.line_number}:")
-                    print(self.scanner.print_error(self.symbol))
-                    print()
+                    self.report(self.MISSED_SEMICOLON)  # tested
                 return
-        self.error_count += 1
-        print("Expected 'END' keyword before end of file.")  # tested
-        print(f"LINE {self.symbol.line_number}:")
-        print(self.scanner.print_error(self.symbol))
-        print()
         self.parent = None
-        return
+        self.report(self.NO_END)  # tested
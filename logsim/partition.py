@@ -0,0 +1,267 @@
+"""Execute the two-valued gates in parallel worker processes.
+
+Used in the Logic Simulator project to spread the gate evaluation of large
+netlists over several CPU cores. The two-valued gates of the network form
+an acyclic region, so they can be sorted into levels in which no gate reads
+another. Each level is split into balanced partitions, one per worker
+process, and the workers evaluate their partitions on a signal array in
+shared memory, synchronising only where a gate reads a signal that another
+worker has just written.
+
+Classes
+-------
+PartitionedExecutor - executes the two-valued gates in worker processes.
+"""
+import atexit
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+class PartitionedExecutor:
+    """Execute the two-valued gates in worker processes.
+
+    The signal array holds one byte per signal, 0 for LOW and 1 for HIGH:
+    byte 0 tells the workers to stop, and the other bytes hold the outputs of
+    the gates and the inputs driven by other devices. Each worker runs one
+    generated function per stage, one line per gate. The main process starts
+    every stage by releasing each worker's start semaphore, and waits on
+    each worker's done semaphore until all of them have finished it.
+
+    Gates are split level by level. A gate goes to the worker that wrote its
+    first gate input if that worker still has less than its share of the
+    level, and otherwise to the worker with the fewest gates of the level. A
+    new stage starts before a level only if one of its gates reads a signal
+    written in the current stage by another worker, so a chain of gates kept
+    in one worker needs no synchronisation.
+
+    execute() gives the same outputs as Network.execute_two_valued_gates.
+    If a worker has stopped, or does not finish a stage within timeout
+    seconds, the workers are stopped and execute() returns False, so the
+    caller can execute the gates itself.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    gates: list of two-valued gates, as returned by
+           Network.find_two_valued_gates.
+    workers: number of worker processes.
+
+    Public methods
+    --------------
+    partition(self): Returns the gates of each worker in each stage.
+
+    generate(self, stage_gates): Returns the source of the function a worker
+                                 runs for one stage.
+
+    execute(self): Executes the gates once each in the worker processes and
+                   returns True if successful.
+
+    close(self): Stops the workers and frees the shared memory.
+
+    run_worker(memory_name, sources, start, done): Runs the stage functions
+                                                   of one worker for every
+                                                   simulation cycle (static
+                                                   method, run by the
+                                                   workers).
+    """
+
+    def __init__(self, devices, network, gates, workers):
+        """Partition the gates and start the worker processes."""
+        self.devices = devices
+        self.network = network
+        self.gates = gates
+        self.workers = workers
+
+        # index stores {(device_id, output_id): byte in the signal array}
+        self.index = {}
+        for device, _, _, _, _ in gates:
+            self.index[(device.device_id, None)] = len(self.index) + 1
+        # inputs lists (output dictionary, output ID, byte) of the signals
+        # driven by other devices, and outputs lists (output dictionary,
+        # byte) of the gates
+        self.inputs = []
+        for device, _, _, _, _ in gates:
+            for driver_id, output_id in device.inputs.values():
+                if (driver_id, output_id) not in self.index:
+                    self.index[(driver_id, output_id)] = len(self.index) + 1
+                    self.inputs.append(
+                        (devices.get_device(driver_id).outputs, output_id,
+                         self.index[(driver_id, output_id)]))
+        self.outputs = [(device.outputs, self.index[(device.device_id, None)])
+                        for device, _, _, _, _ in gates]
+        self.signal_levels = (devices.LOW, devices.HIGH)
+        # longest wait in seconds for the workers to finish a stage
+        self.timeout = 10.0
+
+        self.stages = self.partition()
+        sources = [[self.generate(stage[worker]) for stage in self.stages]
+                   for worker in range(workers)]
+
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=len(self.index) + 1)
+        self.signals = self.memory.buf
+        self.signals[0] = 0
+        self.starts = [multiprocessing.Semaphore(0) for _ in range(workers)]
+        self.dones = [multiprocessing.Semaphore(0) for _ in range(workers)]
+        self.processes = [
+            multiprocessing.Process(target=self.run_worker, daemon=True,
+                                    args=(self.memory.name, sources[worker],
+                                          self.starts[worker],
+                                          self.dones[worker]))
+            for worker in range(workers)]
+        for process in self.processes:
+            process.start()
+        self.closed = False
+        atexit.register(self.close)
+
+    def partition(self):
+        """Return the gates of each worker in each stage.
+
+        Return a list of stages, each a list with the gates of every worker
+        as (Device, x, y, inverse of y, inputs), in execution order.
+        """
+        # Sort the gates into levels, drivers first
+        level = {}
+        levels = []
+        for gate in self.gates:
+            device = gate[0]
+            gate_level = 1 + max(
+                [level[driver_id] for driver_id, output_id in
+                 device.inputs.values()
+                 if output_id is None and driver_id in level], default=-1)
+            level[device.device_id] = gate_level
+            if gate_level == len(levels):
+                levels.append([])
+            levels[gate_level].append(gate)
+
+        owner = {}  # {gate_id: worker}
+        stage_of = {}  # {gate_id: stage the gate is written in}
+        stages = []
+        for level_gates in levels:
+            share = -(-len(level_gates) // self.workers)  # rounded up
+            loads = [0] * self.workers
+            assignment = []
+            for gate in level_gates:
+                drivers = [driver_id for driver_id, output_id in
+                           gate[0].inputs.values()
+                           if output_id is None and driver_id in owner]
+                worker = None
+                if drivers and loads[owner[drivers[0]]] < share:
+                    worker = owner[drivers[0]]
+                if worker is None:
+                    worker = loads.index(min(loads))
+                loads[worker] += 1
+                owner[gate[0].device_id] = worker
+                assignment.append((gate, worker))
+
+            # A new stage is needed if a gate reads a signal another worker
+            # writes in the current stage
+            new_stage = not stages or any(
+                stage_of.get(driver_id) == len(stages) - 1 and
+                owner[driver_id] != worker
+                for gate, worker in assignment
+                for driver_id, _ in gate[0].inputs.values())
+            if new_stage:
+                stages.append([[] for _ in range(self.workers)])
+            for gate, worker in assignment:
+                stages[-1][worker].append(gate)
+                stage_of[gate[0].device_id] = len(stages) - 1
+        return stages
+
+    def generate(self, stage_gates):
+        """Return the source of the function running the gates of a stage.
+
+        The function takes the signal array v, in which 0 is LOW and 1 is
+        HIGH. A gate whose inputs are all x has output y, as in
+        Network.execute_gate.
+        """
+        lines = ["def stage(v):"]
+        high = self.devices.HIGH
+        for device, x, y, _, _ in stage_gates:
+            operands = [f"v[{self.index[connected_output]}]"
+                        for connected_output in device.inputs.values()]
+            if x is None:  # XOR
+                target = f"{operands[0]} ^ {operands[1]}"
+            elif x == high:  # all inputs HIGH
+                target = " & ".join(operands)
+            else:  # all inputs LOW
+                target = "1 - (" + " | ".join(operands) + ")"
+            if x is not None and y != high:
+                target = f"1 - ({target})"
+            output = self.index[(device.device_id, None)]
+            lines.append(f"    v[{output}] = {target}")
+        if len(lines) == 1:
+            lines.append("    pass")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def run_worker(memory_name, sources, start, done):
+        """Run the stage functions for every simulation cycle.
+
+        Before each stage the worker waits for its start semaphore, and stops
+        if byte 0 of the signal array is set. After each stage it releases
+        its done semaphore.
+        """
+        memory = shared_memory.SharedMemory(name=memory_name)
+        signals = memory.buf
+        functions = []
+        for source in sources:
+            namespace = {}
+            exec(compile(source, "<partition stage>", "exec"), namespace)
+            functions.append(namespace["stage"])
+        stopped = False
+        while not stopped:
+            for function in functions:
+                start.acquire()
+                if signals[0]:
+                    stopped = True
+                    break
+                function(signals)
+                done.release()
+        del signals
+        memory.close()
+
+    def execute(self):
+        """Execute the gates once each in the worker processes.
+
+        Return True if successful, or False if a worker has stopped or timed
+        out, in which case the executor is closed and no outputs are set.
+        """
+        if self.closed or not all(process.is_alive()
+                                  for process in self.processes):
+            self.close()
+            return False
+        signals = self.signals
+        high = self.devices.HIGH
+        for outputs, output_id, byte in self.inputs:
+            signals[byte] = 1 if outputs[output_id] == high else 0
+        for _ in self.stages:
+            for start in self.starts:
+                start.release()
+            for done in self.dones:
+                if not done.acquire(timeout=self.timeout):
+                    self.close()
+                    return False
+        signal_levels = self.signal_levels
+        for outputs, byte in self.outputs:
+            outputs[None] = signal_levels[signals[byte]]
+        return True
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        if self.closed:
+            return
+        self.closed = True
+        atexit.unregister(self.close)
+        self.signals[0] = 1
+        for start in self.starts:
+            start.release()
+        for process in self.processes:
+            process.join(self.timeout)
+            if process.is_alive():  # stuck in a stage or suspended
+                process.kill()
+                process.join()
+        self.signals = None
+        self.memory.close()
+        self.memory.unlink()
@@ -0,0 +1,177 @@
+"""Measure where time goes while parsing and simulating a network.
+
+Used in the Logic Simulator project to time each phase of a run, from scanning
+the definition file to rendering the GUI canvas. Profiling is switched on
+with the -p command line option or the LOGSIM_PROFILE environment variable.
+When it is off no profiler is made and no method is wrapped, so the
+simulator runs exactly as without this module.
+
+Classes
+-------
+Profiler - times methods of the simulator classes and reports the results.
+"""
+import json
+import sys
+import time
+
+
+class Profiler:
+    """Time methods of the simulator classes and report the results.
+
+    Methods are timed by replacing them with a wrapper on the instance, so
+    only the instances passed to the profiler are affected. Phases may be
+    nested: the parse phase includes the scan and check_network phases.
+
+    Parameters
+    ----------
+    report_path: path of the JSON report written by dump(), or None to print
+                 a summary instead.
+
+    Public methods
+    --------------
+    wrap(self, owner, method_name, phase, after=None): Replaces the method of
+                              owner with a version that adds its wall time to
+                              the phase, calling after() when it returns.
+
+    time_call(self, phase, function, *args): Calls function and adds its wall
+                              time to the phase.
+
+    instrument_parser(self, scanner, parser): Times scanning and parsing.
+
+    instrument_simulation(self, devices, network, monitors): Times network
+                              checks, cold startup, simulation cycles and
+                              monitor recording, and counts settle
+                              iterations and executed devices per cycle.
+
+    instrument_canvas(self, canvas): Times rendering of the GUI canvas.
+
+    report(self): Returns the results as a dictionary.
+
+    summary(self): Returns the results as a printable table.
+
+    dump(self): Writes the JSON report or prints the summary.
+    """
+
+    def __init__(self, report_path=None):
+        """Initialise the empty results."""
+        self.report_path = report_path
+
+        # phase -> [number of calls, total wall time in seconds]
+        self.phases = {}
+        # settle iterations and device evaluations in each simulation cycle
+        self.cycle_iterations = []
+        self.cycle_evaluations = []
+        # memory used by the monitor traces after the last recording
+        self.monitor_bytes = 0
+
+    def wrap(self, owner, method_name, phase, after=None):
+        """Replace owner.method_name with a timed version."""
+        method = getattr(owner, method_name)
+        clock = time.perf_counter
+        phases = self.phases
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                totals = phases.setdefault(phase, [0, 0.0])
+                totals[0] += 1
+                totals[1] += clock() - start
+                if after is not None:
+                    after()
+
+        setattr(owner, method_name, timed)
+
+    def time_call(self, phase, function, *args):
+        """Return function(*args), adding its wall time to the phase."""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            totals = self.phases.setdefault(phase, [0, 0.0])
+            totals[0] += 1
+            totals[1] += time.perf_counter() - start
+
+    def instrument_parser(self, scanner, parser):
+        """Time the scanner and the parser."""
+        self.wrap(scanner, "get_symbol", "scan")
+        self.wrap(parser, "parse_network", "parse")
+
+    def instrument_simulation(self, devices, network, monitors):
+        """Time the network, cold startup and monitor recording."""
+
+        def count_cycle():
+            # Devices pruned, folded or executed after settling are not in
+            # the settle loop; two-valued gates run once after it
+            if network.active_devices is None:
+                executed = len(devices.devices_list)
+            else:
+                executed = sum(len(device_ids) for device_ids in
+                               network.active_devices.values())
+            evaluations = network.last_iterations * executed
+            if network.two_valued and network.steady_state:
+                evaluations += len(network.two_valued_gates)
+            self.cycle_iterations.append(network.last_iterations)
+            self.cycle_evaluations.append(evaluations)
+
+        def measure_monitors():
+            self.monitor_bytes = sum(
+                sys.getsizeof(trace) for trace in
+                monitors.monitors_dictionary.values())
+
+        self.wrap(network, "check_network", "check_network")
+        self.wrap(devices, "cold_startup", "cold_startup")
+        self.wrap(network, "execute_network", "execute_network",
+                  count_cycle)
+        self.wrap(monitors, "record_signals", "record_signals",
+                  measure_monitors)
+
+    def instrument_canvas(self, canvas):
+        """Time rendering of the GUI canvas."""
+        self.wrap(canvas, "render", "render")
+
+    def report(self):
+        """Return the results as a dictionary."""
+        cycles = len(self.cycle_iterations)
+        return {
+            "phases": {phase: {"calls": calls, "seconds": seconds}
+                       for phase, (calls, seconds) in self.phases.items()},
+            "cycles": cycles,
+            "settle_iterations": self.cycle_iterations,
+            "mean_settle_iterations": (sum(self.cycle_iterations) / cycles
+                                       if cycles else 0),
+            "max_settle_iterations": max(self.cycle_iterations, default=0),
+            "device_evaluations": self.cycle_evaluations,
+            "monitor_bytes": self.monitor_bytes
+        }
+
+    def summary(self):
+        """Return the results as a printable table."""
+        report = self.report()
+        lines = ["Profile summary",
+                 f"{'phase':<16}{'calls':>10}{'total (s)':>12}"
+                 f"{'mean (ms)':>12}"]
+        for phase, totals in report["phases"].items():
+            calls, seconds = totals["calls"], totals["seconds"]
+            lines.append(f"{phase:<16}{calls:>10}{seconds:>12.4f}"
+                         f"{1000 * seconds / calls:>12.4f}")
+        lines.append(f"Simulation cycles: {report['cycles']}")
+        if report["cycles"]:
+            lines.append(
+                f"Settle iterations per cycle: mean "
+                f"{report['mean_settle_iterations']:.2f}, max "
+                f"{report['max_settle_iterations']}")
+            lines.append(
+                f"Device evaluations per cycle: mean "
+                f"{sum(self.cycle_evaluations) / report['cycles']:.1f}")
+        lines.append(f"Monitor memory: {report['monitor_bytes']} bytes")
+        return "\n".join(lines)
+
+    def dump(self):
+        """Write the JSON report, or print the summary if there is no path."""
+        if self.report_path is None:
+            print(self.summary())
+            return
+        with open(self.report_path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=2)
@@ -0,0 +1,239 @@
+"""Reload a changed circuit definition file into a live network.
+
+Used in the Logic Simulator project to apply edits to the definition file
+without restarting the program or losing the recorded monitor traces.
+
+Classes
+-------
+NetworkReloader - re-parses the definition file and applies the differences.
+"""
+import os
+
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+class NetworkReloader:
+    """Re-parse the definition file and apply the differences in place.
+
+    The edited file is parsed into a separate set of devices, network and
+    monitors that share the live names instance, so the name IDs of both
+    netlists agree. Only the sections whose text changed since the last load
+    are compared and applied to the live devices, network and monitors.
+    Monitors on unchanged signals keep their recorded traces. Checks are
+    replaced as a whole when the CHECK section or any device changes, and
+    start counting failures again.
+
+    Parameters
+    ----------
+    path: path to the circuit definition file.
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    has_changed(self): Returns True if the file was modified since the last
+                       load.
+
+    reload(self, cycles_completed=0): Re-parses the file and applies the
+                                      changes to the live network.
+    """
+
+    section_keywords = ["DEVICES", "CONNECT", "MONITOR", "CHECK", "MODULE"]
+
+    def __init__(self, path, names, devices, network, monitors):
+        """Record the state of the file the live network was built from."""
+        self.path = path
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+        # number of devices, connections, monitors and checks added and
+        # removed by the last reload
+        self.changes = {}
+        # errors found by the last reload, and warnings about unused outputs
+        # after a successful one, as diagnostics.Diagnostic()
+        self.diagnostics = []
+        self.warnings = []
+
+        self.file_stamp = self.get_file_stamp()
+        self.section_texts = self.get_section_texts()
+
+    def get_file_stamp(self):
+        """Return the modification time and size of the file."""
+        try:
+            status = os.stat(self.path)
+        except OSError:
+            return None
+        return (status.st_mtime_ns, status.st_size)
+
+    def get_section_texts(self):
+        """Return {section keyword: text} for the definition file.
+
+        The file is split at section keyword symbols found by the scanner,
+        so names containing a keyword, such as SEND, do not start a section.
+        Each section is kept as its symbols separated by spaces, and the text
+        of repeated sections of the same kind is joined, so that comments and
+        formatting-only edits do not count as changes.
+        """
+        try:
+            with open(self.path) as definition_file:
+                text = definition_file.read()
+        except OSError:
+            return {}
+        scanner = Scanner(self.path, self.names, text=text)
+        # text of the punctuation symbol types
+        punctuation = dict(zip(
+            [scanner.COMMA, scanner.SEMICOLON, scanner.COLON, scanner.ARROW,
+             scanner.DOT, scanner.EQUALS, scanner.OPEN_BRACKET,
+             scanner.CLOSE_BRACKET], scanner.symbol_list))
+        section_texts = dict.fromkeys(self.section_keywords, "")
+        keyword = None
+        symbol = scanner.get_symbol()
+        while symbol.type != scanner.EOF:
+            if symbol.type in (scanner.KEYWORD, scanner.NAME):
+                symbol_text = self.names.get_name_string(symbol.id)
+            elif symbol.type == scanner.NUMBER:
+                symbol_text = str(symbol.id)
+            else:  # invalid characters are kept as a placeholder
+                symbol_text = punctuation.get(symbol.type, "?")
+            if symbol.type == scanner.KEYWORD and (
+                    symbol_text in self.section_keywords or
+                    symbol.id == scanner.END_ID):
+                keyword = symbol_text
+            elif keyword in section_texts:
+                section_texts[keyword] += symbol_text + " "
+            symbol = scanner.get_symbol()
+        return section_texts
+
+    def has_changed(self):
+        """Return True if the file was modified since the last load."""
+        return self.get_file_stamp() != self.file_stamp
+
+    def get_device_table(self, devices):
+        """Return {device_id: (device_kind, device_property)}."""
+        return {device.device_id: (device.device_kind,
+                                   devices.get_device_property(
+                                       device.device_id))
+                for device in devices.devices_list}
+
+    def get_connection_set(self, devices):
+        """Return the set of (device_id, input_id, output) connections."""
+        return {(device.device_id, input_id, connected_output)
+                for device in devices.devices_list
+                for input_id, connected_output in device.inputs.items()
+                if connected_output is not None}
+
+    def reload(self, cycles_completed=0):
+        """Re-parse the file and apply the changes to the live network.
+
+        New monitors are padded with cycles_completed BLANK signals. Return
+        True if successful. If the edited file has errors, the live network is
+        left unchanged, False is returned and the errors are kept in
+        diagnostics. Otherwise outputs that are neither connected nor
+        monitored are kept in warnings.
+        """
+        self.file_stamp = self.get_file_stamp()
+        section_texts = self.get_section_texts()
+        changed_sections = {keyword for keyword in self.section_keywords
+                            if section_texts.get(keyword) !=
+                            self.section_texts.get(keyword)}
+        if "MODULE" in changed_sections:
+            # module ports decide which devices instance ports resolve to
+            changed_sections |= {"CONNECT", "MONITOR", "CHECK"}
+        self.changes = {"devices_added": 0, "devices_removed": 0,
+                        "connections_added": 0, "connections_removed": 0,
+                        "monitors_added": 0, "monitors_removed": 0,
+                        "checks_added": 0, "checks_removed": 0}
+        self.diagnostics = []
+        self.warnings = []
+        if not changed_sections:
+            return True
+
+        new_devices = Devices(self.names)
+        new_network = Network(self.names, new_devices)
+        new_monitors = Monitors(self.names, new_devices, new_network)
+        scanner = Scanner(self.path, self.names)
+        parser = Parser(self.names, new_devices, new_network, new_monitors,
+                        scanner, print_errors=False)
+        self.diagnostics = parser.errors
+        if not parser.parse_network():
+            return False
+        self.warnings = parser.warnings
+        self.section_texts = section_texts
+
+        # Devices that are new, gone or redefined with another kind or
+        # property. Redefined devices are removed and made again.
+        changed_devices = set()
+        if "DEVICES" in changed_sections:
+            old_table = self.get_device_table(self.devices)
+            new_table = self.get_device_table(new_devices)
+            changed_devices = {device_id for device_id in
+                               old_table.keys() | new_table.keys()
+                               if old_table.get(device_id) !=
+                               new_table.get(device_id)}
+
+        if changed_devices or "CONNECT" in changed_sections:
+            old_connections = self.get_connection_set(self.devices)
+            new_connections = self.get_connection_set(new_devices)
+            touched = {connection for connection in
+                       old_connections | new_connections
+                       if connection[0] in changed_devices or
+                       connection[2][0] in changed_devices}
+            for device_id, input_id, _ in (old_connections -
+                                           new_connections) | (
+                                               old_connections & touched):
+                if self.network.remove_connection(device_id, input_id):
+                    self.changes["connections_removed"] += 1
+
+            for device_id in changed_devices:
+                if self.devices.remove_device(device_id):
+                    self.changes["devices_removed"] += 1
+            for device in new_devices.devices_list:
+                if device.device_id in changed_devices:
+                    self.devices.make_device(
+                        device.device_id, device.device_kind,
+                        new_devices.get_device_property(device.device_id))
+                    self.changes["devices_added"] += 1
+
+            for (device_id, input_id, (output_device_id,
+                                       output_port_id)) in (
+                                           new_connections - old_connections
+                                       ) | (new_connections & touched):
+                if self.network.make_connection(
+                        device_id, input_id, output_device_id,
+                        output_port_id) == self.network.NO_ERROR:
+                    self.changes["connections_added"] += 1
+
+        # Monitors on removed or redefined devices lose their traces
+        old_monitors = list(self.monitors.monitors_dictionary)
+        new_monitors_list = list(new_monitors.monitors_dictionary)
+        for device_id, output_id in old_monitors:
+            if device_id in changed_devices or (
+                    "MONITOR" in changed_sections and
+                    (device_id, output_id) not in
+                    new_monitors.monitors_dictionary):
+                self.monitors.remove_monitor(device_id, output_id)
+                self.changes["monitors_removed"] += 1
+        for device_id, output_id in new_monitors_list:
+            if (device_id, output_id) not in self.monitors.monitors_dictionary:
+                if self.monitors.make_monitor(
+                        device_id, output_id,
+                        cycles_completed) == self.monitors.NO_ERROR:
+                    self.changes["monitors_added"] += 1
+
+        if changed_devices or "CHECK" in changed_sections:
+            self.changes["checks_removed"] = len(self.monitors.checks)
+            self.monitors.remove_checks()
+            for check in new_monitors.checks:
+                if self.monitors.make_check(check.copy(
+                        self.devices,
+                        self.network)) == self.monitors.NO_ERROR:
+                    self.changes["checks_added"] += 1
+        return True
@@ -8,6 +8,7 @@ Classes
 Scanner - reads definition file and translates characters into symbols.
 Symbol - encapsulates a symbol and stores its properties.
 """
+import io
 
 
 class Symbol:
@@ -42,6 +43,8 @@ class Scanner:
     ----------
     path: path to the circuit definition file.
     names: instance of the names.Names() class.
+    text: text to scan instead of the file, e.g. one chunk of a large file.
+    first_line: line number of the first line of text.
 
     Public methods
     -------------
@@ -49,18 +52,21 @@ class Scanner:
                       and returns the symbol.
     """
 
-    def __init__(self, path, names):
+    def __init__(self, path, names, text=None, first_line=1):
         """Open specified file and initialise reserved words and IDs."""
         self.names = names
 
         self.symbol_type_list = [self.COMMA, self.SEMICOLON, self.COLON, self.ARROW, self.DOT,
-            self.KEYWORD, self.NUMBER, self.NAME, self.EOF] = range(9)
+            self.KEYWORD, self.NUMBER, self.NAME, self.EOF, self.EQUALS,
+            self.OPEN_BRACKET, self.CLOSE_BRACKET] = range(12)
         
-        self.symbol_list  = [',', ';', ':', '>', '.']
+        self.symbol_list  = [',', ';', ':', '>', '.', '=', '(', ')']
 
         self.keywords_list = ["DEVICES", "CONNECT", "MONITOR", "END", "CLOCK", "SWITCH", "AND", "NAND", "OR", "NOR",
                               "XOR", "DTYPE", "DATA", "CLK", "SET", "CLEAR", "Q", "QBAR", "I1", "I2", "I3", "I4", "I5",
-                              "I6", "I7", "I8", "I9", "I10", "I11", "I12", "I13", "I14", "I15", "I16"]
+                              "I6", "I7", "I8", "I9", "I10", "I11", "I12", "I13", "I14", "I15", "I16",
+                              "BUS", "ADDER", "MUX", "REGISTER", "MODULE", "ENDMODULE",
+                              "CHECK", "NOT", "STABLE", "UNLESS"]
 
 
         [self.DEVICES_ID, self.CONNECT_ID, self.MONITOR_ID,
@@ -71,10 +77,21 @@ class Scanner:
             self.I2_ID, self.I3_ID, self.I4_ID, self.I5_ID,
             self.I6_ID, self.I7_ID, self.I8_ID, self.I9_ID,
             self.I10_ID, self.I11_ID, self.I12_ID, self.I13_ID,
-            self.I14_ID, self.I15_ID, self.I16_ID] = self.names.lookup(self.keywords_list)
+            self.I14_ID, self.I15_ID, self.I16_ID, self.BUS_ID,
+            self.ADDER_ID, self.MUX_ID,
+            self.REGISTER_ID, self.MODULE_ID,
+            self.ENDMODULE_ID, self.CHECK_ID, self.NOT_ID, self.STABLE_ID,
+            self.UNLESS_ID] = self.names.lookup(self.keywords_list)
+
+        self.section_id_list = [self.DEVICES_ID, self.CONNECT_ID,
+                                self.MONITOR_ID, self.END_ID, self.MODULE_ID,
+                                self.ENDMODULE_ID, self.CHECK_ID]
+
+        self.word_device_id_list = [self.BUS_ID, self.ADDER_ID, self.MUX_ID,
+                                    self.REGISTER_ID]
 
         self.device_id_list = [self.CLOCK_ID, self.SWITCH_ID, self.AND_ID, self.NAND_ID, self.OR_ID, self.NOR_ID,
-                                 self.XOR_ID, self.DTYPE_ID]
+                                 self.XOR_ID, self.DTYPE_ID] + self.word_device_id_list
         
         self.gate_port_id_list = [self.I1_ID,
             self.I2_ID, self.I3_ID, self.I4_ID, self.I5_ID,
@@ -83,9 +100,12 @@ class Scanner:
             self.I14_ID, self.I15_ID, self.I16_ID] 
 
         self.position = 0
-        self.line_number = 1
+        self.line_number = first_line
 
-        self.FILE = open(path, 'r')
+        if text is None:
+            self.FILE = open(path, 'r')
+        else:
+            self.FILE = io.StringIO(text)
 
         self.current_character = "" 
         self.advance()
@@ -93,7 +113,10 @@ class Scanner:
         self.path = path
 
         # self.lines = open(path, 'r').readlines()
-        self.lines = self.initialise_lines()
+        if text is None:
+            self.lines = self.initialise_lines()
+        else:  # lines of the file are only needed to print errors
+            self.lines = []
 
     def get_symbol(self):
         """Translate the next sequence of characters into a symbol."""
@@ -176,7 +199,7 @@ class Scanner:
 
             else:
                 symbol.type = self.NAME # name is a user-defined name
-            [symbol.id] = self.names.lookup([name_string])
+            symbol.id = self.names.intern(name_string)
 
         elif self.current_character.isdigit():  # number
             symbol.id = self.get_number()
@@ -202,6 +225,18 @@ class Scanner:
             symbol.type = self.DOT
             self.advance()
 
+        elif self.current_character == "=":  # used in checks
+            symbol.type = self.EQUALS
+            self.advance()
+
+        elif self.current_character == "(":  # used in check expressions
+            symbol.type = self.OPEN_BRACKET
+            self.advance()
+
+        elif self.current_character == ")":
+            symbol.type = self.CLOSE_BRACKET
+            self.advance()
+
         elif self.current_character == "":  # end of file
             symbol.type = self.EOF
             self.FILE.close()
@@ -0,0 +1,116 @@
+"""Run simulation cycles in a background thread.
+
+Used in the Logic Simulator project to run the simulation at full speed
+without blocking the GUI. The worker executes the network and records the
+monitors in batches of cycles, and publishes its progress through a queue.
+The GUI polls the queue at a fixed frame rate and redraws from the latest
+recorded signals.
+
+Classes
+-------
+SimulationWorker - runs batches of simulation cycles in a worker thread.
+"""
+import queue
+import threading
+
+
+class SimulationWorker:
+    """Run batches of simulation cycles in a worker thread.
+
+    The network and monitors are shared with the GUI thread. The worker holds
+    lock while it runs a batch, so the GUI must hold it too while it reads
+    the monitors or changes the network (toggling switches, adding or
+    removing monitors). The lock is reentrant, so GUI methods holding it may
+    call each other.
+
+    After each batch the worker puts (cycles completed, status) on the
+    progress queue, where status is RUNNING until the last batch.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    batch_size: number of cycles run between progress reports.
+
+    Public methods
+    --------------
+    start(self, cycles): Starts running the given number of cycles in a new
+                         thread.
+
+    run(self, cycles): Runs the cycles; this is the body of the thread.
+
+    stop(self): Asks the worker to stop after the current batch and waits
+                for it to finish.
+
+    is_running(self): Returns True if the worker thread is alive.
+
+    get_progress(self): Returns the latest (cycles completed, status) put on
+                        the queue, or None if there is nothing new.
+    """
+
+    def __init__(self, network, monitors, batch_size=100):
+        """Initialise the lock, the progress queue and the status codes."""
+        self.network = network
+        self.monitors = monitors
+        self.batch_size = batch_size
+
+        [self.RUNNING, self.FINISHED, self.STOPPED,
+         self.NETWORK_ERROR] = range(4)
+
+        self.lock = threading.RLock()
+        self.progress = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self, cycles):
+        """Start running the given number of cycles in a new thread.
+
+        Return False if the worker is already running.
+        """
+        if self.is_running():
+            return False
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(cycles,),
+                                       daemon=True)
+        self.thread.start()
+        return True
+
+    def run(self, cycles):
+        """Run the cycles in batches, reporting progress after each batch."""
+        completed = 0
+        status = self.RUNNING
+        while status == self.RUNNING:
+            if completed >= cycles:
+                status = self.FINISHED
+            elif self.stop_event.is_set():
+                status = self.STOPPED
+            else:
+                batch = min(self.batch_size, cycles - completed)
+                with self.lock:
+                    for _ in range(batch):
+                        if not self.network.execute_network():
+                            status = self.NETWORK_ERROR
+                            break
+                        self.monitors.record_signals()
+                        completed += 1
+            self.progress.put((completed, status))
+
+    def stop(self):
+        """Ask the worker to stop after the current batch and wait for it."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def is_running(self):
+        """Return True if the worker thread is alive."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def get_progress(self):
+        """Return the latest progress report, or None if there is none."""
+        latest = None
+        while True:
+            try:
+                latest = self.progress.get_nowait()
+            except queue.Empty:
+                return latest
@@ -0,0 +1,148 @@
+"""Read switch changes over time from a stimulus file.
+
+Used in the Logic Simulator project to run long simulations with changing
+inputs without entering switch commands by hand. The file is read one line
+at a time while the simulation runs, so only the next change is held in
+memory however long the file is.
+
+A stimulus file has one change per line: a cycle number, a colon, and a
+comma-separated list of switch assignments. Text after "#" is a comment.
+
+    # full adder inputs
+    0: S1 = 1, S2 = 0
+    250: S1 = 0
+    1000000: S3 = 1
+
+The assignments of cycle N are made before cycle N is simulated, where
+cycle 0 is the first cycle of a run. Cycle numbers must not decrease.
+
+Classes
+-------
+StimulusFile - applies the switch changes of a stimulus file.
+"""
+import re
+
+
+class StimulusFile:
+    """Apply the switch changes of a stimulus file at the right cycles.
+
+    The file is kept open and read ahead by one line with changes. An error
+    in the file stops the stimulus: apply() then returns False, error_code
+    says what went wrong and line_number where.
+
+    Parameters
+    ----------
+    path: path to the stimulus file.
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+
+    Public methods
+    --------------
+    rewind(self): Goes back to the start of the file for a new run.
+
+    read_change(self): Returns the next (cycle, assignments) in the file.
+
+    apply(self, cycle): Sets the switches of every change up to the given
+                        cycle.
+
+    get_error_message(self): Returns a description of the error found.
+
+    close(self): Closes the file.
+    """
+
+    # a change line: cycle number, colon and the assignments
+    change_pattern = re.compile(r"\s*(\d+)\s*:(.*)$")
+    # one assignment: switch name, equals sign and 0 or 1
+    assignment_pattern = re.compile(r"\s*([A-Za-z][A-Za-z0-9_.]*)\s*=\s*"
+                                    r"([01])\s*$")
+
+    def __init__(self, path, names, devices):
+        """Open the file and read the first change."""
+        self.path = path
+        self.names = names
+        self.devices = devices
+
+        [self.NO_ERROR, self.SYNTAX_ERROR, self.NOT_A_SWITCH,
+         self.CYCLE_ORDER] = self.names.unique_error_codes(4)
+
+        self.file = None
+        self.rewind()
+
+    def rewind(self):
+        """Go back to the start of the file for a new run."""
+        self.close()
+        self.file = open(self.path)
+        self.line_number = 0
+        self.last_cycle = 0
+        self.error_code = self.NO_ERROR
+        self.error_name = None
+        self.change = self.read_change()
+
+    def read_change(self):
+        """Return the next (cycle, [(switch_id, state)]) in the file.
+
+        Return None at the end of the file, or if the next change has an
+        error, in which case error_code is set.
+        """
+        for line in self.file:
+            self.line_number += 1
+            text = line.split("#", 1)[0]
+            if not text.strip():
+                continue
+            match = self.change_pattern.match(text)
+            if match is None:
+                self.error_code = self.SYNTAX_ERROR
+                return None
+            cycle = int(match.group(1))
+            if cycle < self.last_cycle:
+                self.error_code = self.CYCLE_ORDER
+                return None
+            self.last_cycle = cycle
+
+            assignments = []
+            for assignment in match.group(2).split(","):
+                assignment_match = self.assignment_pattern.match(assignment)
+                if assignment_match is None:
+                    self.error_code = self.SYNTAX_ERROR
+                    return None
+                name, state = assignment_match.groups()
+                switch_id = self.names.query(name)
+                device = self.devices.get_device(switch_id)
+                if device is None or device.device_kind != \
+                        self.devices.SWITCH:
+                    self.error_code = self.NOT_A_SWITCH
+                    self.error_name = name
+                    return None
+                assignments.append((switch_id, int(state)))
+            return (cycle, assignments)
+        return None
+
+    def apply(self, cycle):
+        """Set the switches of every change up to the given cycle.
+
+        Return True if successful, or False if the file has an error.
+        """
+        while self.change is not None and self.change[0] <= cycle:
+            for switch_id, state in self.change[1]:
+                self.devices.set_switch(switch_id, state)
+            self.change = self.read_change()
+        return self.error_code == self.NO_ERROR
+
+    def get_error_message(self):
+        """Return a description of the error found, or None."""
+        if self.error_code == self.SYNTAX_ERROR:
+            message = ("Expected a cycle number, a colon and switch "
+                       "assignments such as SW1 = 1")
+        elif self.error_code == self.NOT_A_SWITCH:
+            message = f"{self.error_name} is not a switch"
+        elif self.error_code == self.CYCLE_ORDER:
+            message = "Cycle number is less than the one before"
+        else:
+            return None
+        return f"{self.path}, line {self.line_number}: {message}"
+
+    def close(self):
+        """Close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,86 @@
+"""Test the benchmarks package."""
+import pytest
+import json
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from benchmarks.generators import NetlistGenerator
+from benchmarks.run import BenchmarkRunner, main
+from benchmarks.scaling import ScalingBenchmark
+
+
+def build(text, tmp_path):
+    """Parse definition text and return the names, devices and network."""
+    file_path = tmp_path / "circuit.txt"
+    file_path.write_text(text)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner(str(file_path), names))
+    assert parser.parse_network()
+    return names, devices, network
+
+
+@pytest.mark.parametrize("method, args", [
+    ("ripple_adder", (16,)),
+    ("shift_register", (16,)),
+    ("random_dag", (300, 25, 4)),
+    ("clock_divider", (5,)),
+    ("nand_latches", (16,)),
+])
+def test_generated_circuits_settle(method, args, tmp_path):
+    """Test if every generated circuit parses and settles each cycle."""
+    text = getattr(NetlistGenerator(), method)(*args)
+    _, _, network = build(text, tmp_path)
+    for _ in range(10):
+        assert network.execute_network()
+
+
+def test_ripple_adder_sum(tmp_path):
+    """Test if the generated adder adds its operand switches."""
+    width = 12
+    names, devices, network = build(
+        NetlistGenerator().ripple_adder(width), tmp_path)
+    network.execute_network()
+
+    # Operand A is all ones, operand B has its odd bits set and carry in is 1
+    expected = (2 ** width - 1) + sum(2 ** bit for bit in
+                                      range(1, width, 2)) + 1
+    outputs = [f"G{bit}N7" for bit in range(width)] + [f"G{width - 1}N8"]
+    total = sum(2 ** bit for bit, name in enumerate(outputs)
+                if network.get_output_signal(names.query(name), None) ==
+                devices.HIGH)
+    assert total == expected
+
+
+def test_runner(tmp_path):
+    """Test if the runner times a circuit and writes the results."""
+    runner = BenchmarkRunner(cycles=3)
+    result = runner.time_circuit(
+        "nand_latches", 4, runner.generator.nand_latches(4))
+    assert result["devices"] == 16
+    assert result["connections"] == 16
+    assert result["settled"]
+    assert result["parse_seconds"] > 0
+    assert result["two_valued_simulate_seconds"] > 0
+
+    results_path = str(tmp_path / "results.json")
+    main(["-o", results_path, "-m", "1"])
+    with open(results_path) as results_file:
+        results = json.load(results_file)
+    assert len(results["results"]) == len(runner.get_suite())
+
+
+def test_scaling():
+    """Test if the scaling benchmark times each number of workers."""
+    benchmark = ScalingBenchmark(cycles=3, worker_counts=[1, 2])
+    result = benchmark.time_circuit(
+        "random_dag", 50, benchmark.generator.random_dag(50, 5, 2))
+    assert result["simulate_seconds"] > 0
+    assert sorted(result["worker_simulate_seconds"]) == ["1", "2"]
@@ -0,0 +1,146 @@
+"""Test the checks module."""
+import itertools
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from checks import StableCheck
+
+ADDER = """DEVICES X1:XOR, X2:XOR, A1:AND 2, A2:AND 2, O1:OR 2,
+        S1:SWITCH 1, S2:SWITCH 1, S3:SWITCH 0;
+CONNECT S1 > X1.I1, S1 > A1.I1, S2 > X1.I2, S2 > A1.I2, S3 > X2.I2,
+        S3 > A2.I2, X1 > X2.I1, X1 > A2.I1, A1 > O1.I1, A2 > O1.I2;
+MONITOR X2;
+"""
+
+
+def parse(tmp_path, text):
+    """Parse text and return the parser, names, devices and monitors."""
+    file_path = tmp_path / "checks.txt"
+    file_path.write_text(text)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner(str(file_path), names), print_errors=False)
+    parser.parse_network()
+    return parser, names, devices, monitors
+
+
+def run_all_inputs(names, devices, monitors):
+    """Simulate one cycle for each setting of switches S1, S2 and S3."""
+    switch_ids = names.lookup(["S1", "S2", "S3"])
+    for states in itertools.product([0, 1], repeat=3):
+        for switch_id, state in zip(switch_ids, states):
+            devices.set_switch(switch_id, state)
+        assert monitors.network.execute_network()
+        monitors.record_signals()
+
+
+def test_assertion_checks(tmp_path):
+    """Test if only the cycles in which a check fails are recorded."""
+    parser, names, devices, monitors = parse(
+        tmp_path, ADDER + "CHECK X2 = S1 XOR S2 XOR S3,\n"
+        "      O1 = S1 AND S2 OR (S3 AND (S1 XOR S2)),\n"
+        "      O1 = S1 AND S2;\nEND\n")
+    assert parser.error_count == 0
+    run_all_inputs(names, devices, monitors)
+
+    # the carry ignoring S3 is wrong for inputs 011 and 101
+    assert monitors.violation_counts == [0, 0, 2]
+    assert monitors.violations == [(3, 2), (5, 2)]
+    assert monitors.cycles_checked == 8
+
+    monitors.reset_monitors()
+    assert monitors.violation_counts == [0, 0, 0]
+    assert monitors.violations == []
+    assert monitors.cycles_checked == 0
+
+
+def test_get_text(tmp_path):
+    """Test if checks are written back as in the definition file."""
+    _, _, _, monitors = parse(
+        tmp_path, ADDER + "CHECK X2 = NOT (S1 XOR S2) NAND 1,\n"
+        "      O1 = S1 AND (S2 OR S3), X1 STABLE UNLESS S3;\nEND\n")
+    assert [check.get_text() for check in monitors.checks] == [
+        "X2 = NOT (S1 XOR S2) NAND 1", "O1 = S1 AND (S2 OR S3)",
+        "X1 STABLE UNLESS S3"]
+
+
+def test_stable_check(tmp_path):
+    """Test if a signal may only change when the clock signal rises."""
+    _, names, devices, monitors = parse(tmp_path, ADDER + "END\n")
+    [S1, S2] = names.lookup(["S1", "S2"])
+    check = StableCheck(devices, monitors.network, (S1, None), (S2, None))
+    # (S1, S2) in each cycle
+    states = [(0, 0), (1, 0), (1, 1), (0, 0), (1, 1), (1, 0), (0, 1),
+              (1, 1)]
+    violated = []
+    for data, clock in states:
+        devices.set_switch(S1, data)
+        devices.set_switch(S2, clock)
+        monitors.network.execute_network()
+        violated.append(check.is_violated())
+    assert violated == [False, True, False, True, False, False, False,
+                        True]
+
+    check.reset()
+    assert not check.is_violated()
+
+
+def test_max_violations(tmp_path):
+    """Test if failures past max_violations are only counted."""
+    _, names, devices, monitors = parse(
+        tmp_path, ADDER + "CHECK X2 = 0;\nEND\n")
+    monitors.max_violations = 2
+    for _ in range(3):
+        run_all_inputs(names, devices, monitors)
+    assert monitors.violation_counts == [12]
+    assert monitors.violations == [(1, 0), (2, 0)]
+
+
+def test_observed_signals(tmp_path):
+    """Test if checked signals are observed until the checks are removed."""
+    _, names, _, monitors = parse(
+        tmp_path, ADDER + "CHECK O1 = A1 OR A2;\nEND\n")
+    [X2, O1, A1, A2] = names.lookup(["X2", "O1", "A1", "A2"])
+    assert set(monitors.observed_signals) == {
+        (X2, None), (O1, None), (A1, None), (A2, None)}
+    assert monitors.network.find_unused_outputs(
+        monitors.observed_signals) == []
+
+    monitors.remove_checks()
+    assert monitors.checks == []
+    assert dict(monitors.observed_signals) == {(X2, None): 1}
+
+
+def test_display_violations(tmp_path, capsys):
+    """Test if failed checks are listed with their first cycle."""
+    _, names, devices, monitors = parse(
+        tmp_path, ADDER + "CHECK X2 = S1 XOR S2 XOR S3, X2 = S3;\nEND\n")
+    run_all_inputs(names, devices, monitors)
+    monitors.display_violations()
+    assert capsys.readouterr().out == (
+        "Check failed in 4 cycle/s, first in cycle 2: X2 = S3\n"
+        "1 of 2 checks passed in 8 cycles\n")
+
+
+@pytest.mark.parametrize("text, error", [
+    ("CHECK X2 S1;", "NO_CHECK_OPERATOR"),
+    ("CHECK X2 = S1 AND;", "NO_OPERAND"),
+    ("CHECK X2 = (S1 AND S2;", "NO_CLOSE_BRACKET"),
+    ("CHECK X2 STABLE S1;", "NO_UNLESS"),
+    ("CHECK X2 = 2;", "NOT_BIT"),
+    ("CHECK X2 = Z9;", "DEVICE_ABSENT")])
+def test_parser_check_errors(tmp_path, text, error):
+    """Test if errors in checks are reported and parsing continues."""
+    parser, _, _, monitors = parse(tmp_path, ADDER + text + "\nEND\n")
+    assert [diagnostic.code for diagnostic in parser.errors] == [
+        getattr(parser, error)]
+    assert monitors.checks == []
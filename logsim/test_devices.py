@@ -96,6 +96,9 @@ def test_make_device(new_devices):
     ("(D_ID, D_ID, None)", "new_devices.BAD_DEVICE"),
     ("(CL_ID, new_devices.CLOCK, 0)", "new_devices.INVALID_QUALIFIER"),
     ("(CL_ID, new_devices.CLOCK, 10)", "new_devices.NO_ERROR"),
+    ("(AND1_ID, new_devices.ADDER, None)", "new_devices.NO_QUALIFIER"),
+    ("(AND1_ID, new_devices.BUS, 65)", "new_devices.INVALID_QUALIFIER"),
+    ("(AND1_ID, new_devices.MUX, 64)", "new_devices.NO_ERROR"),
 
     # Note: XOR device X2_ID will have been made earlier in the function
     ("(X2_ID, new_devices.XOR)", "new_devices.DEVICE_PRESENT"),
@@ -115,6 +118,28 @@ def test_make_device_gives_errors(new_devices, function_args, error):
     assert left_expression == right_expression
 
 
+def test_make_word_device(new_devices):
+    """Test if word devices are made with the right ports."""
+    names = new_devices.names
+    [ADD_ID, REG_ID, A1, A2, B1, B2, S1, S2, D1, D2, Q1,
+     Q2] = names.lookup(["Add", "Reg", "A1", "A2", "B1", "B2", "S1", "S2",
+                         "D1", "D2", "Q1", "Q2"])
+    new_devices.make_device(ADD_ID, new_devices.ADDER, 2)
+    new_devices.make_device(REG_ID, new_devices.REGISTER, 2)
+
+    adder = new_devices.get_device(ADD_ID)
+    register = new_devices.get_device(REG_ID)
+
+    assert list(adder.inputs) == [A1, A2, B1, B2, new_devices.CIN_ID]
+    assert list(adder.outputs) == [S1, S2, new_devices.COUT_ID]
+    assert list(register.inputs) == [D1, D2, new_devices.CLK_ID]
+    assert list(register.outputs) == [Q1, Q2]
+
+    # Register memory is initially a random 2-bit word
+    assert register.register_memory in range(4)
+    assert new_devices.get_device_property(REG_ID) == 2
+
+
 def test_get_signal_name(devices_with_items):
     """Test if get_signal_name returns the correct signal name."""
     devices = devices_with_items
@@ -123,6 +148,12 @@ def test_get_signal_name(devices_with_items):
 
     assert devices.get_signal_name(AND1, I1) == "And1.I1"
     assert devices.get_signal_name(AND1, None) == "And1"
+    # names are cached, but invalid signals are still rejected
+    assert devices.signal_names[(AND1, I1)] == "And1.I1"
+    [I3] = names.lookup(["I3"])
+    assert devices.get_signal_name(AND1, I3) is None
+    devices.remove_device(AND1)
+    assert devices.get_signal_name(AND1, I1) is None
 
 
 def test_get_signal_ids(devices_with_items):
@@ -135,6 +166,46 @@ def test_get_signal_ids(devices_with_items):
     assert devices.get_signal_ids("And1") == [AND1, None]
 
 
+def test_find_output(devices_with_items):
+    """Test if the output index follows added and removed devices."""
+    devices = devices_with_items
+    names = devices.names
+    [AND1, SW1, D1] = names.lookup(["And1", "Sw1", "D1"])
+
+    assert devices.find_output("Sw1") == (SW1, None)
+    assert devices.find_output("And1.I1") is None  # inputs are not indexed
+    assert devices.find_output("Missing") is None
+    assert names.query("Missing") is None
+
+    devices.make_device(D1, devices.D_TYPE)
+    assert devices.find_output("D1.QBAR") == (D1, devices.QBAR_ID)
+    devices.remove_device(AND1)
+    assert devices.find_output("And1") is None
+
+    [CLK1] = names.lookup(["Clk1"])
+    devices.make_device(CLK1, devices.CLOCK, 2)
+    assert devices.find_output("Clk1") == (CLK1, None)
+    devices.cold_startup()
+    assert devices.find_output("Clk1") == (CLK1, None)
+    assert devices.remove_device(CLK1)
+    assert devices.find_output("Clk1") is None
+
+
+def test_find_output_names(devices_with_items):
+    """Test if the prefix search returns matching output names in order."""
+    devices = devices_with_items
+    [D1, CLK1] = devices.names.lookup(["D1", "Clk1"])
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(CLK1, devices.CLOCK, 2)
+
+    assert devices.find_output_names() == ["And1", "Clk1", "D1.Q", "D1.QBAR",
+                                           "Nor1", "Sw1"]
+    assert devices.find_output_names("C") == ["Clk1"]
+    assert devices.find_output_names("D1.Q") == ["D1.Q", "D1.QBAR"]
+    assert devices.find_output_names("N") == ["Nor1"]
+    assert devices.find_output_names("X") == []
+
+
 def test_set_switch(new_devices):
     """Test if set_switch changes the switch state correctly."""
     names = new_devices.names
@@ -148,3 +219,31 @@ def test_set_switch(new_devices):
     # Set switch Sw1 to LOW
     new_devices.set_switch(SW1_ID, new_devices.LOW)
     assert switch_object.switch_state == new_devices.LOW
+
+
+def test_remove_device(devices_with_items):
+    """Test if remove_device removes only the given device."""
+    devices = devices_with_items
+    names = devices.names
+    [AND1_ID, NOR1_ID, SW1_ID] = names.lookup(["And1", "Nor1", "Sw1"])
+
+    assert devices.remove_device(NOR1_ID)
+    assert devices.get_device(NOR1_ID) is None
+    assert devices.find_devices() == [AND1_ID, SW1_ID]
+
+    # Nor1 is no longer a device
+    assert not devices.remove_device(NOR1_ID)
+
+
+def test_get_device_property(devices_with_items):
+    """Test if get_device_property returns the property of each device."""
+    devices = devices_with_items
+    names = devices.names
+    [AND1_ID, NOR1_ID, SW1_ID, D_ID] = names.lookup(["And1", "Nor1", "Sw1",
+                                                     "D1"])
+    devices.make_device(D_ID, devices.D_TYPE)
+
+    assert devices.get_device_property(AND1_ID) == 2
+    assert devices.get_device_property(NOR1_ID) == 16
+    assert devices.get_device_property(SW1_ID) == devices.LOW
+    assert devices.get_device_property(D_ID) is None
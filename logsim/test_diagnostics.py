@@ -0,0 +1,71 @@
+"""Test the diagnostics module."""
+import pytest
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from diagnostics import Diagnostic
+
+
+@pytest.fixture
+def quiet_parser():
+    """Return a parser that does not print the errors in error file one."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_print_error_devices.txt")
+    scanner = Scanner(file_path, names)
+    return Parser(names, devices, network, monitors, scanner,
+                  print_errors=False)
+
+
+def test_no_output(quiet_parser, capsys):
+    """Test if the parser records errors without printing them."""
+    assert not quiet_parser.parse_network()
+    assert capsys.readouterr().out == ""
+    assert len(quiet_parser.errors) == quiet_parser.error_count == 12
+
+
+def test_lazy_excerpt(quiet_parser):
+    """Test if the excerpt is only read from the scanner when needed."""
+    quiet_parser.parse_network()
+    diagnostic = quiet_parser.errors[3]
+    assert diagnostic._excerpt is None
+
+    assert diagnostic.code == quiet_parser.NO_DEVICE_TYPE
+    assert diagnostic.excerpt == (
+        "        N1:NAD 2, # error as NAND is spelt incorrectly\n"
+        "           ^")
+    assert diagnostic._excerpt is not None
+
+
+def test_format_matches_printed(quiet_parser, capsys):
+    """Test if formatted diagnostics match what the parser prints."""
+    quiet_parser.parse_network()
+    formatted = "".join(diagnostic.format() + "\n"
+                        for diagnostic in quiet_parser.errors)
+    formatted += Diagnostic.format_summary(quiet_parser.error_count) + "\n"
+
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(quiet_parser.scanner.path, names)
+    Parser(names, devices, network, monitors, scanner).parse_network()
+    assert capsys.readouterr().out == formatted
+
+
+def test_unlocated():
+    """Test if a diagnostic without a location has no excerpt."""
+    diagnostic = Diagnostic(37, "Network connectivity issues found")
+    assert diagnostic.excerpt is None
+    assert diagnostic.format() == "Network connectivity issues found\n"
+    assert Diagnostic.format_summary(1, stopped=True) == \
+        "Summary: stopped after 1 error/s\n"
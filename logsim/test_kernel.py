@@ -0,0 +1,135 @@
+"""Test the kernel module."""
+import pytest
+import os
+import random
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from kernel import SimulationKernel
+from optimise import NetworkOptimiser
+
+DIRECTORY = os.path.dirname(__file__)
+
+
+@pytest.fixture
+def network_with_gates():
+    """Return a network with a NAND latch fed by two switches."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+
+    [SW1_ID, SW2_ID, N1_ID, N2_ID, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "N1", "N2", "I1", "I2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 1)
+    devices.make_device(SW2_ID, devices.SWITCH, 1)
+    devices.make_device(N1_ID, devices.NAND, 2)
+    devices.make_device(N2_ID, devices.NAND, 2)
+    network.make_connection(SW1_ID, None, N1_ID, I1)
+    network.make_connection(N2_ID, None, N1_ID, I2)
+    network.make_connection(SW2_ID, None, N2_ID, I1)
+    network.make_connection(N1_ID, None, N2_ID, I2)
+    return network
+
+
+def test_source(network_with_gates):
+    """Test if each gate is one line reading locals and switch outputs."""
+    devices = network_with_gates.devices
+    [N1_ID, N2_ID] = devices.names.lookup(["N1", "N2"])
+
+    kernel = SimulationKernel(devices, [N1_ID, N2_ID])
+    assert kernel.get_source().splitlines()[1:7] == [
+        "    s0 = d[0][None]",
+        "    s1 = d[1][None]",
+        "    e0 = d[2][None]",
+        "    e1 = d[3][None]",
+        "    s0 = U[s0][not (e0 == 1 and s1 == 1)]",
+        "    s1 = U[s1][not (e1 == 1 and s0 == 1)]"]
+
+
+def test_run(network_with_gates):
+    """Test if the kernel updates outputs like execute_gate."""
+    network = network_with_gates
+    devices = network.devices
+    [N1_ID, N2_ID] = devices.names.lookup(["N1", "N2"])
+    kernel = SimulationKernel(devices, [N1_ID, N2_ID])
+
+    # With both switches HIGH and both outputs LOW, both outputs start
+    # rising; N2 reads N1 as RISING, which is not HIGH
+    for device_id in [devices.names.query("Sw1"),
+                      devices.names.query("Sw2")]:
+        devices.get_device(device_id).outputs[None] = devices.HIGH
+    assert kernel.run()
+    assert network.get_output_signal(N1_ID, None) == devices.RISING
+    assert network.get_output_signal(N2_ID, None) == devices.RISING
+    assert kernel.run()
+    assert network.get_output_signal(N1_ID, None) == devices.HIGH
+    assert network.get_output_signal(N2_ID, None) == devices.FALLING
+    assert kernel.run()
+    assert not kernel.run()  # settled with N1 HIGH and N2 LOW
+    assert network.get_output_signal(N2_ID, None) == devices.LOW
+
+
+def test_code_cache(network_with_gates):
+    """Test if identical netlists share the compiled code."""
+    devices = network_with_gates.devices
+    gate_ids = devices.find_devices(devices.NAND)
+    SimulationKernel.code_cache.clear()
+    SimulationKernel(devices, gate_ids)
+    SimulationKernel(devices, gate_ids)
+    assert len(SimulationKernel.code_cache) == 1
+
+
+def test_unconnected_gate(network_with_gates):
+    """Test if an unconnected gate is left to execute_gate."""
+    network = network_with_gates
+    devices = network.devices
+    [N3_ID] = devices.names.lookup(["N3"])
+    network.set_kernel(True)
+    assert network.execute_network()
+    assert network.kernel is not None
+
+    devices.make_device(N3_ID, devices.NAND, 2)
+    assert not network.execute_network()
+    assert network.get_kernel([[N3_ID]]) is None
+
+
+def run(file_path, use_kernel, optimise=False):
+    """Return the monitor traces of a run toggling every switch."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    network.set_kernel(use_kernel)
+    if optimise:
+        network.set_optimiser(NetworkOptimiser(devices, network, monitors))
+
+    random.seed(0)
+    devices.cold_startup()
+    switch_ids = devices.find_devices(devices.SWITCH)
+    for cycle in range(30):
+        if cycle % 10 == 9:
+            for switch_id in switch_ids:
+                state = devices.get_device(switch_id).switch_state
+                devices.set_switch(switch_id, 1 - state)
+        assert network.execute_network()
+        monitors.record_signals()
+    return monitors.monitors_dictionary
+
+
+@pytest.mark.parametrize("file_name", [
+    "flip_flop.txt", "full_adder.txt", "word_adder.txt",
+    os.path.join("test_parser", "test_flip_flop.txt"),
+    os.path.join("test_parser", "test_modules.txt")])
+def test_same_traces(file_name):
+    """Test if runs with the kernel record the same signals."""
+    file_path = os.path.join(DIRECTORY, file_name)
+    expected = run(file_path, False)
+    assert run(file_path, True) == expected
+    assert run(file_path, True, optimise=True) == expected
@@ -80,13 +80,33 @@ def test_get_signal_names(new_monitors):
     """Test if get_signal_names returns the correct signal name lists."""
     names = new_monitors.names
     devices = new_monitors.devices
-    [D_ID] = names.lookup(["D1"])
+    [D_ID, CLK_ID] = names.lookup(["D1", "Clk1"])
 
-    # Create a D-type device
+    # Create a D-type device and a clock
     devices.make_device(D_ID, devices.D_TYPE)
+    devices.make_device(CLK_ID, devices.CLOCK, 2)
 
     assert new_monitors.get_signal_names() == [["Sw1", "Sw2", "Or1"],
-                                               ["D1.Q", "D1.QBAR"]]
+                                               ["D1.Q", "D1.QBAR", "Clk1"]]
+
+
+def test_search_signal_names(new_monitors):
+    """Test if monitored signals are found by name and by prefix."""
+    names = new_monitors.names
+    devices = new_monitors.devices
+    [SW1_ID, D_ID, CLK_ID] = names.lookup(["Sw1", "D1", "Clk1"])
+    devices.make_device(D_ID, devices.D_TYPE)
+    devices.make_device(CLK_ID, devices.CLOCK, 2)
+
+    assert new_monitors.search_signal_names("C") == ["Clk1"]
+    assert new_monitors.make_monitor(CLK_ID, None) == new_monitors.NO_ERROR
+    assert new_monitors.find_monitor("Clk1") == (CLK_ID, None)
+    new_monitors.remove_monitor(CLK_ID, None)
+    assert new_monitors.find_monitor("Sw1") == (SW1_ID, None)
+    assert new_monitors.find_monitor("D1.Q") is None
+    assert new_monitors.search_signal_names("S", monitored=True) == ["Sw1",
+                                                                     "Sw2"]
+    assert new_monitors.search_signal_names() == ["Clk1", "D1.Q", "D1.QBAR"]
 
 
 def test_record_signals(new_monitors):
@@ -197,3 +217,58 @@ def test_display_signals(capsys, new_monitors):
             "Clock1: -__--__--__--__--__-" in traces)
 
     assert "" in traces  # additional empty line at the end
+
+
+def test_set_pruning():
+    """Test if only the devices the monitors depend on are simulated."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [SW1_ID, SW2_ID, A1_ID, N1_ID, D1_ID, CLK_ID, I1,
+     I2] = names.lookup(["Sw1", "Sw2", "A1", "N1", "D1", "Clk", "I1", "I2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(SW2_ID, devices.SWITCH, 0)
+    devices.make_device(A1_ID, devices.AND, 2)
+    devices.make_device(N1_ID, devices.NAND, 2)
+    devices.make_device(D1_ID, devices.D_TYPE)
+    devices.make_device(CLK_ID, devices.CLOCK, 1)
+    for gate_id in [A1_ID, N1_ID]:
+        network.make_connection(SW1_ID, None, gate_id, I1)
+        network.make_connection(SW2_ID, None, gate_id, I2)
+    # D1 toggles through the feedback from QBAR
+    network.make_connection(D1_ID, devices.QBAR_ID, D1_ID, devices.DATA_ID)
+    network.make_connection(CLK_ID, None, D1_ID, devices.CLK_ID)
+    network.make_connection(SW1_ID, None, D1_ID, devices.SET_ID)
+    network.make_connection(SW1_ID, None, D1_ID, devices.CLEAR_ID)
+
+    monitors.make_monitor(A1_ID, None)
+    monitors.set_pruning(True)
+    network.set_two_valued(False)  # keep A1 in the settle loop
+    assert network.execute_network()
+    assert network.find_active_devices(devices.SWITCH) == [SW1_ID, SW2_ID]
+    assert network.find_active_devices(devices.AND) == [A1_ID]
+    assert network.find_active_devices(devices.NAND) == []
+    assert network.find_active_devices(devices.D_TYPE) == []
+
+    # N1 is outside the cone and keeps its output
+    devices.set_switch(SW1_ID, devices.HIGH)
+    devices.set_switch(SW2_ID, devices.HIGH)
+    n1_signal = network.get_output_signal(N1_ID, None)
+    assert network.execute_network()
+    assert network.get_output_signal(A1_ID, None) == devices.HIGH
+    assert network.get_output_signal(N1_ID, None) == n1_signal
+
+    # Monitoring D1 adds it, its clock and the feedback to the cone
+    monitors.make_monitor(D1_ID, devices.Q_ID)
+    assert network.execute_network()
+    assert network.find_active_devices(devices.D_TYPE) == [D1_ID]
+    assert network.find_active_devices(devices.CLOCK) == [CLK_ID]
+
+    monitors.remove_monitor(A1_ID, None)
+    assert network.find_active_devices(devices.AND) == []
+
+    monitors.set_pruning(False)
+    assert network.execute_network()
+    assert network.get_output_signal(N1_ID, None) == devices.LOW
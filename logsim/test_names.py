@@ -134,3 +134,23 @@ def test_get_name_string_nonexistent(adder):
 
     # assert the id of every name
     assert my_names.get_name_string(nonexistent_idx) is None
+
+
+def test_lookup_batch(empty):
+    # a batch with repeated and known names
+    empty.lookup(["A1", "A2"])
+    idx_list = empty.lookup(["B1", "A2", "B1", "B2", "A1"])
+
+    assert idx_list == [2, 1, 2, 3, 0]
+    assert empty.num_items == 4
+    assert empty.get_name_strings([0, 1, 2, 3, 4]) == ["A1", "A2", "B1",
+                                                       "B2", None]
+
+
+def test_intern(adder):
+    (my_names, names_list, _) = adder
+
+    assert my_names.intern("X2") == 1
+    assert my_names.intern("D1") == len(names_list)
+    assert my_names.lookup(["D1"]) == [len(names_list)]
+    assert my_names.get_name_string("X1") is None
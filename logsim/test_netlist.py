@@ -0,0 +1,89 @@
+"""Test the netlist module."""
+import pytest
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from netlist import NetlistFile
+
+
+def new_simulator():
+    """Return new instances of the four inner simulator classes."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    return names, devices, network, monitors
+
+
+@pytest.fixture
+def flip_flop_netlist(tmp_path):
+    """Return the parsed flip-flop circuit and the path of its netlist."""
+    names, devices, network, monitors = new_simulator()
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_flip_flop.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+
+    netlist_path = str(tmp_path / "flip_flop.lsn")
+    NetlistFile(names, devices, network, monitors).save(netlist_path)
+
+    return (names, devices, network, monitors), netlist_path
+
+
+def test_is_netlist_file(flip_flop_netlist):
+    """Test if netlist files are told apart from definition files."""
+    _, netlist_path = flip_flop_netlist
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_flip_flop.txt")
+
+    assert NetlistFile.is_netlist_file(netlist_path)
+    assert not NetlistFile.is_netlist_file(file_path)
+
+
+def test_save_and_load(flip_flop_netlist):
+    """Test if a loaded netlist matches the network it was saved from."""
+    (names, devices, network, monitors), netlist_path = flip_flop_netlist
+
+    new_names, new_devices, new_network, new_monitors = new_simulator()
+    NetlistFile(new_names, new_devices, new_network,
+                new_monitors).load(netlist_path)
+
+    assert new_names.num_items == names.num_items
+    assert new_devices.find_devices() == devices.find_devices()
+    for device in devices.devices_list:
+        new_device = new_devices.get_device(device.device_id)
+        assert new_device.device_kind == device.device_kind
+        assert new_device.inputs == device.inputs
+        assert new_device.outputs.keys() == device.outputs.keys()
+        assert new_device.switch_state == device.switch_state
+        assert new_device.clock_half_period == device.clock_half_period
+
+    assert list(new_monitors.monitors_dictionary) == \
+        list(monitors.monitors_dictionary)
+    assert new_network.check_network()
+
+
+def test_load_gives_errors(flip_flop_netlist, tmp_path):
+    """Test if load rejects corrupt and mismatched netlist files."""
+    _, netlist_path = flip_flop_netlist
+
+    # Truncated file
+    with open(netlist_path, "rb") as netlist:
+        data = netlist.read()
+    truncated_path = str(tmp_path / "truncated.lsn")
+    with open(truncated_path, "wb") as netlist:
+        netlist.write(data[:len(data) - 8])
+    with pytest.raises(ValueError):
+        NetlistFile(*new_simulator()).load(truncated_path)
+
+    # Names already defined that do not match the stored names
+    names, devices, network, monitors = new_simulator()
+    names.lookup(["Extra"])
+    with pytest.raises(ValueError):
+        NetlistFile(names, devices, network, monitors).load(netlist_path)
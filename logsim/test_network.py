@@ -1,9 +1,15 @@
 """Test the network module."""
 import pytest
+import os
+import random
 
 from names import Names
 from devices import Devices
 from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from benchmarks.generators import NetlistGenerator
 
 
 @pytest.fixture
@@ -115,6 +121,51 @@ def test_check_network(network_with_devices):
     assert network.check_network()
 
 
+def test_find_unconnected_inputs(network_with_devices):
+    """Test if every unconnected input and unused output is found."""
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(["Sw1", "Sw2", "Or1", "I1",
+                                                     "I2"])
+
+    assert network.find_unconnected_inputs() == [(OR1_ID, I1), (OR1_ID, I2)]
+    assert network.find_unused_outputs() == [
+        (SW1_ID, None), (SW2_ID, None), (OR1_ID, None)]
+
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    assert network.find_unconnected_inputs() == [(OR1_ID, I2)]
+    assert network.find_unused_outputs([(OR1_ID, None)]) == [(SW2_ID, None)]
+
+
+def test_get_fanout(network_with_devices):
+    """Test if the fan-out index follows connections made and removed."""
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(["Sw1", "Sw2", "Or1", "I1",
+                                                     "I2"])
+
+    assert network.get_fanout(SW1_ID, None) == []
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    network.make_connection(OR1_ID, I2, SW1_ID, None)
+    assert network.get_fanout(SW1_ID, None) == [(OR1_ID, I1), (OR1_ID, I2)]
+    assert network.get_fanout_devices(SW1_ID) == {OR1_ID}
+    assert network.get_fanout_devices(SW2_ID) == set()
+    assert network.get_fanout_devices(I1) is None
+
+    # Failed connections are not indexed
+    network.make_connection(SW2_ID, None, OR1_ID, I1)
+    assert network.get_fanout(SW2_ID, None) == []
+
+    assert network.remove_connection(OR1_ID, I1)
+    assert network.get_fanout(SW1_ID, None) == [(OR1_ID, I2)]
+    assert network.remove_connection(OR1_ID, I2)
+    assert network.fanouts == {}
+
+
 def test_make_connection(network_with_devices):
     """Test if the make_connection function correctly connects devices."""
     network = network_with_devices
@@ -139,6 +190,23 @@ def test_make_connection(network_with_devices):
                           I2: (SW2_ID, None)}
 
 
+def test_remove_connection(network_with_devices):
+    """Test if remove_connection disconnects the given input."""
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, OR1_ID, I1, I2] = names.lookup(["Sw1", "Or1", "I1", "I2"])
+
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    assert network.remove_connection(OR1_ID, I1)
+    assert network.get_connected_output(OR1_ID, I1) is None
+
+    # Unconnected inputs cannot be disconnected
+    assert not network.remove_connection(OR1_ID, I2)
+    assert not network.remove_connection(OR1_ID, I1)
+
+
 @pytest.mark.parametrize("function_args, error", [
     # I1 is not a valid device id
     ("(I1, I1, OR1_ID, I2)", "network.DEVICE_ABSENT"),
@@ -334,6 +402,57 @@ def test_execute_non_gates(new_network):
                 HIGH, LOW, HIGH, HIGH, LOW, HIGH]
 
 
+def test_execute_word_devices(new_network):
+    """Test if execute_network evaluates ADDER, MUX and BUS devices."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    LOW = devices.LOW
+    HIGH = devices.HIGH
+
+    [ADD_ID, MUX_ID, BUS_ID, SW1_ID, SW0_ID, A1, A2, B1, B2, S1, S2, O1,
+     O2, I1, I2] = names.lookup(["Add", "Mux", "Bus", "Sw1", "Sw0", "A1",
+                                 "A2", "B1", "B2", "S1", "S2", "O1", "O2",
+                                 "I1", "I2"])
+    devices.make_device(ADD_ID, devices.ADDER, 2)
+    devices.make_device(MUX_ID, devices.MUX, 2)
+    devices.make_device(BUS_ID, devices.BUS, 2)
+    devices.make_device(SW1_ID, devices.SWITCH, 1)
+    devices.make_device(SW0_ID, devices.SWITCH, 0)
+
+    # 3 + 1 + carry in 1 = 5
+    for input_id in [A1, A2, B1, devices.CIN_ID]:
+        network.make_connection(SW1_ID, None, ADD_ID, input_id)
+    network.make_connection(SW0_ID, None, ADD_ID, B2)
+
+    # The mux selects A = (S1, S2) while SEL is LOW
+    network.make_connection(ADD_ID, S1, MUX_ID, A1)
+    network.make_connection(ADD_ID, S2, MUX_ID, A2)
+    network.make_connection(SW0_ID, None, MUX_ID, B1)
+    network.make_connection(SW0_ID, None, MUX_ID, B2)
+    network.make_connection(SW0_ID, None, MUX_ID, devices.SEL_ID)
+    network.make_connection(MUX_ID, O1, BUS_ID, I1)
+    network.make_connection(MUX_ID, O2, BUS_ID, I2)
+
+    assert network.execute_network()
+    assert [network.get_output_signal(ADD_ID, S1),
+            network.get_output_signal(ADD_ID, S2),
+            network.get_output_signal(ADD_ID, devices.COUT_ID)] == [
+                HIGH, LOW, HIGH]
+    assert [network.get_output_signal(BUS_ID, O1),
+            network.get_output_signal(BUS_ID, O2)] == [HIGH, LOW]
+
+    # Select B, which is all LOW
+    devices.make_device(names.lookup(["Sel"])[0], devices.SWITCH, 1)
+    network.remove_connection(MUX_ID, devices.SEL_ID)
+    network.make_connection(names.lookup(["Sel"])[0], None, MUX_ID,
+                            devices.SEL_ID)
+    assert network.execute_network()
+    assert [network.get_output_signal(BUS_ID, O1),
+            network.get_output_signal(BUS_ID, O2)] == [LOW, LOW]
+
+
 def test_oscillating_network(new_network):
     """Test if the execute_network returns False for oscillating networks."""
     network = new_network
@@ -348,3 +467,127 @@ def test_oscillating_network(new_network):
     network.make_connection(NOR1, None, NOR1, I1)
 
     assert not network.execute_network()
+
+
+def test_find_two_valued_gates(new_network):
+    """Test if only gates outside loops that feed no D-type are found."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1, G1, G2, G3, N1, N2, D1, I1, I2] = names.lookup(
+        ["Sw1", "G1", "G2", "G3", "N1", "N2", "D1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    for gate_id in [G1, G2, G3]:
+        devices.make_device(gate_id, devices.AND, 1)
+    devices.make_device(N1, devices.NAND, 2)
+    devices.make_device(N2, devices.NAND, 2)
+    devices.make_device(D1, devices.D_TYPE)
+    # Sw1 > G1 > G2, G1 > D1 through G3, and a NAND latch N1, N2
+    network.make_connection(SW1, None, G1, I1)
+    network.make_connection(G1, None, G2, I1)
+    network.make_connection(G1, None, G3, I1)
+    for input_id in devices.dtype_input_ids:
+        network.make_connection(G3, None, D1, input_id)
+    network.make_connection(SW1, None, N1, I1)
+    network.make_connection(N2, None, N1, I2)
+    network.make_connection(SW1, None, N2, I1)
+    network.make_connection(N1, None, N2, I2)
+
+    gates = network.find_two_valued_gates(
+        set(devices.find_devices(devices.AND) +
+            devices.find_devices(devices.NAND)))
+    assert [device.device_id for device, _, _, _, _ in gates] == [G2]
+
+    # Without the D-type, G1 is found before the gates it drives
+    for input_id in devices.dtype_input_ids:
+        network.remove_connection(D1, input_id)
+    gates = network.find_two_valued_gates({G1, G2, G3, N1, N2})
+    gate_ids = [device.device_id for device, _, _, _, _ in gates]
+    assert sorted(gate_ids) == [G1, G2, G3]
+    assert gate_ids[0] == G1
+
+
+def test_find_gate_clusters():
+    """Test if the full adder is looked up as one cluster of 3 inputs."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(os.path.join(os.path.dirname(__file__),
+                                   "full_adder.txt"), names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    network.execute_network()
+    gates = network.two_valued_gates
+    assert len(gates) == 6
+
+    steps = network.find_gate_clusters(gates, None)
+    assert steps == [(None, gate) for gate in gates]
+
+    # Three switches drive all six gates
+    [(cluster, gate)] = network.find_gate_clusters(gates, 3)
+    assert gate is None
+    assert cluster.gates == [device for device, _, _, _, _ in gates]
+    assert len(cluster.inputs) == 3
+
+    # With two inputs, only gates reading two signals are combined
+    steps = network.find_gate_clusters(gates, 2)
+    cluster_gates = [[device.device_id for device in cluster.gates]
+                     for cluster, _ in steps if cluster is not None]
+    [X1, X2, A1, A2, O1] = names.lookup(["X1", "X2", "A1", "A2", "O1"])
+    assert [A1, X1, A2] not in cluster_gates
+    for gate_ids in cluster_gates:
+        assert len(gate_ids) > 1
+    assert sum(len(gate_ids) for gate_ids in cluster_gates) + \
+        sum(1 for cluster, _ in steps if cluster is None) == 6
+
+
+def run_circuit(file_path, two_valued, table_inputs=None, workers=None):
+    """Return the monitor traces of a run toggling switches at random."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    network.set_two_valued(two_valued)
+    network.set_truth_tables(table_inputs)
+    network.set_workers(workers)
+    for device_id, output_id in network.find_unused_outputs():
+        monitors.make_monitor(device_id, output_id)
+
+    random.seed(0)
+    devices.cold_startup()
+    switch_ids = devices.find_devices(devices.SWITCH)
+    for cycle in range(30):
+        if cycle % 5 == 4:
+            for switch_id in switch_ids:
+                devices.set_switch(switch_id, random.randint(0, 1))
+        assert network.execute_network()
+        monitors.record_signals()
+    network.set_workers(None)
+    return monitors.monitors_dictionary
+
+
+@pytest.mark.parametrize("circuit", [
+    "full_adder.txt", "flip_flop.txt", "word_adder.txt",
+    "ripple_adder", "random_dag", "nand_latches", "shift_register"])
+def test_two_valued_same_traces(circuit, tmp_path):
+    """Test if two-valued gates record the same signals."""
+    generator = NetlistGenerator()
+    circuits = {"ripple_adder": generator.ripple_adder(8),
+                "random_dag": generator.random_dag(200, depth=10, fan_in=3),
+                "nand_latches": generator.nand_latches(8),
+                "shift_register": generator.shift_register(8)}
+    if circuit in circuits:
+        file_path = str(tmp_path / (circuit + ".txt"))
+        generator.write(circuits[circuit], file_path)
+    else:
+        file_path = os.path.join(os.path.dirname(__file__), circuit)
+    expected = run_circuit(file_path, False)
+    assert run_circuit(file_path, True) == expected
+    assert run_circuit(file_path, True, 3) == expected
+    assert run_circuit(file_path, True, 6) == expected
+    assert run_circuit(file_path, True, workers=2) == expected
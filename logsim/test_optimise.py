@@ -0,0 +1,140 @@
+"""Test the optimise module."""
+import pytest
+import os
+import random
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from optimise import NetworkOptimiser
+
+DIRECTORY = os.path.dirname(__file__)
+
+
+def build(file_path, optimise):
+    """Return the devices, network and monitors built from file_path."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    if optimise:
+        network.set_optimiser(NetworkOptimiser(devices, network, monitors))
+    return devices, network, monitors
+
+
+def run(file_path, optimise):
+    """Return the monitor traces of a run toggling every switch."""
+    devices, network, monitors = build(file_path, optimise)
+    random.seed(0)
+    devices.cold_startup()
+    switch_ids = devices.find_devices(devices.SWITCH)
+    for cycle in range(30):
+        if cycle % 10 == 9:
+            for switch_id in switch_ids:
+                state = devices.get_device(switch_id).switch_state
+                devices.set_switch(switch_id, 1 - state)
+        assert network.execute_network()
+        monitors.record_signals()
+    return monitors.monitors_dictionary
+
+
+@pytest.fixture
+def optimised_gates():
+    """Return a network of gates fed by two switches, with an optimiser."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [SW1_ID, SW2_ID, A1_ID, O1_ID, X1_ID, N1_ID, I1,
+     I2] = names.lookup(["Sw1", "Sw2", "A1", "O1", "X1", "N1", "I1", "I2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(SW2_ID, devices.SWITCH, 1)
+    devices.make_device(A1_ID, devices.AND, 2)
+    devices.make_device(O1_ID, devices.OR, 2)
+    devices.make_device(X1_ID, devices.XOR)
+    devices.make_device(N1_ID, devices.NAND, 1)
+    # A1 = Sw1 AND Sw2, O1 = A1 OR Sw2, X1 = A1 XOR O1, N1 = NOT Sw2
+    network.make_connection(SW1_ID, None, A1_ID, I1)
+    network.make_connection(SW2_ID, None, A1_ID, I2)
+    network.make_connection(A1_ID, None, O1_ID, I1)
+    network.make_connection(SW2_ID, None, O1_ID, I2)
+    network.make_connection(A1_ID, None, X1_ID, I1)
+    network.make_connection(O1_ID, None, X1_ID, I2)
+    network.make_connection(SW2_ID, None, N1_ID, I1)
+    monitors.make_monitor(X1_ID, None)
+
+    optimiser = NetworkOptimiser(devices, network, monitors)
+    network.set_optimiser(optimiser)
+    return optimiser
+
+
+def test_find_constants(optimised_gates):
+    """Test if switch states are folded through the gates."""
+    optimiser = optimised_gates
+    devices = optimiser.devices
+    [SW1_ID, SW2_ID, A1_ID, O1_ID, X1_ID, N1_ID] = devices.names.lookup(
+        ["Sw1", "Sw2", "A1", "O1", "X1", "N1"])
+
+    assert optimiser.find_constants() == {
+        SW1_ID: devices.LOW, SW2_ID: devices.HIGH, A1_ID: devices.LOW,
+        O1_ID: devices.HIGH, X1_ID: devices.HIGH, N1_ID: devices.LOW}
+
+    # Only the monitored XOR needs updating; N1 is dead
+    skipped, constants = optimiser.optimise()
+    assert skipped == {A1_ID, O1_ID, X1_ID, N1_ID}
+    assert constants == {X1_ID: devices.HIGH}
+
+
+def test_toggle_folded_switch(optimised_gates):
+    """Test if toggling a folded switch folds the gates again."""
+    optimiser = optimised_gates
+    devices = optimiser.devices
+    network = optimiser.network
+    [SW1_ID, SW2_ID, X1_ID] = devices.names.lookup(["Sw1", "Sw2", "X1"])
+
+    for _ in range(2):
+        assert network.execute_network()
+    assert not optimiser.has_changed()
+    assert network.get_output_signal(X1_ID, None) == devices.HIGH
+    assert network.find_active_devices(devices.AND) == []
+
+    devices.set_switch(SW1_ID, devices.HIGH)
+    assert optimiser.has_changed()
+    for _ in range(2):
+        assert network.execute_network()
+    # A1 and O1 are HIGH, so X1 is LOW
+    assert network.get_output_signal(X1_ID, None) == devices.LOW
+    assert not optimiser.has_changed()
+
+
+def test_monitor_dead_gate(optimised_gates):
+    """Test if monitoring a dead gate executes it again."""
+    optimiser = optimised_gates
+    devices = optimiser.devices
+    network = optimiser.network
+    [SW2_ID, N1_ID] = devices.names.lookup(["Sw2", "N1"])
+    monitors = optimiser.monitors
+
+    assert network.execute_network()
+    monitors.make_monitor(N1_ID, None)
+    devices.set_switch(SW2_ID, devices.LOW)
+    for _ in range(2):
+        assert network.execute_network()
+    assert network.get_output_signal(N1_ID, None) == devices.HIGH
+
+
+@pytest.mark.parametrize("file_name", [
+    "flip_flop.txt", "full_adder.txt", "word_adder.txt",
+    os.path.join("test_parser", "test_flip_flop.txt"),
+    os.path.join("test_parser", "test_modules.txt")])
+def test_same_traces(file_name):
+    """Test if optimised runs record the same signals."""
+    file_path = os.path.join(DIRECTORY, file_name)
+    assert run(file_path, True) == run(file_path, False)
@@ -0,0 +1,84 @@
+"""Test the parallelscan module."""
+import pytest
+import glob
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from parallelscan import ParallelScanner
+from benchmarks.generators import NetlistGenerator
+
+DIRECTORY = os.path.dirname(__file__)
+
+
+def parse_file(capsys, file_path, make_scanner):
+    """Parse a file and return the result, the output and the network."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = make_scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    result = parser.parse_network()
+    output = capsys.readouterr().out
+
+    connections = sorted(
+        (device.device_id, input_id, output)
+        for device in devices.devices_list
+        for input_id, output in device.inputs.items())
+    return (result, output, names.names_list, devices.find_devices(),
+            connections, list(monitors.monitors_dictionary))
+
+
+def make_chunk_scanner(file_path, names):
+    """Return a scanner splitting the file into chunks of a few lines."""
+    return ParallelScanner(file_path, names, processes=2, chunk_size=40)
+
+
+@pytest.mark.parametrize("file_path", sorted(
+    glob.glob(os.path.join(DIRECTORY, "*.txt")) +
+    glob.glob(os.path.join(DIRECTORY, "test_parser", "*.txt"))))
+def test_same_as_sequential(capsys, file_path):
+    """Test if parsing in chunks gives the same network and errors."""
+    assert parse_file(capsys, file_path, make_chunk_scanner) == \
+        parse_file(capsys, file_path, Scanner)
+
+
+def test_split_text(tmp_path):
+    """Test if chunks start at line starts outside block comments."""
+    file_path = tmp_path / "comments.txt"
+    text = ("DEVICES A:AND 2, /* a comment\n"
+            "over lines */ B:AND 2;\n"
+            "# /* not a block comment\n"
+            "END\n")
+    file_path.write_text(text)
+    scanner = ParallelScanner(str(file_path), Names(), processes=20,
+                              chunk_size=5)
+
+    starts = scanner.split_text(text)
+    assert starts == [0, text.index("over") + 23, text.index("END")]
+    assert [symbol[1] for symbol in scanner.symbols] == [
+        "DEVICES", "A", None, "AND", 2, None, "B", None, "AND", 2, None,
+        "END", None, None]
+
+
+def test_large_file(capsys, tmp_path):
+    """Test if a generated circuit parses the same in several chunks."""
+    file_path = tmp_path / "adder.txt"
+    generator = NetlistGenerator()
+    generator.write(generator.ripple_adder(64), str(file_path))
+
+    def make_scanner(file_path, names):
+        scanner = ParallelScanner(file_path, names, processes=4,
+                                  chunk_size=1000)
+        # one chunk per process
+        assert len(scanner.split_text(open(file_path).read())) == 4
+        return scanner
+
+    result = parse_file(capsys, str(file_path), make_scanner)
+    assert result[0]
+    assert result == parse_file(capsys, str(file_path), Scanner)
@@ -256,17 +256,17 @@ def test_parser_error_devices(parser_with_error_devices, capsys):
 
     # Check for expected error messages
     expected_errors = [
-        "Expected DEVICES, CONNECT, MONITOR or END",
+        "Expected DEVICES, CONNECT, MONITOR, CHECK or END",
         "Expected a semicolon prior to this",
         "Did not expect a parameter",
         "Expected a device type",
         "Expected a number",
         "Expected a bit (0 or 1)",
         "Expected a comma or semicolon",
-        "Expected DEVICES, CONNECT, MONITOR or END",
+        "Expected DEVICES, CONNECT, MONITOR, CHECK or END",
         "Expected a semicolon prior to this",
         "Device not found",
-        "Expected DEVICES, CONNECT, MONITOR or END",
+        "Expected DEVICES, CONNECT, MONITOR, CHECK or END",
         "Expected 'END' keyword before end of file"
     ]
 
@@ -567,3 +567,213 @@ def test_parser_closed_comment_error(parser_with_closed_comments_error,
     assert parser.error_count == len(expected_errors)
     assert parser.error_count == len(expected_lines)
     assert parser.error_count == len(expected_indications)
+
+
+def test_parser_word_devices():
+    """Test if the parser builds BUS, ADDER, MUX and REGISTER devices."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_word_devices.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+
+    assert parser.parse_network()
+
+    [A_ID, R_ID, M_ID, B_ID, S1_ID, S2_ID, O1_ID,
+     O2_ID] = names.lookup(["A", "R", "M", "B", "S1", "S2", "O1", "O2"])
+    assert devices.get_device(A_ID).device_kind == devices.ADDER
+    assert devices.get_device(R_ID).device_kind == devices.REGISTER
+    assert devices.get_device(M_ID).device_kind == devices.MUX
+    assert devices.get_device(B_ID).device_kind == devices.BUS
+    assert network.get_connected_output(R_ID, devices.CLK_ID) is not None
+
+    # 1 + 3 = 4, so only the carry out is HIGH
+    network.execute_network()
+    assert [network.get_output_signal(A_ID, S1_ID),
+            network.get_output_signal(A_ID, S2_ID),
+            network.get_output_signal(A_ID, devices.COUT_ID)] == [
+                devices.LOW, devices.LOW, devices.HIGH]
+
+    # The mux selects the register, which stores 0 once a clock edge has
+    # followed the first cycle
+    for _ in range(3):
+        network.execute_network()
+    assert [network.get_output_signal(B_ID, O1_ID),
+            network.get_output_signal(B_ID, O2_ID)] == [
+                devices.LOW, devices.LOW]
+
+
+def test_parser_modules():
+    """Test if module instances are flattened into the network."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_modules.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+
+    assert parser.parse_network()
+
+    # Two full adders, each made of two half adders and an OR gate
+    flattened_names = [names.get_name_string(device_id) for device_id in
+                       devices.find_devices()]
+    assert len(flattened_names) == 15
+    assert "F2_H1_X" in flattened_names
+    assert devices.get_device(names.query("F1_G")).device_kind == devices.OR
+
+    # The instance input port F1.A drives both half adder gates
+    [F1_H1_X, F1_H1_G, A1, I1] = names.lookup(["F1_H1_X", "F1_H1_G", "A1",
+                                               "I1"])
+    assert network.get_connected_output(F1_H1_X, I1) == (A1, None)
+    assert network.get_connected_output(F1_H1_G, I1) == (A1, None)
+
+    # 1 + 3 = 4, so only the carry out is HIGH
+    network.execute_network()
+    monitors.record_signals()
+    assert list(monitors.monitors_dictionary.values()) == [
+        [devices.LOW], [devices.LOW], [devices.HIGH]]
+
+
+def test_parser_module_errors(capsys):
+    """Test if the parser reports errors in module definitions."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_module_errors.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+
+    assert not parser.parse_network()
+    output = capsys.readouterr().out
+
+    expected_errors = [
+        ("Module has already been defined", "LINE 6:"),
+        ("Module has unconnected inputs or outputs", "LINE 12:"),
+        ("Invalid use of module port", "LINE 16:"),
+        ("Input has already been connected", "LINE 19:"),
+        ("Invalid port number", "LINE 20:")
+    ]
+    for error, line in expected_errors:
+        assert error + "\n" + line in output
+    assert parser.error_count == len(expected_errors)
+
+
+def test_parser_error_records(parser_with_error_devices, capsys):
+    """Test if every printed error is recorded with its line."""
+    parser = parser_with_error_devices
+
+    assert not parser.parse_network()
+    capsys.readouterr()
+
+    assert len(parser.errors) == parser.error_count
+    assert not parser.stopped
+    diagnostic = parser.errors[0]
+    assert diagnostic.code == parser.NO_INITIALISATION_KEYWORD
+    assert diagnostic.message == "Expected DEVICES, CONNECT, MONITOR, CHECK or END"
+    assert (diagnostic.line_number, diagnostic.position) == (7, 1)
+    assert [error.line_number for error in parser.errors] == [
+        7, 9, 10, 11, 12, 13, 15, 18, 32, 33, 36, 36]
+
+
+@pytest.mark.parametrize("max_errors", [1, 2, 5])
+def test_parser_max_errors(capsys, max_errors):
+    """Test if parsing stops once max_errors errors are found."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_print_error_devices.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner, max_errors)
+
+    assert not parser.parse_network()
+    output = capsys.readouterr().out
+
+    assert parser.stopped
+    assert parser.error_count == len(parser.errors) == max_errors
+    assert output.count("LINE ") == max_errors
+    assert f"Summary: stopped after {max_errors} error/s" in output
+
+
+def test_parser_max_errors_in_module(capsys):
+    """Test if stopping inside a module restores the outer scope."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_module_errors.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner, 2)
+
+    assert not parser.parse_network()
+    capsys.readouterr()
+
+    assert parser.stopped
+    assert parser.error_count == 2
+    assert parser.devices is devices
+    assert parser.network is network
+
+
+def test_parser_unconnected_inputs(capsys):
+    """Test if every unconnected input is reported where it is defined."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_unconnected.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+
+    assert not parser.parse_network()
+    output = capsys.readouterr().out
+
+    # H1.B drives two devices in the instance but is reported once
+    assert [(error.message, error.line_number, error.position)
+            for error in parser.errors] == [
+        ("Input is not connected: H1.B", 9, 9),
+        ("Input is not connected: N1.I2", 10, 9)]
+    assert "Input is not connected: H1.B\nLINE 9:" in output
+    assert parser.warnings == []
+
+
+def test_parser_unused_outputs(tmp_path, capsys):
+    """Test if outputs neither connected nor monitored are warnings."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    file_path = tmp_path / "unused.txt"
+    file_path.write_text("DEVICES S1:SWITCH 1, S2:SWITCH 0,\n"
+                         "        D1:DTYPE, C1:CLOCK 2;\n"
+                         "CONNECT S1 > D1.DATA, S2 > D1.SET, S2 > D1.CLEAR,\n"
+                         "        C1 > D1.CLK;\n"
+                         "MONITOR D1.Q;\n"
+                         "END\n")
+    scanner = Scanner(str(file_path), names)
+    parser = Parser(names, devices, network, monitors, scanner)
+
+    assert parser.parse_network()
+    assert parser.error_count == 0
+    [warning] = parser.warnings
+    assert warning.code == parser.UNUSED_OUTPUT
+    assert warning.message == "Output is not connected or monitored: D1.QBAR"
+    assert (warning.line_number, warning.position) == (2, 9)
+    assert capsys.readouterr().out == warning.format() + "\n"
+    assert "D1.QBAR\nLINE 2:" in warning.format()
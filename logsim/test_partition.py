@@ -0,0 +1,122 @@
+"""Test the partition module."""
+import os
+import signal
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from partition import PartitionedExecutor
+
+
+@pytest.fixture
+def gate_tree():
+    """Return a network with two NAND gates feeding a NOR gate."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+
+    [SW1, SW2, N1, N2, G1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "N1", "N2", "G1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(SW2, devices.SWITCH, 0)
+    devices.make_device(N1, devices.NAND, 2)
+    devices.make_device(N2, devices.NAND, 2)
+    devices.make_device(G1, devices.NOR, 2)
+    network.make_connection(SW1, None, N1, I1)
+    network.make_connection(SW1, None, N1, I2)
+    network.make_connection(SW1, None, N2, I1)
+    network.make_connection(SW2, None, N2, I2)
+    network.make_connection(N1, None, G1, I1)
+    network.make_connection(N2, None, G1, I2)
+    return network
+
+
+def get_gates(network):
+    """Return the two-valued gates of the network."""
+    devices = network.devices
+    return network.find_two_valued_gates(
+        set(devices.find_devices(devices.NAND) +
+            devices.find_devices(devices.NOR)))
+
+
+def test_partition(gate_tree):
+    """Test if each level is split between the workers."""
+    network = gate_tree
+    [N1, N2, G1] = network.names.lookup(["N1", "N2", "G1"])
+    executor = PartitionedExecutor(network.devices, network,
+                                   get_gates(network), 2)
+    try:
+        stages = [[[gate[0].device_id for gate in worker_gates]
+                   for worker_gates in stage] for stage in executor.stages]
+    finally:
+        executor.close()
+    # G1 reads an output the other worker writes, so it starts a new stage
+    assert len(stages) == 2
+    assert sorted(stages[0][0] + stages[0][1]) == sorted([N1, N2])
+    assert stages[0][0] and stages[0][1]
+    assert sorted(stages[1]) == [[], [G1]]
+
+
+def test_generate(gate_tree):
+    """Test if each gate is one line on the signal array."""
+    network = gate_tree
+    executor = PartitionedExecutor(network.devices, network,
+                                   get_gates(network), 1)
+    executor.close()
+    assert len(executor.stages) == 1
+    lines = executor.generate(executor.stages[0][0]).splitlines()
+    assert lines[0] == "def stage(v):"
+    assert lines[1:] == ["    v[1] = 1 - (v[4] & v[4])",
+                         "    v[2] = 1 - (v[4] & v[5])",
+                         "    v[3] = 1 - (v[1] | v[2])"]
+
+
+def test_execute(gate_tree):
+    """Test if the workers set the same outputs as in this process."""
+    network = gate_tree
+    devices = network.devices
+    [SW2, G1] = network.names.lookup(["Sw2", "G1"])
+    network.set_workers(2)
+    try:
+        for state in [0, 1, 0]:
+            devices.set_switch(SW2, state)
+            assert network.execute_network()
+            # G1 = not (not Sw1 or not (Sw1 and Sw2)) = Sw2
+            assert network.get_output_signal(G1, None) == \
+                [devices.LOW, devices.HIGH][state]
+        assert network.partitioned is not None
+    finally:
+        network.set_workers(None)
+    assert network.partitioned is None
+
+
+
+@pytest.mark.parametrize("failure", ["killed", "stopped"])
+def test_worker_failure(gate_tree, failure):
+    """Test if the gates are executed here when a worker fails."""
+    network = gate_tree
+    devices = network.devices
+    [SW2, G1] = network.names.lookup(["Sw2", "G1"])
+    network.set_workers(2)
+    try:
+        assert network.execute_network()
+        executor = network.partitioned
+        executor.timeout = 0.5
+        process = executor.processes[0]
+        if failure == "killed":
+            process.kill()
+            process.join()
+        else:  # alive but never reaches the barrier
+            os.kill(process.pid, signal.SIGSTOP)
+
+        devices.set_switch(SW2, 1)
+        assert network.execute_network()
+        assert network.get_output_signal(G1, None) == devices.HIGH
+        assert network.partitioned is None
+        assert executor.closed
+        assert not any(process.is_alive()
+                       for process in executor.processes)
+    finally:
+        network.set_workers(None)
@@ -0,0 +1,110 @@
+"""Test the profiler module."""
+import pytest
+import json
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from profiler import Profiler
+
+
+@pytest.fixture
+def profiled_flip_flop():
+    """Return a profiler attached to the parsed flip-flop circuit."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    profiler = Profiler()
+    profiler.instrument_simulation(devices, network, monitors)
+
+    file_path = os.path.join(os.path.dirname(__file__), "test_parser",
+                             "test_flip_flop.txt")
+    scanner = Scanner(file_path, names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    profiler.instrument_parser(scanner, parser)
+    assert parser.parse_network()
+
+    devices.cold_startup()
+    for _ in range(5):
+        assert network.execute_network()
+        monitors.record_signals()
+    return profiler, devices, network, monitors
+
+
+def test_wrap():
+    """Test if wrapped methods are timed and still return their result."""
+    names = Names()
+    profiler = Profiler()
+    calls = []
+    profiler.wrap(names, "lookup", "lookup", lambda: calls.append(1))
+
+    assert names.lookup(["A", "B"]) == [0, 1]
+    assert names.lookup(["A"]) == [0]
+    assert profiler.phases["lookup"][0] == 2
+    assert profiler.phases["lookup"][1] >= 0
+    assert calls == [1, 1]
+
+    # Other instances are not affected
+    assert "lookup" not in vars(Names())
+
+
+def test_report(profiled_flip_flop):
+    """Test if every phase and simulation cycle is recorded."""
+    profiler, devices, _, _ = profiled_flip_flop
+    report = profiler.report()
+
+    assert set(report["phases"]) == {
+        "scan", "parse", "check_network", "cold_startup",
+        "execute_network", "record_signals"}
+    assert report["phases"]["parse"]["calls"] == 1
+    assert report["phases"]["execute_network"]["calls"] == 5
+    assert report["cycles"] == 5
+    assert all(iterations >= 1 for iterations in
+               report["settle_iterations"])
+    # NAND gate N1 is two-valued, so it is executed once after settling
+    assert report["device_evaluations"] == [
+        iterations * (len(devices.devices_list) - 1) + 1
+        for iterations in report["settle_iterations"]]
+    assert report["monitor_bytes"] > 0
+    assert "Simulation cycles: 5" in profiler.summary()
+
+
+def test_dump(profiled_flip_flop, tmp_path, capsys):
+    """Test if the report is written as JSON or printed as a summary."""
+    profiler, _, _, _ = profiled_flip_flop
+    profiler.dump()
+    assert "Profile summary" in capsys.readouterr().out
+
+    profiler.report_path = str(tmp_path / "profile.json")
+    profiler.dump()
+    with open(profiler.report_path) as report_file:
+        assert json.load(report_file)["cycles"] == 5
+
+
+def test_device_evaluations_pruned(profiled_flip_flop):
+    """Test if devices outside the cone of influence are not counted."""
+    profiler, devices, network, monitors = profiled_flip_flop
+    network.set_two_valued(False)
+    for device_id, output_id in list(monitors.monitors_dictionary):
+        monitors.remove_monitor(device_id, output_id)
+    [D1, QBAR] = devices.names.lookup(["D1", "QBAR"])
+    monitors.make_monitor(D1, QBAR)
+    monitors.set_pruning(True)
+
+    assert network.execute_network()
+    # D1 and the clock and switches driving it: S1, S2, S3 and C1
+    assert profiler.cycle_evaluations[-1] == \
+        5 * profiler.cycle_iterations[-1]
+
+
+def test_time_call():
+    """Test if a call is timed and returns its result."""
+    profiler = Profiler()
+    names = profiler.time_call("scan", Names)
+    assert isinstance(names, Names)
+    assert profiler.phases["scan"][0] == 1
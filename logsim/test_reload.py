@@ -0,0 +1,187 @@
+"""Test the reload module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from reload import NetworkReloader
+
+ADDER = """DEVICES X1:XOR, A1:AND 2, S1:SWITCH 1, S2:SWITCH 0;
+CONNECT S1 > X1.I1, S1 > A1.I1, S2 > X1.I2, S2 > A1.I2;
+MONITOR X1, A1;
+END
+"""
+
+
+@pytest.fixture
+def live_adder(tmp_path):
+    """Return a reloader for a half adder that has run for two cycles."""
+    file_path = tmp_path / "adder.txt"
+    file_path.write_text(ADDER)
+
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(str(file_path), names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+
+    for _ in range(2):
+        network.execute_network()
+        monitors.record_signals()
+
+    return NetworkReloader(str(file_path), names, devices, network,
+                           monitors), file_path
+
+
+def test_reload_unchanged(live_adder):
+    """Test if reloading an unchanged file changes nothing."""
+    reloader, file_path = live_adder
+    file_path.write_text("/* comment */\n" + ADDER)
+
+    assert reloader.reload(2)
+    assert not any(reloader.changes.values())
+
+
+def test_reload_monitors(live_adder):
+    """Test if traces of unchanged monitors are kept."""
+    reloader, file_path = live_adder
+    names = reloader.names
+    devices = reloader.devices
+    [X1, A1, S1] = names.lookup(["X1", "A1", "S1"])
+
+    file_path.write_text(ADDER.replace("MONITOR X1, A1;",
+                                       "MONITOR X1, S1;"))
+    assert reloader.reload(2)
+
+    assert reloader.monitors.monitors_dictionary == {
+        (X1, None): [devices.HIGH, devices.HIGH],
+        (S1, None): [devices.BLANK, devices.BLANK]}
+    assert reloader.changes["monitors_added"] == 1
+    assert reloader.changes["monitors_removed"] == 1
+    assert reloader.changes["devices_added"] == 0
+
+
+def test_reload_devices(live_adder):
+    """Test if changed devices and their connections are rebuilt."""
+    reloader, file_path = live_adder
+    names = reloader.names
+    devices = reloader.devices
+    network = reloader.network
+    [X1, A1, O1, S1, S2, I1,
+     I2] = names.lookup(["X1", "A1", "O1", "S1", "S2", "I1", "I2"])
+
+    # Replace the AND gate with an OR gate
+    file_path.write_text(ADDER.replace("A1", "O1").replace("AND", "OR"))
+    assert reloader.reload(2)
+
+    assert devices.get_device(A1) is None
+    assert devices.get_device(O1).device_kind == devices.OR
+    assert network.get_connected_output(O1, I1) == (S1, None)
+    assert network.get_connected_output(O1, I2) == (S2, None)
+    assert network.check_network()
+    assert list(reloader.monitors.monitors_dictionary) == [(X1, None),
+                                                           (O1, None)]
+    assert reloader.monitors.monitors_dictionary[(X1, None)] == [
+        devices.HIGH, devices.HIGH]
+
+    network.execute_network()
+    assert network.get_output_signal(O1, None) == devices.HIGH
+
+
+def test_reload_with_errors(live_adder, capsys):
+    """Test if a file with errors leaves the live network unchanged."""
+    reloader, file_path = live_adder
+    [X1] = reloader.names.lookup(["X1"])
+
+    file_path.write_text(ADDER.replace("X1:XOR", "X1:XOR 2"))
+    assert reloader.has_changed()
+    assert not reloader.reload(2)
+    assert capsys.readouterr().out == ""  # the GUI shows the errors
+    diagnostic = reloader.diagnostics[0]
+    assert diagnostic.message == "Did not expect a parameter"
+    assert diagnostic.line_number == 1
+    assert reloader.devices.get_device(X1).device_kind == \
+        reloader.devices.XOR
+
+
+def test_reload_checks(live_adder):
+    """Test if checks are replaced when the CHECK section changes."""
+    reloader, file_path = live_adder
+    monitors = reloader.monitors
+    [X1, S1, S2] = reloader.names.lookup(["X1", "S1", "S2"])
+
+    file_path.write_text(ADDER.replace("END", "CHECK X1 = S1 XOR S2;\nEND"))
+    assert reloader.reload(2)
+    [check] = monitors.checks
+    assert check.network is reloader.network
+    assert set(check.get_signals()) == {(X1, None), (S1, None), (S2, None)}
+    assert reloader.changes["checks_added"] == 1
+
+    file_path.write_text(ADDER)
+    assert reloader.reload(2)
+    assert monitors.checks == []
+    assert reloader.changes["checks_removed"] == 1
+    assert (S1, None) not in monitors.observed_signals
+
+
+def test_reload_keyword_in_name(tmp_path):
+    """Test if names containing a keyword do not split the sections."""
+    text = ("DEVICES SEND:SWITCH 0, G1:OR 1;\n"
+            "CONNECT SEND > G1.I1;\nMONITOR G1;\nEND\n")
+    file_path = tmp_path / "send.txt"
+    file_path.write_text(text)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner(str(file_path), names))
+    assert parser.parse_network()
+    reloader = NetworkReloader(str(file_path), names, devices, network,
+                               monitors)
+    assert reloader.section_texts["DEVICES"] == (
+        "SEND : SWITCH 0 , G1 : OR 1 ; ")
+
+    file_path.write_text(text.replace("OR 1;", "OR 1, G2:OR 1;").replace(
+        "G1.I1;", "G1.I1, SEND > G2.I1;").replace("G1;", "G1, G2;"))
+    assert reloader.reload()
+    [G2] = names.lookup(["G2"])
+    assert devices.get_device(G2) is not None
+    assert reloader.changes["devices_added"] == 1
+    assert (G2, None) in monitors.monitors_dictionary
+
+
+def test_reload_checks_pruned(live_adder):
+    """Test if pruning follows monitors made after checks are replaced."""
+    reloader, file_path = live_adder
+    network = reloader.network
+    devices = reloader.devices
+    file_path.write_text(ADDER.replace("END", "CHECK X1 = S1 XOR S2;\nEND"))
+    assert reloader.reload(2)
+    reloader.monitors.set_pruning(True)
+
+    file_path.write_text(
+        ADDER.replace("S2:SWITCH 0", "S2:SWITCH 0, A2:AND 2").replace(
+            "S2 > A1.I2", "S2 > A1.I2, S1 > A2.I1, S1 > A2.I2").replace(
+                "MONITOR X1, A1", "MONITOR X1, A1, A2"))
+    assert reloader.reload(2)
+    assert network.cone_outputs is reloader.monitors.observed_signals
+
+    [A2] = reloader.names.lookup(["A2"])
+    network.execute_network()
+    assert network.get_output_signal(A2, None) == devices.HIGH
+
+
+def test_reload_warnings(live_adder):
+    """Test if unused outputs of the reloaded file are kept as warnings."""
+    reloader, file_path = live_adder
+    file_path.write_text(ADDER.replace("MONITOR X1, A1;", "MONITOR X1;"))
+    assert reloader.reload(2)
+    [warning] = reloader.warnings
+    assert warning.message == "Output is not connected or monitored: A1"
+    assert warning.line_number == 1
@@ -0,0 +1,77 @@
+"""Test the simworker module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from simworker import SimulationWorker
+
+
+@pytest.fixture
+def new_worker():
+    """Return a SimulationWorker for a clock with a monitored output."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [CLK_ID] = names.lookup(["Clk"])
+    devices.make_device(CLK_ID, devices.CLOCK, 1)
+    monitors.make_monitor(CLK_ID, None)
+    devices.cold_startup()
+
+    return SimulationWorker(network, monitors, batch_size=10)
+
+
+def test_run(new_worker):
+    """Test if the cycles run in batches with a report after each one."""
+    new_worker.run(25)
+
+    reports = []
+    while not new_worker.progress.empty():
+        reports.append(new_worker.progress.get())
+    RUNNING = new_worker.RUNNING
+    assert reports == [(10, RUNNING), (20, RUNNING), (25, RUNNING),
+                       (25, new_worker.FINISHED)]
+    [signal_list] = new_worker.monitors.monitors_dictionary.values()
+    assert len(signal_list) == 25
+
+
+def test_start(new_worker):
+    """Test if the thread runs all cycles and the latest report is kept."""
+    with new_worker.lock:  # keep the worker in its first batch
+        assert new_worker.start(1000)
+        assert not new_worker.start(1000)  # already running
+    new_worker.thread.join()
+
+    assert not new_worker.is_running()
+    assert new_worker.get_progress() == (1000, new_worker.FINISHED)
+    assert new_worker.get_progress() is None
+
+
+def test_stop(new_worker):
+    """Test if a stopped worker ends after the batch it is running."""
+    monitors = new_worker.monitors
+    record_signals = monitors.record_signals
+
+    def record_and_stop():
+        record_signals()
+        new_worker.stop_event.set()  # stop requested during the first batch
+
+    monitors.record_signals = record_and_stop
+    new_worker.start(1000)
+    new_worker.thread.join()
+    new_worker.stop()
+
+    assert new_worker.get_progress() == (10, new_worker.STOPPED)
+    [signal_list] = monitors.monitors_dictionary.values()
+    assert len(signal_list) == 10
+
+
+def test_network_error(new_worker):
+    """Test if an oscillating network stops the worker."""
+    new_worker.network.execute_network = lambda: False
+    new_worker.run(100)
+
+    assert new_worker.get_progress() == (0, new_worker.NETWORK_ERROR)
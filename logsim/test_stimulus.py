@@ -0,0 +1,136 @@
+"""Test the stimulus module."""
+import pytest
+import os
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from userint import UserInterface
+from stimulus import StimulusFile
+
+
+@pytest.fixture
+def full_adder():
+    """Return names, devices, network and monitors of the full adder."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(os.path.join(os.path.dirname(__file__),
+                                   "full_adder.txt"), names)
+    parser = Parser(names, devices, network, monitors, scanner)
+    assert parser.parse_network()
+    return names, devices, network, monitors
+
+
+def write_stimulus(tmp_path, text):
+    """Write a stimulus file and return its path."""
+    path = str(tmp_path / "stimulus.txt")
+    with open(path, "w") as stimulus_file:
+        stimulus_file.write(text)
+    return path
+
+
+def get_states(names, devices):
+    """Return the states of switches S1, S2 and S3."""
+    return [devices.get_device(names.query(name)).switch_state
+            for name in ["S1", "S2", "S3"]]
+
+
+def test_read_change(tmp_path, full_adder):
+    """Test if changes are read one line at a time."""
+    names, devices, _, _ = full_adder
+    path = write_stimulus(tmp_path, "# inputs\n\n0: S1 = 0, S2=1 # both\n"
+                                    "5: S3 = 1\n")
+    stimulus = StimulusFile(path, names, devices)
+    [S1, S2, S3] = names.lookup(["S1", "S2", "S3"])
+    assert stimulus.change == (0, [(S1, 0), (S2, 1)])
+    assert stimulus.line_number == 3
+    assert stimulus.read_change() == (5, [(S3, 1)])
+    assert stimulus.read_change() is None
+    assert stimulus.error_code == stimulus.NO_ERROR
+    stimulus.close()
+
+
+def test_apply(tmp_path, full_adder):
+    """Test if the switches are set before the cycles given."""
+    names, devices, _, _ = full_adder
+    path = write_stimulus(tmp_path, "2: S1 = 0\n2: S3 = 1\n4: S2 = 0\n")
+    stimulus = StimulusFile(path, names, devices)
+    assert get_states(names, devices) == [1, 1, 0]
+    assert stimulus.apply(1)
+    assert get_states(names, devices) == [1, 1, 0]
+    assert stimulus.apply(2)
+    assert get_states(names, devices) == [0, 1, 1]
+    assert stimulus.line_number == 3  # the change of cycle 4 is read ahead
+    assert stimulus.apply(10)
+    assert get_states(names, devices) == [0, 0, 1]
+
+    stimulus.rewind()
+    assert stimulus.change[0] == 2
+    stimulus.close()
+
+
+@pytest.mark.parametrize("text, error, line", [
+    ("0: S1 = 1\n3 S2 = 1\n", "SYNTAX_ERROR", 2),
+    ("0: S1 = 2\n", "SYNTAX_ERROR", 1),
+    ("0: S1 = 1,\n", "SYNTAX_ERROR", 1),
+    ("0: X1 = 1\n", "NOT_A_SWITCH", 1),
+    ("0: Q = 1\n", "NOT_A_SWITCH", 1),
+    ("5: S1 = 1\n4: S1 = 0\n", "CYCLE_ORDER", 2)])
+def test_errors(tmp_path, full_adder, text, error, line):
+    """Test if errors stop the stimulus and say where they are."""
+    names, devices, _, _ = full_adder
+    stimulus = StimulusFile(write_stimulus(tmp_path, text), names, devices)
+    assert not stimulus.apply(10)
+    assert stimulus.error_code == getattr(stimulus, error)
+    assert stimulus.line_number == line
+    assert f"line {line}:" in stimulus.get_error_message()
+    stimulus.close()
+
+
+def test_user_interface_run(tmp_path, full_adder, capsys):
+    """Test if runs and continued runs follow the stimulus."""
+    names, devices, network, monitors = full_adder
+    path = write_stimulus(tmp_path, "0: S1 = 0, S2 = 0, S3 = 0\n3: S1 = 1\n"
+                                    "6: S2 = 1, S3 = 1\n")
+    userint = UserInterface(names, devices, network, monitors,
+                            StimulusFile(path, names, devices))
+    [X2] = names.lookup(["X2"])
+    low, high = devices.LOW, devices.HIGH
+
+    userint.line = "r 5"
+    userint.cursor = 0
+    userint.read_command()
+    userint.run_command()
+    sum_trace = monitors.monitors_dictionary[(X2, None)]
+    assert sum_trace == [low, low, low, high, high]
+
+    userint.line = "c 3"
+    userint.cursor = 0
+    userint.read_command()
+    userint.continue_command()
+    assert sum_trace == [low, low, low, high, high, high, high, high]
+
+    # A new run starts the stimulus again
+    userint.line = "r 4"
+    userint.cursor = 0
+    userint.read_command()
+    userint.run_command()
+    sum_trace = monitors.monitors_dictionary[(X2, None)]
+    assert sum_trace == [low, low, low, high]
+    userint.stimulus.close()
+
+
+def test_user_interface_error(tmp_path, full_adder, capsys):
+    """Test if an error in the stimulus stops the run."""
+    names, devices, network, monitors = full_adder
+    path = write_stimulus(tmp_path, "0: S1 = 1\n2: S9 = 1\n")
+    userint = UserInterface(names, devices, network, monitors,
+                            StimulusFile(path, names, devices))
+    assert not userint.run_network(5)
+    assert "S9 is not a switch" in capsys.readouterr().out
+    userint.stimulus.close()
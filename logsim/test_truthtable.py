@@ -0,0 +1,76 @@
+"""Test the truthtable module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from truthtable import GateCluster
+
+
+@pytest.fixture
+def half_adders():
+    """Return a network with two half adders fed by switches."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+
+    [I1, I2] = names.lookup(["I1", "I2"])
+    for adder in ["1", "2"]:
+        [SW_A, SW_B, X, A] = names.lookup(
+            ["SwA" + adder, "SwB" + adder, "X" + adder, "A" + adder])
+        devices.make_device(SW_A, devices.SWITCH, 0)
+        devices.make_device(SW_B, devices.SWITCH, 0)
+        devices.make_device(X, devices.XOR)
+        devices.make_device(A, devices.AND, 2)
+        network.make_connection(SW_A, None, X, I1)
+        network.make_connection(SW_B, None, X, I2)
+        network.make_connection(SW_A, None, A, I1)
+        network.make_connection(SW_B, None, A, I2)
+    return network
+
+
+def get_cluster(network, adder):
+    """Return the cluster of the sum and carry gates of one half adder."""
+    devices = network.devices
+    [X, A] = devices.names.lookup(["X" + adder, "A" + adder])
+    return GateCluster(devices, network,
+                       [devices.get_device(X), devices.get_device(A)])
+
+
+def test_make_table(half_adders):
+    """Test if each row holds the sum and carry of the inputs."""
+    devices = half_adders.devices
+    low, high = devices.LOW, devices.HIGH
+    cluster = get_cluster(half_adders, "1")
+    assert len(cluster.inputs) == 2
+    assert cluster.make_table() == [(low, low), (high, low),
+                                    (high, low), (low, high)]
+
+
+@pytest.mark.parametrize("high_a, high_b", [
+    (False, False), (False, True), (True, False), (True, True)])
+def test_execute(half_adders, high_a, high_b):
+    """Test if executing the cluster sets the gate outputs."""
+    network = half_adders
+    devices = network.devices
+    [SW_A, SW_B, X, A] = devices.names.lookup(["SwA1", "SwB1", "X1", "A1"])
+    for switch_id, high in [(SW_A, high_a), (SW_B, high_b)]:
+        devices.get_device(switch_id).outputs[None] = \
+            devices.HIGH if high else devices.LOW
+
+    get_cluster(network, "1").execute()
+    expected_sum = devices.HIGH if high_a != high_b else devices.LOW
+    expected_carry = devices.HIGH if high_a and high_b else devices.LOW
+    assert network.get_output_signal(X, None) == expected_sum
+    assert network.get_output_signal(A, None) == expected_carry
+
+
+def test_table_cache(half_adders):
+    """Test if structurally identical clusters share one table."""
+    GateCluster.table_cache.clear()
+    first = get_cluster(half_adders, "1")
+    second = get_cluster(half_adders, "2")
+    assert first.get_key() == second.get_key()
+    assert first.table is second.table
+    assert len(GateCluster.table_cache) == 1
+    assert first.inputs[0][0] is not second.inputs[0][0]
@@ -0,0 +1,198 @@
+"""Test the waveform module."""
+import pytest
+
+from names import Names
+from network import Network
+from devices import Devices
+from monitors import Monitors
+from waveform import WaveformTrace, WaveformView, MonitorSamples
+
+LOW = WaveformTrace.LOW_Y
+HIGH = WaveformTrace.HIGH_Y
+
+
+@pytest.fixture
+def new_samples():
+    """Return a MonitorSamples instance for monitors on two switches."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+
+    [SW1_ID, SW2_ID] = new_names.lookup(["Sw1", "Sw2"])
+    new_devices.make_device(SW1_ID, new_devices.SWITCH, 0)
+    new_devices.make_device(SW2_ID, new_devices.SWITCH, 1)
+    new_monitors.make_monitor(SW1_ID, None)
+    new_monitors.make_monitor(SW2_ID, None)
+    new_network.execute_network()
+
+    return MonitorSamples(new_devices, new_monitors)
+
+
+def get_segments(trace):
+    """Return the line segments of a trace as tuples of end points."""
+    # vertices are single precision floats
+    vertices = [round(vertex, 6) for vertex in trace.vertices]
+    return [tuple(vertices[i:i + 4]) for i in range(0, len(vertices), 4)]
+
+
+def test_extend():
+    """Test if each cycle adds a level and each change adds an edge."""
+    trace = WaveformTrace()
+    trace.extend([0, 1, 1])
+
+    assert trace.length == 3
+    assert get_segments(trace) == [
+        (0, LOW, 1, LOW),
+        (1, LOW, 1, HIGH), (1, HIGH, 2, HIGH),
+        (2, HIGH, 3, HIGH)]
+    assert list(trace.cycle_starts) == [0, 2, 6, 8]
+
+
+def test_extend_incrementally():
+    """Test if appending cycles gives the same geometry as one build."""
+    values = [1, 0, None, None, 1, 1, 0, None, 0, 1]
+    whole = WaveformTrace()
+    whole.extend(values)
+
+    pieces = WaveformTrace()
+    for start in range(0, len(values), 3):
+        vertex_count = pieces.get_vertex_count()
+        pieces.extend(values[start:start + 3])
+        # earlier geometry is never changed
+        assert pieces.vertices[:2 * vertex_count] == \
+            whole.vertices[:2 * vertex_count]
+
+    assert pieces.vertices == whole.vertices
+    assert pieces.cycle_starts == whole.cycle_starts
+
+
+def test_blank_cycles():
+    """Test if blank cycles are not drawn and do not start edges."""
+    trace = WaveformTrace()
+    trace.extend([None, 1, None, 0])
+
+    assert get_segments(trace) == [(1, HIGH, 2, HIGH), (3, LOW, 4, LOW)]
+    assert list(trace.cycle_starts) == [0, 0, 2, 2, 4]
+
+    trace.reset()
+    assert trace.length == 0
+    assert trace.get_vertex_count() == 0
+
+
+def test_levels():
+    """Test if decimated levels summarise pairs of buckets."""
+    trace = WaveformTrace()
+    trace.extend([0, 0, 1, 1, 0, 1, None, None])
+
+    assert len(trace.level_vertices) == 4
+    # Level 1: two constant buckets, a mixed bucket and a blank bucket
+    assert [list(summary) for summary in trace.level_summaries[1]] == [
+        [0, 1, 0, -1], [0, 1, 1, -1], [0, 1, 0, -1], [0, 1, 1, -1]]
+    assert get_segments(trace)[:1] == [(0, LOW, 1, LOW)]
+    assert list(trace.level_starts[1]) == [0, 2, 6, 12, 12]
+
+    # The whole trace at level 3 is one mixed bucket
+    assert [list(summary) for summary in trace.level_summaries[3]] == [
+        [0], [1], [0], [1]]
+    assert trace.get_vertex_count(3) == 6
+
+
+def test_get_level():
+    """Test if the level is the coarsest with buckets within a pixel."""
+    trace = WaveformTrace()
+    trace.extend([0, 1] * 512)  # levels 0 to 10
+
+    assert trace.get_level(0.1) == 0
+    assert trace.get_level(1.5) == 0
+    assert trace.get_level(2) == 1
+    assert trace.get_level(100) == 6
+    assert trace.get_level(10 ** 6) == 10
+
+
+@pytest.mark.parametrize("first_cycle, last_cycle, level, expected", [
+    (0, 8, 0, [(0, 0, 16)]),  # 8 cycles of 2 vertices each
+    (2, 4, 0, [(0, 4, 4)]),
+    (0, 8, 2, [(2, 0, 4)]),   # 2 constant buckets of 4 cycles
+    (0, 11, 2, [(2, 0, 4), (1, 8, 2), (0, 20, 2)]),  # partial buckets
+    (20, 30, 1, []),          # beyond the end of the trace
+])
+def test_get_draw_ranges(first_cycle, last_cycle, level, expected):
+    """Test if the draw ranges cover the cycles with the fewest vertices."""
+    trace = WaveformTrace()
+    trace.extend([0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+
+    assert trace.get_draw_ranges(first_cycle, last_cycle, level) == expected
+
+
+def test_visible_area():
+    """Test if the visible cycles and rows follow the pan and zoom."""
+    view = WaveformView(time_unit_width=30, signal_height=60)
+
+    assert view.get_visible_cycles(0, 1, 300) == (0, 11)
+    # panned left by 10 cycles and zoomed in by 2
+    assert view.get_visible_cycles(-600, 2, 300) == (10, 16)
+    assert view.get_visible_cycles(400, 1, 300) == (0, 0)
+    assert view.get_cycles_per_pixel(0.01) == pytest.approx(10 / 3)
+
+    # rows start one signal height above the origin
+    assert view.get_visible_rows(0, 1, 200, 10) == range(0, 3)
+    assert view.get_visible_rows(-600, 1, 200, 10) == range(9, 10)
+    assert view.get_visible_rows(0, 1, 200, 1) == range(0, 1)
+
+
+def test_monitor_samples(new_samples):
+    """Test if only newly recorded signals are added to the samples."""
+    monitors = new_samples.monitors
+    devices = new_samples.devices
+    [SW1_ID, SW2_ID] = devices.names.lookup(["Sw1", "Sw2"])
+
+    assert new_samples.update()  # first update finds the monitors
+    assert new_samples.signal_data == {"Sw1": [], "Sw2": []}
+
+    monitors.record_signals()
+    monitors.record_signals()
+    sw1_samples = new_samples.signal_data["Sw1"]
+    assert not new_samples.update()
+    assert new_samples.signal_data == {"Sw1": [0, 0], "Sw2": [1, 1]}
+    # samples are extended in place
+    assert new_samples.signal_data["Sw1"] is sw1_samples
+
+    monitors.monitors_dictionary[(SW1_ID, None)].append(devices.BLANK)
+    monitors.monitors_dictionary[(SW2_ID, None)].append(devices.FALLING)
+    assert not new_samples.update()
+    assert new_samples.signal_data == {"Sw1": [0, 0, None],
+                                       "Sw2": [1, 1, 0]}
+
+
+def test_monitor_samples_changes(new_samples):
+    """Test if removed monitors and reset traces update the samples."""
+    monitors = new_samples.monitors
+    [SW1_ID] = new_samples.devices.names.lookup(["Sw1"])
+    monitors.record_signals()
+    new_samples.update()
+
+    monitors.remove_monitor(SW1_ID, None)
+    assert new_samples.update()
+    assert new_samples.signal_data == {"Sw2": [1]}
+
+    monitors.reset_monitors()
+    assert not new_samples.update()
+    assert new_samples.signal_data == {"Sw2": []}
+
+
+def test_monitor_samples_remade(new_samples):
+    """Test if a monitor removed and made again gets new samples."""
+    monitors = new_samples.monitors
+    [SW2_ID] = new_samples.devices.names.lookup(["Sw2"])
+    for _ in range(3):
+        monitors.record_signals()
+    new_samples.update()
+    assert new_samples.signal_data["Sw2"] == [1, 1, 1]
+
+    # the same signal, at the same place and with a trace of the same length
+    monitors.remove_monitor(SW2_ID, None)
+    monitors.make_monitor(SW2_ID, None, 3)
+    assert not new_samples.update()
+    assert new_samples.signal_data == {"Sw1": [0, 0, 0],
+                                       "Sw2": [None, None, None]}
@@ -0,0 +1,132 @@
+"""Execute small clusters of logic gates by truth table lookup.
+
+Used in the Logic Simulator project to speed up circuits built from many
+copies of the same small combinational cells, such as full adders and
+multiplexers. The outputs of a cluster of gates with few external inputs are
+worked out once for every combination of those inputs, and the cluster is
+then executed by looking its outputs up in the table. Tables are cached by
+the structure of the cluster, so structurally identical clusters share one
+table.
+
+Classes
+-------
+GateCluster - executes a cluster of logic gates by table lookup.
+"""
+
+
+class GateCluster:
+    """Execute a cluster of two-valued logic gates by table lookup.
+
+    The gates are given drivers first, and every input from outside the
+    cluster must be HIGH or LOW when the cluster is executed, as for the
+    two-valued gates of the network. Executing the cluster sets the output of
+    every gate to the signal Network.execute_two_valued_gates would give it.
+
+    The table has one row for each combination of the external inputs, and
+    each row holds the output signals of the gates in order. The first
+    external input is the most significant bit of the row number.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    gates: list of the Device objects of the gates, drivers first.
+
+    Public methods
+    --------------
+    execute(self): Sets the outputs of the gates from the table.
+
+    get_key(self): Returns the structure of the cluster, which identifies its
+                   table.
+
+    make_table(self): Returns the truth table of the cluster.
+    """
+
+    # table_cache stores {cluster structure: table}, shared by all clusters
+    table_cache = {}
+
+    def __init__(self, devices, network, gates):
+        """Find the structure of the cluster and its cached table."""
+        self.devices = devices
+        self.network = network
+        self.gates = gates
+        self.output_dicts = [device.outputs for device in gates]
+
+        # inputs lists the (output dictionary, output ID) of each external
+        # input, and operands lists ("gate", index) or ("input", index) for
+        # the inputs of each gate
+        gate_index = {device.device_id: index
+                      for index, device in enumerate(gates)}
+        external_index = {}
+        self.inputs = []
+        self.operands = []
+        for device in gates:
+            operands = []
+            for driver_id, output_id in device.inputs.values():
+                if output_id is None and driver_id in gate_index:
+                    operands.append(("gate", gate_index[driver_id]))
+                    continue
+                if (driver_id, output_id) not in external_index:
+                    external_index[(driver_id, output_id)] = len(self.inputs)
+                    self.inputs.append(
+                        (devices.get_device(driver_id).outputs, output_id))
+                operands.append(("input",
+                                 external_index[(driver_id, output_id)]))
+            self.operands.append(tuple(operands))
+
+        self.key = self.get_key()
+        self.table = self.table_cache.get(self.key)
+        if self.table is None:
+            self.table = self.make_table()
+            self.table_cache[self.key] = self.table
+
+    def get_key(self):
+        """Return the structure of the cluster.
+
+        This is the number of external inputs and, for each gate, its rule
+        as in Network.execute_gate and the operands it reads. Clusters with
+        the same key have the same table.
+        """
+        rules = [self.network.gate_rules[device.device_kind]
+                 for device in self.gates]
+        return (len(self.inputs),
+                tuple(zip(rules, self.operands)))
+
+    def make_table(self):
+        """Return the truth table of the cluster.
+
+        Each row is worked out by executing the gates in order with the same
+        rules as Network.execute_two_valued_gates.
+        """
+        low, high = self.devices.LOW, self.devices.HIGH
+        input_count = len(self.inputs)
+        rules = [self.network.gate_rules[device.device_kind]
+                 for device in self.gates]
+        table = []
+        for row in range(2 ** input_count):
+            input_signals = [
+                high if row >> (input_count - 1 - index) & 1 else low
+                for index in range(input_count)]
+            gate_signals = []
+            for (x, y), operands in zip(rules, self.operands):
+                signals = [gate_signals[index] if source == "gate" else
+                           input_signals[index]
+                           for source, index in operands]
+                if x is None:  # XOR
+                    gate_signals.append(low if signals[0] == signals[1]
+                                        else high)
+                elif signals.count(x) == len(signals):
+                    gate_signals.append(y)
+                else:
+                    gate_signals.append(self.network.invert_signal(y))
+            table.append(tuple(gate_signals))
+        return table
+
+    def execute(self):
+        """Set the outputs of the gates from the table."""
+        high = self.devices.HIGH
+        row = 0
+        for outputs, output_id in self.inputs:
+            row += row + (outputs[output_id] == high)
+        for outputs, signal in zip(self.output_dicts, self.table[row]):
+            outputs[None] = signal
@@ -23,6 +23,8 @@ class UserInterface:
     devices: instance of the devices.Devices() class.
     network: instance of the network.Network() class.
     monitors: instance of the monitors.Monitors() class.
+    stimulus: instance of the stimulus.StimulusFile() class setting the
+              switches during runs, or None.
 
     Public methods:
     ---------------
@@ -57,6 +59,8 @@ class UserInterface:
 
     zap_command(self): Removes the specified monitor.
 
+    list_command(self): Lists the signals starting with the given prefix.
+
     run_network(self, cycles): Runs the network for the specified number of
                                simulation cycles.
 
@@ -65,12 +69,13 @@ class UserInterface:
     continue_command(self): Continues a previously run simulation.
     """
 
-    def __init__(self, names, devices, network, monitors):
+    def __init__(self, names, devices, network, monitors, stimulus=None):
         """Initialise variables."""
         self.names = names
         self.devices = devices
         self.monitors = monitors
         self.network = network
+        self.stimulus = stimulus
 
         self.cycles_completed = 0  # number of simulation cycles completed
 
@@ -93,6 +98,8 @@ class UserInterface:
                 self.monitor_command()
             elif command == "z":
                 self.zap_command()
+            elif command == "l":
+                self.list_command()
             elif command == "r":
                 self.run_command()
             elif command == "c":
@@ -135,7 +142,8 @@ class UserInterface:
         if not self.character.isalpha():  # the string must start with a letter
             print("Error! Expected a name.")
             return None
-        while self.character.isalnum():
+        # "_" joins an instance name to a device name inside a module
+        while self.character.isalnum() or self.character == "_":
             name_string = "".join([name_string, self.character])
             self.get_character()
         return name_string
@@ -206,6 +214,7 @@ class UserInterface:
         print("s X N     - set switch X to N (0 or 1)")
         print("m X       - set a monitor on signal X")
         print("z X       - zap the monitor on signal X")
+        print("l [P]     - list signals starting with P (* = monitored)")
         print("h         - help (this command)")
         print("q         - quit the program")
 
@@ -242,18 +251,44 @@ class UserInterface:
             else:
                 print("Error! Could not zap monitor.")
 
+    def list_command(self):
+        """List the output signals starting with the given prefix."""
+        self.skip_spaces()
+        prefix = ""
+        # the prefix may end part way through a name or after the "."
+        while self.character.isalnum() or self.character in ["_", "."]:
+            prefix = "".join([prefix, self.character])
+            self.get_character()
+        signal_names = self.devices.find_output_names(prefix)
+        if not signal_names:
+            print("No signals found.")
+        for signal_name in signal_names:
+            if self.monitors.find_monitor(signal_name) is None:
+                print("  " + signal_name)
+            else:
+                print("* " + signal_name)
+
     def run_network(self, cycles):
         """Run the network for the specified number of simulation cycles.
 
-        Return True if successful.
+        Switch changes in the stimulus file are made before the cycles they
+        are given for, and failed checks are listed after the signals. Return
+        True if successful.
         """
-        for _ in range(cycles):
+        for cycle in range(self.cycles_completed,
+                           self.cycles_completed + cycles):
+            if self.stimulus is not None and \
+                    not self.stimulus.apply(cycle):
+                print("Error!", self.stimulus.get_error_message())
+                return False
             if self.network.execute_network():
                 self.monitors.record_signals()
             else:
                 print("Error! Network oscillating.")
                 return False
         self.monitors.display_signals()
+        if self.monitors.checks:
+            self.monitors.display_violations()
         return True
 
     def run_command(self):
@@ -265,6 +300,8 @@ class UserInterface:
             self.monitors.reset_monitors()
             print("".join(["Running for ", str(cycles), " cycles"]))
             self.devices.cold_startup()
+            if self.stimulus is not None:
+                self.stimulus.rewind()
             if self.run_network(cycles):
                 self.cycles_completed += cycles
 
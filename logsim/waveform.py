@@ -0,0 +1,301 @@
+"""Build the line geometry of signal waveforms for the GUI canvas.
+
+Used in the Logic Simulator project to turn recorded monitor traces into
+vertex arrays that the canvas uploads to OpenGL vertex buffers, and to work
+out which part of the traces is visible. The geometry is built
+incrementally: recording a new cycle only adds the vertices of that cycle.
+
+Classes
+-------
+WaveformTrace - stores the vertex arrays of one signal trace.
+WaveformView - works out the visible cycles and signal rows of the canvas.
+MonitorSamples - copies newly recorded monitor signals into canvas samples.
+"""
+import array
+import math
+
+
+class WaveformTrace:
+    """Store the vertex arrays of one signal trace.
+
+    The trace is drawn as GL_LINES, so each pair of vertices is one line
+    segment. Coordinates are in trace units: x is the cycle number and y is
+    LOW_Y or HIGH_Y, a fraction of the signal row height. The canvas scales
+    them to pixels with the modelview matrix, so the geometry does not
+    depend on the zoom or on the size of a time unit.
+
+    Besides the geometry of every cycle (level 0), the trace keeps
+    decimated levels for zoomed out views. A bucket of level k covers 2**k
+    cycles and stores the minimum, maximum, first and last value in it; a
+    bucket whose values differ is drawn as a band between LOW_Y and HIGH_Y.
+    Buckets are added as soon as the cycles they cover are recorded.
+
+    Signal values are 0, 1, or None for a blank cycle.
+
+    Parameters
+    ----------
+    No parameters.
+
+    Public methods
+    --------------
+    get_vertex_count(self, level=0): Returns the number of vertices in a
+                                     level.
+
+    extend(self, values): Adds the geometry of newly recorded cycles.
+
+    reset(self): Removes all cycles.
+
+    get_level(self, cycles_per_pixel): Returns the level to draw at the
+                                       given zoom.
+
+    get_draw_ranges(self, first_cycle, last_cycle, level): Returns the
+                              vertex ranges that draw the given cycles.
+    """
+
+    LOW_Y = 0.2
+    HIGH_Y = 0.8
+
+    BLANK = -1  # stored value of a blank cycle
+
+    def __init__(self):
+        """Initialise an empty trace."""
+        # For each level: x, y pairs of the line segment end points, and the
+        # index of the first vertex of each bucket followed by the total
+        # number of vertices
+        self.level_vertices = []
+        self.level_starts = []
+        # For each level: minimum, maximum, first and last value of each
+        # bucket
+        self.level_summaries = []
+        self.add_level()
+
+        # Geometry of every cycle
+        self.vertices = self.level_vertices[0]
+        self.cycle_starts = self.level_starts[0]
+        self.length = 0  # number of cycles
+
+    def add_level(self):
+        """Add an empty decimated level."""
+        self.level_vertices.append(array.array("f"))
+        self.level_starts.append(array.array("L", [0]))
+        self.level_summaries.append([array.array("b") for _ in range(4)])
+
+    def get_vertex_count(self, level=0):
+        """Return the number of vertices in a level."""
+        return len(self.level_vertices[level]) // 2
+
+    def add_bucket(self, level, minimum, maximum, first, last):
+        """Add the geometry of the next bucket of a level.
+
+        Each complete pair of buckets is combined into the next level.
+        """
+        vertices = self.level_vertices[level]
+        starts = self.level_starts[level]
+        summaries = self.level_summaries[level]
+        index = len(starts) - 1
+        size = 1 << level
+        x = index * size
+        if minimum != self.BLANK:
+            previous = summaries[3][-1] if index else self.BLANK
+            if (previous != self.BLANK and first != previous) or \
+                    minimum != maximum:
+                # vertical edge at a change of level
+                vertices.extend((x, self.LOW_Y, x, self.HIGH_Y))
+            if minimum == 0:
+                vertices.extend((x, self.LOW_Y, x + size, self.LOW_Y))
+            if maximum == 1:
+                vertices.extend((x, self.HIGH_Y, x + size, self.HIGH_Y))
+        starts.append(len(vertices) // 2)
+        for summary, value in zip(summaries,
+                                  (minimum, maximum, first, last)):
+            summary.append(value)
+
+        if index % 2 == 1:
+            if level + 1 == len(self.level_vertices):
+                self.add_level()
+            self.add_bucket(level + 1, *self.combine(summaries, index - 1))
+
+    def combine(self, summaries, index):
+        """Return the summary of buckets index and index + 1 together."""
+        [minimums, maximums, firsts, lasts] = summaries
+        minimum_pair = (minimums[index], minimums[index + 1])
+        if self.BLANK in minimum_pair:
+            minimum = max(minimum_pair)
+        else:
+            minimum = min(minimum_pair)
+        maximum = max(maximums[index], maximums[index + 1])
+        first = firsts[index] if firsts[index] != self.BLANK \
+            else firsts[index + 1]
+        last = lasts[index + 1] if lasts[index + 1] != self.BLANK \
+            else lasts[index]
+        return minimum, maximum, first, last
+
+    def extend(self, values):
+        """Add the geometry of newly recorded cycles to the trace."""
+        for value in values:
+            value = self.BLANK if value is None else int(value)
+            self.add_bucket(0, value, value, value, value)
+        self.length += len(values)
+
+    def reset(self):
+        """Remove all cycles from the trace."""
+        self.__init__()
+
+    def get_level(self, cycles_per_pixel):
+        """Return the level to draw when a pixel spans cycles_per_pixel.
+
+        This is the coarsest level whose buckets are no wider than a pixel.
+        """
+        if cycles_per_pixel < 2:
+            return 0
+        level = int(math.log2(cycles_per_pixel))
+        return min(level, len(self.level_vertices) - 1)
+
+    def get_draw_ranges(self, first_cycle, last_cycle, level):
+        """Return the vertex ranges that draw cycles up to last_cycle.
+
+        The cycles from first_cycle are drawn at the given level as far as
+        it has complete buckets, and the remaining cycles at finer levels.
+        Return a list of (level, first vertex, vertex count).
+        """
+        last_cycle = min(last_cycle, self.length)
+        ranges = []
+        cycle = max(first_cycle, 0)
+        while level >= 0 and cycle < last_cycle:
+            size = 1 << level
+            starts = self.level_starts[level]
+            first_bucket = cycle // size
+            last_bucket = min(-(-last_cycle // size), len(starts) - 1)
+            if last_bucket > first_bucket:
+                first_vertex = starts[first_bucket]
+                vertex_count = starts[last_bucket] - first_vertex
+                if vertex_count:
+                    ranges.append((level, first_vertex, vertex_count))
+                cycle = last_bucket * size
+            level -= 1
+        return ranges
+
+
+class WaveformView:
+    """Work out the visible cycles and signal rows of the canvas.
+
+    The canvas maps a point (x, y) of the drawing to the screen point
+    (offset_x + scale_x * x, offset_y + scale_y * y), where the offsets and
+    scales come from the modelview matrix. Cycle t spans x from
+    t * time_unit_width, and signal row i spans y from
+    (i + 1) * signal_height, each for one unit.
+
+    Parameters
+    ----------
+    time_unit_width: width of a cycle in drawing units.
+    signal_height: height of a signal row in drawing units.
+
+    Public methods
+    --------------
+    get_visible_cycles(self, offset_x, scale_x, width): Returns the first
+                                     visible cycle and the cycle after the
+                                     last visible one.
+
+    get_visible_rows(self, offset_y, scale_y, height, row_count): Returns
+                                      the range of visible signal rows.
+
+    get_cycles_per_pixel(self, scale_x): Returns the number of cycles drawn
+                                         in one pixel.
+    """
+
+    def __init__(self, time_unit_width, signal_height):
+        """Store the size of a cycle and a signal row."""
+        self.time_unit_width = time_unit_width
+        self.signal_height = signal_height
+
+    def get_visible_cycles(self, offset_x, scale_x, width):
+        """Return (first, last + 1) of the cycles visible on screen."""
+        unit = scale_x * self.time_unit_width
+        first = math.floor(-offset_x / unit)
+        last = math.floor((width - offset_x) / unit) + 1
+        return max(first, 0), max(last, 0)
+
+    def get_visible_rows(self, offset_y, scale_y, height, row_count):
+        """Return the range of signal rows visible on screen."""
+        unit = scale_y * self.signal_height
+        first = math.floor(-offset_y / unit) - 1
+        last = math.floor((height - offset_y) / unit)
+        return range(max(first, 0), min(max(last, 0), row_count))
+
+    def get_cycles_per_pixel(self, scale_x):
+        """Return the number of cycles drawn in one pixel."""
+        return 1 / (scale_x * self.time_unit_width)
+
+
+class MonitorSamples:
+    """Copy newly recorded monitor signals into canvas samples.
+
+    The samples of each monitored signal are a list of 0, 1, or None for a
+    blank cycle, in the order of the monitors dictionary. Each update only
+    converts the signals recorded since the previous update, so a simulation
+    cycle costs one sample per monitor however long the traces are.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    update(self): Adds newly recorded signals to the samples and returns
+                  True if the set of monitors changed.
+
+    get_sample(self, signal): Returns the sample of a signal level.
+    """
+
+    def __init__(self, devices, monitors):
+        """Initialise the empty samples."""
+        self.devices = devices
+        self.monitors = monitors
+
+        # {signal name: samples}
+        self.signal_data = {}
+        self.monitor_keys = []  # (device ID, output ID) of each signal
+        # {signal name: monitor signal list the samples were copied from}
+        self.signal_lists = {}
+
+    def get_sample(self, signal):
+        """Return 1 for a high signal, 0 for a low signal, or None."""
+        if signal in (self.devices.HIGH, self.devices.RISING):
+            return 1
+        if signal in (self.devices.LOW, self.devices.FALLING):
+            return 0
+        return None  # blank or unknown signal
+
+    def update(self):
+        """Add newly recorded signals to the samples.
+
+        Samples of removed monitors are dropped. The samples of a trace are
+        rebuilt if the monitor's signal list was replaced (after a reset, or
+        when the monitor was removed and made again) or became shorter.
+        Return True if the set of monitors changed since the last update.
+        """
+        monitors_dictionary = self.monitors.monitors_dictionary
+        monitor_keys = list(monitors_dictionary)
+        changed = monitor_keys != self.monitor_keys
+        if changed:
+            signal_data = {}
+            for device_id, output_id in monitor_keys:
+                signal_name = self.devices.get_signal_name(device_id,
+                                                           output_id)
+                signal_data[signal_name] = self.signal_data.get(signal_name,
+                                                                [])
+            self.signal_data = signal_data
+            self.monitor_keys = monitor_keys
+
+        signal_lists = self.signal_lists
+        for key, (signal_name, samples) in zip(monitor_keys,
+                                               self.signal_data.items()):
+            signal_list = monitors_dictionary[key]
+            if signal_lists.get(signal_name) is not signal_list or \
+                    len(signal_list) < len(samples):
+                samples.clear()
+                signal_lists[signal_name] = signal_list
+            samples.extend(self.get_sample(signal)
+                           for signal in signal_list[len(samples):])
+        return changed